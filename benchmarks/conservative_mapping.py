@@ -0,0 +1,45 @@
+"""Time and global sum error of conservative point-cloud mapping.
+
+Maps a random extensive field between random points on a unit sphere,
+with the source ``--ratio`` times denser than the target (about 4x for the
+golf-ball case), in both directions.
+
+    python benchmarks/conservative_mapping.py [--points N] [--ratio R]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.mapping import PointCloudMapper, global_sum_error
+
+
+def sphere(rng, n):
+    points = rng.standard_normal((n, 3))
+    return points / np.linalg.norm(points, axis=1)[:, None]
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--points", type=int, default=1_000_000)
+parser.add_argument("--ratio", type=float, default=4.0)
+parser.add_argument("--method", type=str, default="idw")
+args = parser.parse_args()
+
+rng = np.random.default_rng(0)
+dense = sphere(rng, args.points)
+sparse = sphere(rng, int(args.points / args.ratio))
+
+print(f"{'direction':>16} {'mode':>12} {'time [s]':>9} {'sum error':>10}")
+for label, source, target in (("dense->sparse", dense, sparse), ("sparse->dense", sparse, dense)):
+    values = rng.random(len(source))
+    for conservative in (False, True):
+        start = time.perf_counter()
+        mapper = PointCloudMapper(source, args.method, conservative=conservative)
+        mapped = mapper.map(values, target)
+        elapsed = time.perf_counter() - start
+        mode = "conservative" if conservative else "profile"
+        print(f"{label:>16} {mode:>12} {elapsed:>9.2f} {global_sum_error(values, mapped):>10.2e}")
@@ -0,0 +1,74 @@
+"""Per-iteration coupling overhead measured with the loopback stand-in.
+
+Runs a participant loop (one region with a moving point cloud, a scalar
+input and a vector output, data held in a `BufferRegistry`) against
+`syctools.loopback` for increasing cloud sizes. Everything is serialized
+and sent over a local socket, so the "exchange" time is the participant
+side cost of ``updateInputs()`` + ``updateOutputs()`` per iteration.
+``--moving`` changes the coordinates stamp on every time step, so the
+cloud is resent as well. ``--instrument`` wraps the coupling object with
+`syctools.instrument` to show its overhead.
+
+    python benchmarks/loopback.py [--sizes 1000 100000 1000000] [--moving] [--instrument]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import syctools.loopback as scp
+from syctools.buffers import BufferRegistry
+from syctools.instrument import instrument
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 100000, 1000000])
+parser.add_argument("--steps", type=int, default=4)
+parser.add_argument("--iterations", type=int, default=5)
+parser.add_argument("--moving", action="store_true")
+parser.add_argument("--instrument", action="store_true")
+args = parser.parse_args()
+
+scp.configure(regions={"cloud": {"inputs": ["pressure"], "outputs": ["force"]}},
+              tensor_types={"pressure": "Scalar", "force": "Vector"},
+              time_steps=args.steps, iterations=args.iterations)
+
+print(f"{'points':>9} {'iters':>6} {'exchange [ms/it]':>17} {'wall [ms/it]':>13} {'MB/it':>8} {'MB/s':>8}")
+for n in args.sizes:
+    rng = np.random.default_rng(0)
+    buffers = BufferRegistry(scp)
+    ids, coords = buffers.add_point_cloud("cloud", np.arange(n), rng.random((n, 3)))
+    buffers.add_variable("cloud", "pressure", np.zeros(n))
+    force = buffers.add_variable("cloud", "force", rng.random((n, 3)))
+    stamp = 0
+
+    loopback = scp.SystemCoupling("", 0, "", "benchmark")
+    trace = os.path.join(tempfile.gettempdir(), "loopback-trace") if args.instrument else ""
+    sc = instrument(loopback, trace, buffers)
+    sc.registerPointCloudAccess(lambda region: buffers.point_cloud(region, stamp))
+    sc.registerInputScalarDataAccess(buffers.input_scalar)
+    sc.registerOutputVectorDataAccess(buffers.output_vector)
+
+    start = time.perf_counter()
+    sc.initializeAnalysis()
+    while sc.doTimeStep():
+        if args.moving:
+            coords += 1e-3
+            stamp += 1
+        while sc.doIteration():
+            sc.updateInputs()
+            force *= 1.0001
+            sc.updateOutputs(scp.Complete)
+    sc.disconnect()
+    wall = time.perf_counter() - start
+
+    s = loopback.stats
+    it = s["iterations"]
+    exchange = s["update_inputs_time"] + s["update_outputs_time"]
+    moved = (s["bytes_sent"] + s["bytes_received"]) / 2**20
+    print(f"{n:>9} {it:>6} {1e3 * exchange / it:>17.3f} {1e3 * wall / it:>13.3f} "
+          f"{moved / it:>8.2f} {moved / max(exchange, 1e-12):>8.0f}")
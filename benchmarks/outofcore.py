@@ -0,0 +1,105 @@
+"""In-memory versus memory-mapped participant arrays.
+
+Builds the swirl source cloud in a `BufferRegistry`, once in RAM and once
+backed by a `MappedStore`, and then performs ``--passes`` full output
+passes: every access callback result is streamed front to back into a
+fixed send buffer, as the SCP library does in ``updateOutputs()``. Each
+mode runs in its own process so the peak resident set size is its own.
+Peak RSS includes file pages that happen to be cached, which the kernel
+can reclaim under memory pressure; "anon" (Linux only) is the memory that
+must stay resident, measured after the passes.
+
+    python benchmarks/outofcore.py [--naxial 3300] [--directory /scratch/dir]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import syctools.loopback as scp
+from syctools.buffers import BufferRegistry
+from syctools.outofcore import MappedStore
+from syctools.swirl import swirl_source_into
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--naxial", type=int, default=3300)
+parser.add_argument("--ncirc", type=int, default=100)
+parser.add_argument("--nrad", type=int, default=20)
+parser.add_argument("--passes", type=int, default=3)
+parser.add_argument("--chunk-rows", type=int, default=1 << 16)
+parser.add_argument("--directory", type=str, default=tempfile.gettempdir())
+parser.add_argument("--mode", choices=("memory", "memmap"))
+args = parser.parse_args()
+
+
+def stream(array, send, rows):
+    # copy the array through a fixed buffer in row order
+    flat = array.reshape(len(array), -1)
+    out = send[:rows * flat.shape[1] * flat.itemsize].view(flat.dtype).reshape(rows, -1)
+    for start in range(0, len(flat), rows):
+        n = min(rows, len(flat) - start)
+        out[:n] = flat[start:start + n]
+
+
+def anonymous_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return f"{int(line.split()[1]) / 2**10:.0f}"
+    except OSError:
+        pass
+    return "-"
+
+
+def run(mode):
+    npoints = args.naxial * args.ncirc * args.nrad
+    store = MappedStore(os.path.join(args.directory, "outofcore-benchmark")) if mode == "memmap" else None
+    buffers = BufferRegistry(scp, store)
+
+    start = time.perf_counter()
+    ids, coords = buffers.reserve_point_cloud("source", npoints)
+    forces = buffers.reserve_variable("source", "force", (npoints, 3))
+    swirl_source_into(ids, coords, forces, args.naxial, args.ncirc, args.nrad)
+    if store is not None:
+        store.flush()
+    build = time.perf_counter() - start
+
+    send = np.empty(args.chunk_rows * 3 * 8, dtype=np.uint8)
+    start = time.perf_counter()
+    for _ in range(args.passes):
+        pc = buffers.point_cloud("source")
+        stream(pc.ids.data, send, args.chunk_rows)
+        stream(pc.coords.data, send, args.chunk_rows)
+        stream(buffers.output_vector("source", "force").data, send, args.chunk_rows)
+    passes = (time.perf_counter() - start) / args.passes
+
+    nbytes = ids.nbytes + coords.nbytes + forces.nbytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10 if resource else float("nan")
+    anonymous = anonymous_mb()
+    if store is not None:
+        del ids, coords, forces, pc
+        buffers = None
+        store.close()
+    print(f"{mode:>8} {npoints:>11} {nbytes / 2**20:>9.0f} {build:>10.2f} {passes:>10.2f} "
+          f"{nbytes / 2**20 / passes:>8.0f} {peak:>14.0f} {anonymous:>10}")
+
+
+if args.mode:
+    run(args.mode)
+else:
+    print(f"{'mode':>8} {'points':>11} {'data [MB]':>9} {'build [s]':>10} {'pass [s]':>10} "
+          f"{'MB/s':>8} {'peak RSS [MB]':>14} {'anon [MB]':>10}", flush=True)
+    for mode in ("memory", "memmap"):
+        subprocess.run([sys.executable, __file__, "--mode", mode] + sys.argv[1:], check=True)
@@ -0,0 +1,77 @@
+"""Effect of space-filling-curve ordering on mapping and transfer speed.
+
+Maps the golf-ball source onto the target with the source and target
+clouds in file order, randomly shuffled, and in Morton and Hilbert order.
+``--scale`` adds jittered copies of both clouds to get beyond cache sizes.
+"map" is the KD-tree build plus weight computation, "transfer" packs the
+source coordinates and values into a contiguous buffer and applies the
+weights ``--repeat`` times, as done on every coupling iteration.
+
+    python benchmarks/reorder.py [--scale N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+from syctools.mapping import PointCloudMapper
+from syctools.reorder import Reordering
+from syctools.scdt import read_scdt
+
+
+def scaled(rng, data, scale):
+    if scale == 1:
+        return data
+    copies = np.repeat(data[None], scale, axis=0)
+    copies[1:, :, :3] += rng.normal(scale=1e-4, size=copies[1:, :, :3].shape)
+    return copies.reshape(-1, data.shape[1])
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--scale", type=int, default=10)
+parser.add_argument("--repeat", type=int, default=20)
+args = parser.parse_args()
+
+rng = np.random.default_rng(0)
+golfBall = os.path.join(root, "golf-ball-mapping-point-cloud")
+source = scaled(rng, read_scdt(os.path.join(golfBall, "source.scdt"))[1], args.scale)
+target = scaled(rng, read_scdt(os.path.join(golfBall, "target.scdt"))[1], args.scale)
+print(f"{len(source)} source points, {len(target)} target points")
+print(f"{'order':>10} {'reorder [s]':>12} {'map [s]':>9} {'transfer [s]':>13} {'speedup':>8}")
+
+reference = None
+baseline = None
+for order in ("file", "shuffled", "morton", "hilbert"):
+    start = time.perf_counter()
+    if order == "file":
+        src, tgt, restore = source, target, lambda a: a
+    elif order == "shuffled":
+        sperm, tperm = rng.permutation(len(source)), rng.permutation(len(target))
+        src, tgt = source[sperm], target[tperm]
+        tinv = np.argsort(tperm)
+        restore = lambda a: a[tinv]
+    else:
+        sorder, torder = Reordering(source[:, :3], order), Reordering(target[:, :3], order)
+        src, tgt, restore = sorder.apply(source), torder.apply(target), torder.restore
+    reordered = time.perf_counter()
+
+    weights = PointCloudMapper(src[:, :3], "idw", workers=1).weights(tgt[:, :3])
+    mapped = time.perf_counter()
+
+    for _ in range(args.repeat):
+        packed = np.ascontiguousarray(src[:, [0, 1, 2, 3]])
+        values = weights @ packed[:, 3]
+    transferred = time.perf_counter()
+
+    values = restore(values)
+    if reference is None:
+        reference = values
+    assert np.allclose(values, reference)
+    total = transferred - reordered
+    baseline = baseline or total
+    print(f"{order:>10} {reordered - start:>12.3f} {mapped - reordered:>9.3f} {transferred - mapped:>13.3f} {baseline / total:>8.2f}")
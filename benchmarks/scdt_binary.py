@@ -0,0 +1,54 @@
+"""Load time and file size of binary .scdt sidecars against text parsing.
+
+Uses the golf-ball source.scdt tiled ``--scale`` times. "first load"
+includes converting the text file, "cached load" only memory-maps the
+sidecar and sums every value so all pages are actually read.
+
+    python benchmarks/scdt_binary.py [--scale N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+from syctools.scdt import read_scdt
+from syctools.scdt_binary import load_scdt, sidecar_path
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    data = func(*args)[1]
+    total = float(np.sum(data))
+    return time.perf_counter() - start, total
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--scale", type=int, default=20)
+args = parser.parse_args()
+
+with tempfile.TemporaryDirectory() as tmp:
+    fileName = os.path.join(tmp, "source.scdt")
+    with open(os.path.join(root, "golf-ball-mapping-point-cloud", "source.scdt"), "rb") as f:
+        header = f.readline() + f.readline()
+        body = f.read()
+    with open(fileName, "wb") as f:
+        f.write(header)
+        for _ in range(args.scale):
+            f.write(body)
+
+    print(f"{'format':>18} {'MB':>7} {'first load [s]':>15} {'cached load [s]':>16}")
+    elapsed, expected = timed(read_scdt, fileName)
+    print(f"{'text':>18} {os.path.getsize(fileName) / 2**20:>7.1f} {elapsed:>15.4f} {elapsed:>16.4f}")
+    for dtype in (np.float64, np.float32):
+        first, _ = timed(load_scdt, fileName, dtype)
+        cached, total = timed(load_scdt, fileName, dtype)
+        assert np.isclose(total, expected, rtol=1e-4)
+        size = os.path.getsize(sidecar_path(fileName)) / 2**20
+        print(f"{'sidecar ' + np.dtype(dtype).name:>18} {size:>7.1f} {first:>15.4f} {cached:>16.4f}")
+        os.remove(sidecar_path(fileName))
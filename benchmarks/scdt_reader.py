@@ -0,0 +1,77 @@
+"""Read time and peak memory of syctools.scdt against numpy.loadtxt.
+
+Uses the golf-ball source.scdt and target.scdt files, plus a source cloud
+tiled ``--scale`` times to mimic production-size clouds.
+
+    python benchmarks/scdt_reader.py [--scale N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, root)
+from syctools.scdt import iter_scdt, read_scdt
+
+golfBall = os.path.join(root, "golf-ball-mapping-point-cloud")
+
+
+def loadtxt(fileName):
+    return np.loadtxt(fileName, delimiter=",", skiprows=2)
+
+
+def read(fileName):
+    return read_scdt(fileName)[1]
+
+
+def iterate(fileName):
+    # consume chunks without keeping them, as a streaming consumer would
+    rows = 0
+    for chunk in iter_scdt(fileName):
+        rows += len(chunk)
+    return rows
+
+
+def measure(func, fileName, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(fileName)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(fileName)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--scale", type=int, default=100)
+parser.add_argument("--repeat", type=int, default=5)
+args = parser.parse_args()
+
+with tempfile.TemporaryDirectory() as tmp:
+    scaled = os.path.join(tmp, f"source-x{args.scale}.scdt")
+    with open(os.path.join(golfBall, "source.scdt"), "rb") as f:
+        header = f.readline() + f.readline()
+        body = f.read()
+    with open(scaled, "wb") as f:
+        f.write(header)
+        for _ in range(args.scale):
+            f.write(body)
+
+    files = [os.path.join(golfBall, "source.scdt"), os.path.join(golfBall, "target.scdt"), scaled]
+    print(f"{'file':>22} {'MB':>7} {'reader':>12} {'time [s]':>9} {'MB/s':>8} {'peak [MB]':>10}")
+    for fileName in files:
+        assert np.array_equal(read(fileName), loadtxt(fileName))
+        size = os.path.getsize(fileName) / 2**20
+        repeat = args.repeat if fileName != scaled else 1
+        for label, func in (("loadtxt", loadtxt), ("read_scdt", read), ("iter_scdt", iterate)):
+            elapsed, peak = measure(func, fileName, repeat)
+            print(f"{os.path.basename(fileName):>22} {size:>7.1f} {label:>12} {elapsed:>9.4f} {size / elapsed:>8.1f} {peak / 2**20:>10.1f}")
@@ -0,0 +1,69 @@
+"""Throughput of .scdt writing for the fluid-swirl source cloud.
+
+Compares the original per-line f-string writer from fluid-swirl/run.py
+with syctools.scdt, both from in-memory arrays and streamed from
+syctools.swirl.swirl_source_chunks.
+
+    python benchmarks/scdt_writer.py [--max-points N]
+"""
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.scdt import write_scdt, write_scdt_chunks
+from syctools.swirl import swirl_source, swirl_source_chunks
+
+
+def createSourceFile(fileName, naxial, ncirc, nrad, radius=0.025, forceMag=5.0):
+    with open(fileName, "w") as f:
+        for xi in range(naxial):
+            x = (1.0 - 0.0) * xi / (naxial - 1)
+            for ti in range(ncirc):
+                theta = 2.0 * math.pi * ti / ncirc
+                for ri in range(nrad):
+                    r = radius * (ri + 1) / nrad
+                    z = r * math.cos(theta)
+                    y = r * math.sin(theta)
+                    fx = 0.0
+                    fy = forceMag * math.sin(theta + 0.5 * math.pi)
+                    fz = forceMag * math.cos(theta + 0.5 * math.pi)
+                    f.write(f"{x}, {y}, {z}, {fx}, {fy}, {fz}\n")
+
+
+def timed(fileName, func, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    return elapsed, os.path.getsize(fileName)
+
+
+def report(label, npoints, elapsed, nbytes):
+    print(f"{label:>22} {npoints:>10} {elapsed:>9.3f} {nbytes / 2**20 / elapsed:>8.1f} {npoints / elapsed:>12.0f}")
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--max-points", type=int, default=2_000_000)
+args = parser.parse_args()
+
+ncirc, nrad = 10, 20
+print(f"{'writer':>22} {'points':>10} {'time [s]':>9} {'MB/s':>8} {'points/s':>12}")
+with tempfile.TemporaryDirectory() as tmp:
+    fileName = os.path.join(tmp, "source.scdt")
+    naxial = 33
+    while naxial * ncirc * nrad <= args.max_points:
+        npoints = naxial * ncirc * nrad
+        report("per-line f-string", npoints, *timed(fileName, createSourceFile, fileName, naxial, ncirc, nrad))
+        ids, coords, forces = swirl_source(naxial, ncirc, nrad)
+        report("write_scdt (arrays)", npoints, *timed(fileName, write_scdt, fileName, coords, forces))
+        chunks = swirl_source_chunks(naxial, ncirc, nrad)
+        report("write_scdt_chunks", npoints, *timed(fileName, write_scdt_chunks, fileName, chunks))
+        check = np.loadtxt(fileName, delimiter=",", max_rows=1000)
+        assert np.allclose(check, np.hstack((coords, forces))[:1000], rtol=1e-9, atol=1e-15)
+        naxial *= 10
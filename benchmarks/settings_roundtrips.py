@@ -0,0 +1,209 @@
+"""Remote calls needed to set up the fluent-fluent-pipe-cht sessions.
+
+PyFluent settings live in the Fluent server, so every property assignment,
+state read or command is one round trip. This benchmark replays the setup
+of the fluid and solid sessions against an in-process settings tree that
+counts those calls: property by property as the scripts used to do it,
+through `syctools.settings.apply_settings` (writing each top-level object
+once, and with ``diff=True`` reading it first), and through a diffed
+transaction again on a session that already has the settings (a warm,
+pooled session). ``--latency-ms`` adds a delay per call to show the
+wall time at a given network latency.
+
+It counts calls, not their cost on a real server: the payload column is
+the JSON size of the states read and written in the stand-in tree, which
+holds the example's zones plus ``--zones`` extra wall zones and is far
+smaller than a real case. A diffed transaction reads the whole ``setup``,
+so it moves every material, zone and boundary condition of the case.
+
+    python benchmarks/settings_roundtrips.py [--latency-ms 2] [--zones 100]
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.settings import apply_settings
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--latency-ms", type=float, default=2.0)
+parser.add_argument("--zones", type=int, default=100)
+args = parser.parse_args()
+
+
+class Server:
+    def __init__(self, state):
+        self.state = state
+        self.calls = 0
+        self.payload = 0
+
+    def call(self, payload=None):
+        self.calls += 1
+        self.payload += len(json.dumps(payload))
+        time.sleep(args.latency_ms / 1e3)
+
+
+class Node:
+    # stands in for a PyFluent settings object at ``path`` in the server state
+
+    def __init__(self, server, path):
+        object.__setattr__(self, "_server", server)
+        object.__setattr__(self, "_path", path)
+
+    def _state(self, create=False):
+        node = self._server.state
+        for name in self._path:
+            node = node.setdefault(name, {}) if create else node.get(name, {})
+        return node
+
+    def __getattr__(self, name):
+        return Node(self._server, self._path + (name,))
+
+    def __getitem__(self, name):
+        return Node(self._server, self._path + (name,))
+
+    def __setattr__(self, name, value):
+        self._server.call(value)
+        node = self._state(create=True)
+        if isinstance(value, dict):
+            _merge(node.setdefault(name, {}), value)
+        else:
+            node[name] = value
+
+    def __call__(self, **kwargs):
+        if kwargs:  # a command, here only copy_by_name
+            self._server.call(kwargs)
+            self._server.state["setup"]["materials"].setdefault(kwargs["type"], {})[kwargs["name"]] = {}
+            return None
+        state = copy.deepcopy(self._state())
+        self._server.call(state)
+        return state
+
+    def get_state(self):
+        return self()
+
+    def set_state(self, state):
+        self._server.call(state)
+        _merge(self._state(create=True), state)
+
+    @property
+    def copy_by_name(self):
+        return self
+
+
+def _merge(target, source):
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _merge(target.setdefault(key, {}), value)
+        else:
+            target[key] = value
+
+
+def new_session():
+    # extra walls stand in for the rest of a larger case
+    walls = {f"wall-{i}": {"thermal": {"thermal_bc": "Heat Flux", "q": {"value": 0}}} for i in range(args.zones)}
+    server = Server({"setup": {
+        "materials": {"fluid": {"air": {"density": 1.225}}, "solid": {"aluminum": {"density": 2719}}},
+        "boundary_conditions": {"wall": walls},
+    }})
+    return server, Node(server, ())
+
+
+def per_property_fluid(s):
+    s.setup.models.energy.enabled = True
+    s.setup.materials.database.copy_by_name(type="fluid", name="water-liquid")
+    s.setup.cell_zone_conditions.fluid["fluid"].material = "water-liquid"
+    s.setup.boundary_conditions.velocity_inlet["inlet"].momentum.velocity = 0.1
+    s.setup.boundary_conditions.wall["wall"].thermal.thermal_bc = "via System Coupling"
+    s.solution.run_calculation.iter_count = 1
+
+
+def per_property_solid(s):
+    s.setup.models.energy.enabled = True
+    s.setup.materials.database.copy_by_name(type="solid", name="copper")
+    s.setup.cell_zone_conditions.solid["solid"].material = "copper"
+    s.setup.boundary_conditions.wall["outer_wall"].thermal.thermal_bc = "Temperature"
+    s.setup.boundary_conditions.wall["outer_wall"].thermal.t.value = 350
+    s.setup.boundary_conditions.wall["inner_wall"].thermal.thermal_bc = "via System Coupling"
+    s.setup.boundary_conditions.wall["insulated1"].thermal.thermal_bc = "Heat Flux"
+    s.setup.boundary_conditions.wall["insulated1"].thermal.q.value = 0
+    s.setup.boundary_conditions.wall["insulated2"].thermal.thermal_bc = "Heat Flux"
+    s.setup.boundary_conditions.wall["insulated2"].thermal.q.value = 0
+    s.solution.run_calculation.iter_count = 1
+
+
+fluid_settings = {
+    "setup": {
+        "models": {"energy": {"enabled": True}},
+        "cell_zone_conditions": {"fluid": {"fluid": {"material": "water-liquid"}}},
+        "boundary_conditions": {
+            "velocity_inlet": {"inlet": {"momentum": {"velocity": 0.1}}},
+            "wall": {"wall": {"thermal": {"thermal_bc": "via System Coupling"}}},
+        },
+    },
+    "solution": {"run_calculation": {"iter_count": 1}},
+}
+
+solid_settings = {
+    "setup": {
+        "models": {"energy": {"enabled": True}},
+        "cell_zone_conditions": {"solid": {"solid": {"material": "copper"}}},
+        "boundary_conditions": {
+            "wall": {
+                "outer_wall": {"thermal": {"thermal_bc": "Temperature", "t": {"value": 350}}},
+                "inner_wall": {"thermal": {"thermal_bc": "via System Coupling"}},
+                "insulated1": {"thermal": {"thermal_bc": "Heat Flux", "q": {"value": 0}}},
+                "insulated2": {"thermal": {"thermal_bc": "Heat Flux", "q": {"value": 0}}},
+            },
+        },
+    },
+    "solution": {"run_calculation": {"iter_count": 1}},
+}
+
+
+def transaction(session, settings, materials, diff):
+    before = session._server.calls
+    t = apply_settings(session, settings, materials, diff=diff)
+    assert t.round_trips == session._server.calls - before
+
+
+def transactions(diff):
+    return lambda s: (transaction(s[0], fluid_settings, {"fluid": ["water-liquid"]}, diff),
+                      transaction(s[1], solid_settings, {"solid": ["copper"]}, diff))
+
+
+def measure(label, run, fluid, solid):
+    calls = fluid[0].calls + solid[0].calls
+    payload = fluid[0].payload + solid[0].payload
+    start = time.perf_counter()
+    run((fluid[1], solid[1]))
+    elapsed = time.perf_counter() - start
+    calls = fluid[0].calls + solid[0].calls - calls
+    payload = fluid[0].payload + solid[0].payload - payload
+    print(f"{label:<32} {calls:>6} {payload:>13} {elapsed:>9.3f}")
+    return calls
+
+
+print(f"{'setup':<32} {'calls':>6} {'payload [B]':>13} {'time [s]':>9}")
+reference = None
+calls = {}
+for label, run in (
+    ("per property", lambda s: (per_property_fluid(s[0]), per_property_solid(s[1]))),
+    ("transaction", transactions(diff=False)),
+    ("transaction, diff=True", transactions(diff=True)),
+):
+    fluid, solid = new_session(), new_session()
+    calls[label] = measure(label, run, fluid, solid)
+    states = (fluid[0].state, solid[0].state)
+    reference = reference or states
+    assert states == reference, "all setups must give the same state"
+    if label == "transaction, diff=True":
+        # the same setup again on sessions that already have it
+        calls["again"] = measure("  again, already set", run, fluid, solid)
+
+assert calls["transaction"] < calls["per property"], "a fresh transaction must need fewer calls"
+assert calls["again"] < calls["per property"], "a repeated diffed transaction must need fewer calls"
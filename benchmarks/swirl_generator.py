@@ -0,0 +1,74 @@
+"""Time and peak memory of the swirl source generator against point count.
+
+Compares the original nested-loop generator from
+fluid-swirl-custom-script/participant.py with syctools.swirl.swirl_source.
+
+    python benchmarks/swirl_generator.py [--max-points N]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.swirl import swirl_source
+
+
+def loop_source(naxial, ncirc, nrad, radius, forceMag):
+    nodeid_values = list()
+    coords_values = list()
+    forces_values = list()
+    for xi in range(naxial):
+        x = (1.0 - 0.0) * xi / (naxial - 1)
+        for ti in range(ncirc):
+            theta = 2.0 * math.pi * ti / ncirc
+            for ri in range(nrad):
+                r = radius * (ri + 1) / nrad
+                z = r * math.cos(theta)
+                y = r * math.sin(theta)
+                fx = 0.0
+                fy = forceMag * math.sin(theta + 0.5 * math.pi)
+                fz = forceMag * math.cos(theta + 0.5 * math.pi)
+                nodeid_values.append(len(nodeid_values))
+                coords_values.append([x, y, z])
+                forces_values.append([fx, fy, fz])
+    return np.array(nodeid_values), np.array(coords_values), np.array(forces_values)
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--max-points", type=int, default=10_000_000)
+parser.add_argument("--max-loop-points", type=int, default=100_000)
+args = parser.parse_args()
+
+print(f"{'points':>12} {'loop [s]':>10} {'loop peak [MB]':>15} {'numpy [s]':>10} {'numpy peak [MB]':>16} {'speedup':>8}")
+naxial = 33
+while True:
+    ncirc, nrad = 10, 20
+    npoints = naxial * ncirc * nrad
+    if npoints > args.max_points:
+        break
+    (ids, coords, forces), t_new, m_new = measure(swirl_source, naxial, ncirc, nrad, 0.025, 5.0)
+    if npoints <= args.max_loop_points:
+        (ids0, coords0, forces0), t_old, m_old = measure(loop_source, naxial, ncirc, nrad, 0.025, 5.0)
+        assert np.array_equal(ids, ids0)
+        assert np.allclose(coords, coords0, rtol=0.0, atol=1e-15)
+        assert np.allclose(forces, forces0, rtol=0.0, atol=1e-12)
+        print(f"{npoints:>12} {t_old:>10.4f} {m_old / 2**20:>15.1f} {t_new:>10.4f} {m_new / 2**20:>16.1f} {t_old / t_new:>8.1f}")
+    else:
+        print(f"{npoints:>12} {'-':>10} {'-':>15} {t_new:>10.4f} {m_new / 2**20:>16.1f} {'-':>8}")
+    naxial *= 10
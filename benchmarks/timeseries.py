@@ -0,0 +1,72 @@
+"""Synchronous versus prefetched loading of per-step source data.
+
+Writes ``--steps`` files of ``--points`` force vectors, then runs a
+time-step loop in which each step waits ``--solve-ms`` for the coupled
+solver (the participant is idle while System Coupling and Fluent
+iterate). "sync" loads each step at the start of the step,
+"prefetch" uses `TimeSeriesReader`.
+
+    python benchmarks/timeseries.py [--points 2000000] [--format npz|npy|scdt]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.scdt import write_scdt
+from syctools.timeseries import TimeSeriesReader, load_step
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--points", type=int, default=2000000)
+parser.add_argument("--steps", type=int, default=8)
+parser.add_argument("--solve-ms", type=float, default=200.0)
+parser.add_argument("--format", choices=("npz", "npy", "scdt"), default="npy")
+args = parser.parse_args()
+
+rng = np.random.default_rng(0)
+directory = tempfile.mkdtemp()
+files = []
+for step in range(args.steps):
+    path = os.path.join(directory, f"force-{step}.{args.format}")
+    values = rng.random(args.points)
+    if args.format == "npz":
+        np.savez(path, force=values)
+    elif args.format == "npy":
+        np.save(path, values)
+    else:
+        write_scdt(path, rng.random((args.points, 3)), values[:, None], header=["x", "y", "z", "force"])
+    files.append(path)
+fields = {"force": (args.points,)}
+if args.format == "scdt":
+    # build the sidecars up front so both modes read the same binary data
+    for path in files:
+        load_step(path, {"force": np.empty(args.points)})
+
+print(f"{'mode':>9} {'total [s]':>10} {'blocked [s]':>12} {'hidden [s]':>11}")
+
+start = time.perf_counter()
+blocked = 0.0
+out = {name: np.empty(shape) for name, shape in fields.items()}
+for path in files:
+    t = time.perf_counter()
+    load_step(path, out)
+    blocked += time.perf_counter() - t
+    time.sleep(args.solve_ms / 1e3)
+print(f"{'sync':>9} {time.perf_counter() - start:>10.3f} {blocked:>12.3f} {0.0:>11.3f}")
+
+start = time.perf_counter()
+with TimeSeriesReader(files, fields) as reader:
+    while reader.advance() is not None:
+        time.sleep(args.solve_ms / 1e3)
+print(f"{'prefetch':>9} {time.perf_counter() - start:>10.3f} {reader.wait_time:>12.3f} {reader.hidden_time:>11.3f}")
+
+for path in files:
+    for name in (path, path + ".bin"):
+        if os.path.exists(name):
+            os.remove(name)
+os.rmdir(directory)
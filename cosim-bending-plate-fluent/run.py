@@ -2,55 +2,71 @@ import ansys.mapdl.core as pymapdl
 import ansys.fluent.core as pyfluent
 import ansys.systemcoupling.core as pysyc
 
-#================================
+import os
+import sys
+
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.startup import SessionStartup
 
-mapdl = pymapdl.launch_mapdl()
+#================================
 
-mapdl.prep7()
+def setupSolid(mapdl):
+    mapdl.prep7()
 
-# define material properties
-mapdl.mp("DENS", 1, 2550)
-mapdl.mp("ALPX", 1, 1.2e-05)
-mapdl.mp("EX", 1, 2500000)
-mapdl.mp("NUXY", 1, 0.35)
+    # define material properties
+    mapdl.mp("DENS", 1, 2550)
+    mapdl.mp("ALPX", 1, 1.2e-05)
+    mapdl.mp("EX", 1, 2500000)
+    mapdl.mp("NUXY", 1, 0.35)
 
-# set element types to SOLID186
-mapdl.et(1, 186)
-mapdl.keyopt(1,2,1)
+    # set element types to SOLID186
+    mapdl.et(1, 186)
+    mapdl.keyopt(1,2,1)
 
-# make geometry
-mapdl.block(10.00, 10.06, 0.0, 1.0, 0.0, 0.4)
-mapdl.vsweep(1)
+    # make geometry
+    mapdl.block(10.00, 10.06, 0.0, 1.0, 0.0, 0.4)
+    mapdl.vsweep(1)
 
-# add fixed support at y=0
-mapdl.nsel("S", "LOC", "Y", 0)
-mapdl.d("all", "all")
+    # add fixed support at y=0
+    mapdl.nsel("S", "LOC", "Y", 0)
+    mapdl.d("all", "all")
 
-# add FSI interface
-mapdl.nsel("S", "LOC", "X", 9.99, 10.01)
-mapdl.nsel("A", "LOC", "Y", 0.99, 1.01)
-mapdl.nsel("A", "LOC", "X", 10.05, 10.07)
-mapdl.cm("FSIN_1", "NODE")
-mapdl.sf("FSIN_1", "FSIN", 1)
+    # add FSI interface
+    mapdl.nsel("S", "LOC", "X", 9.99, 10.01)
+    mapdl.nsel("A", "LOC", "Y", 0.99, 1.01)
+    mapdl.nsel("A", "LOC", "X", 10.05, 10.07)
+    mapdl.cm("FSIN_1", "NODE")
+    mapdl.sf("FSIN_1", "FSIN", 1)
 
-mapdl.allsel()
+    mapdl.allsel()
 
-mapdl.run("/SOLU")
+    mapdl.run("/SOLU")
 
-# set analysis type to steady
-mapdl.antype(0)
+    # set analysis type to steady
+    mapdl.antype(0)
 
 #================================
 
-# open Fluent and read in the pre-created case file
-fluent = pyfluent.launch_fluent(start_transcript=False)
-fluent.file.read(file_type="case", file_name="case.cas.h5")
-fluent.solution.run_calculation.iter_count = 1
+def setupFluid(fluent):
+    # read in the pre-created case file
+    fluent.file.read(file_type="case", file_name="case.cas.h5")
+    fluent.solution.run_calculation.iter_count = 1
 
 #================================
 
-syc = pysyc.launch()
-syc.start_output()
+# launch MAPDL, Fluent and System Coupling at the same time,
+# MAPDL and Fluent are set up as soon as they are up
+startup = SessionStartup()
+startup.add("mapdl", pymapdl.launch_mapdl, setupSolid)
+startup.add("fluent", lambda: pyfluent.launch_fluent(start_transcript=False), setupFluid)
+startup.add("syc", pysyc.launch, lambda syc: syc.start_output())
+sessions = startup.start()
+print(startup.timeline())
+
+mapdl = sessions["mapdl"]
+fluent = sessions["fluent"]
+syc = sessions["syc"]
 
 # add participants
 fluid_name = syc.setup.add_participant(participant_session = fluent)
@@ -1,160 +1,158 @@
 import ansys.fluent.core as pyfluent
 import ansys.systemcoupling.core as pysyc
 
-#===
-
-pipe_fluid_meshing = pyfluent.launch_fluent(product_version="24.1.0", mode="meshing", start_transcript=False)
-pipe_fluid_meshing.workflow.InitializeWorkflow(WorkflowType="Watertight Geometry")
-
-pipe_fluid_meshing.workflow.TaskObject["Import Geometry"].Arguments = {
-    "FileName": "pipe_fluid.scdoc",
-    "LengthUnit": "m",
-}
-
-pipe_fluid_meshing.workflow.TaskObject["Import Geometry"].Execute()
-
-pipe_fluid_meshing.workflow.TaskObject["Add Local Sizing"].AddChildToTask()
-pipe_fluid_meshing.workflow.TaskObject["Add Local Sizing"].Execute()
-
-pipe_fluid_meshing.workflow.TaskObject["Generate the Surface Mesh"].Arguments = {
-    "CFDSurfaceMeshControls": {"MaxSize": 0.025}
-}
-
-pipe_fluid_meshing.workflow.TaskObject["Generate the Surface Mesh"].Execute()
-
-pipe_fluid_meshing.workflow.TaskObject["Describe Geometry"].UpdateChildTasks(
-    SetupTypeChanged=False
-)
-
-pipe_fluid_meshing.workflow.TaskObject["Describe Geometry"].Arguments = {
-    "SetupType": "The geometry consists of only fluid regions with no voids"
-}
-
-pipe_fluid_meshing.workflow.TaskObject["Describe Geometry"].UpdateChildTasks(SetupTypeChanged=True)
-pipe_fluid_meshing.workflow.TaskObject["Describe Geometry"].Execute()
+import os
+import sys
 
-pipe_fluid_meshing.workflow.TaskObject["Update Boundaries"].Arguments = {
-    "BoundaryLabelList": ["inlet", "outlet", "wall"],
-    "BoundaryLabelTypeList": ["velocity-inlet", "pressure-outlet", "wall"],
-    "OldBoundaryLabelList": ["inlet", "outlet", "wall"],
-    "OldBoundaryLabelTypeList": ["velocity-inlet", "pressure outlet", "wall"],
-}
-pipe_fluid_meshing.workflow.TaskObject["Update Boundaries"].Execute()
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.mesh_cache import MeshCache
+from syctools.startup import SessionStartup
 
-pipe_fluid_meshing.workflow.TaskObject["Update Regions"].Execute()
+fluent_version = "24.1.0"
 
-pipe_fluid_meshing.workflow.TaskObject["Add Boundary Layers"].AddChildToTask()
-pipe_fluid_meshing.workflow.TaskObject["Add Boundary Layers"].InsertCompoundChildTask()
-pipe_fluid_meshing.workflow.TaskObject["smooth-transition_1"].Arguments = {
-    "BLControlName": "smooth-transition_1",
-}
-pipe_fluid_meshing.workflow.TaskObject["Add Boundary Layers"].Arguments = {}
-pipe_fluid_meshing.workflow.TaskObject["smooth-transition_1"].Execute()
+def launchMeshing():
+    return pyfluent.launch_fluent(product_version=fluent_version, mode="meshing", start_transcript=False)
 
-pipe_fluid_meshing.workflow.TaskObject["Generate the Volume Mesh"].Arguments = {
-    "VolumeFill": "poly-hexcore",
-    "VolumeFillControls": {
-        "HexMaxCellLength": 0.025,
-    },
-}
-pipe_fluid_meshing.workflow.TaskObject["Generate the Volume Mesh"].Execute()
-
-pipe_fluid_session = pipe_fluid_meshing.switch_to_solver()
+def launchSolver():
+    return pyfluent.launch_fluent(product_version=fluent_version, start_transcript=False)
 
 #===
 
-# turn on energy model
-pipe_fluid_session.setup.models.energy.enabled = True
-
-# add water material
-pipe_fluid_session.setup.materials.database.copy_by_name(type="fluid", name="water-liquid")
-
-# set up cell zone conditions
-pipe_fluid_session.setup.cell_zone_conditions.fluid["fluid"].material = "water-liquid"
-
-# set up boundary conditions
-pipe_fluid_session.setup.boundary_conditions.velocity_inlet["inlet"].momentum.velocity = 0.1
-pipe_fluid_session.setup.boundary_conditions.wall["wall"].thermal.thermal_bc = "via System Coupling"
-
-# set up solver settings - 1 fluent iteration per 1 coupling iteration
-pipe_fluid_session.solution.run_calculation.iter_count = 1
-
-#===
-
-pipe_solid_meshing = pyfluent.launch_fluent(product_version="24.1.0", mode="meshing", start_transcript=False)
-pipe_solid_meshing.workflow.InitializeWorkflow(WorkflowType="Watertight Geometry")
-
-pipe_solid_meshing.workflow.TaskObject["Import Geometry"].Arguments = {
-    "FileName": "pipe_solid.scdoc",
-    "LengthUnit": "m",
-}
-
-pipe_solid_meshing.workflow.TaskObject["Import Geometry"].Execute()
-
-pipe_solid_meshing.workflow.TaskObject["Add Local Sizing"].AddChildToTask()
-pipe_solid_meshing.workflow.TaskObject["Add Local Sizing"].Execute()
-
-pipe_solid_meshing.workflow.TaskObject["Generate the Surface Mesh"].Arguments = {
-    "CFDSurfaceMeshControls": {"MaxSize": 0.01}
-}
-
-pipe_solid_meshing.workflow.TaskObject["Generate the Surface Mesh"].Execute()
-
-pipe_solid_meshing.workflow.TaskObject["Describe Geometry"].UpdateChildTasks(
-    SetupTypeChanged=False
-)
-
-pipe_solid_meshing.workflow.TaskObject["Describe Geometry"].Arguments = {
-    "SetupType": "The geometry consists of only solid regions"
-}
-
-pipe_solid_meshing.workflow.TaskObject["Describe Geometry"].UpdateChildTasks(SetupTypeChanged=True)
-pipe_solid_meshing.workflow.TaskObject["Describe Geometry"].Execute()
-
-pipe_solid_meshing.workflow.TaskObject["Update Boundaries"].Execute()
-
-pipe_solid_meshing.workflow.TaskObject["Update Regions"].Execute()
-
-pipe_solid_meshing.workflow.TaskObject["Generate the Volume Mesh"].Arguments = {
-    "VolumeFill": "tetrahedral",
-}
-pipe_solid_meshing.workflow.TaskObject["Generate the Volume Mesh"].Execute()
-
-pipe_solid_meshing.tui.mesh.check_mesh()
-
-pipe_solid_session = pipe_solid_meshing.switch_to_solver()
+# Watertight Geometry workflow for the fluid: (task, action[, arguments])
+pipe_fluid_meshing_steps = [
+    ("Import Geometry", "Arguments", {
+        "FileName": "pipe_fluid.scdoc",
+        "LengthUnit": "m",
+    }),
+    ("Import Geometry", "Execute"),
+    ("Add Local Sizing", "AddChildToTask"),
+    ("Add Local Sizing", "Execute"),
+    ("Generate the Surface Mesh", "Arguments", {
+        "CFDSurfaceMeshControls": {"MaxSize": 0.025}
+    }),
+    ("Generate the Surface Mesh", "Execute"),
+    ("Describe Geometry", "UpdateChildTasks", {"SetupTypeChanged": False}),
+    ("Describe Geometry", "Arguments", {
+        "SetupType": "The geometry consists of only fluid regions with no voids"
+    }),
+    ("Describe Geometry", "UpdateChildTasks", {"SetupTypeChanged": True}),
+    ("Describe Geometry", "Execute"),
+    ("Update Boundaries", "Arguments", {
+        "BoundaryLabelList": ["inlet", "outlet", "wall"],
+        "BoundaryLabelTypeList": ["velocity-inlet", "pressure-outlet", "wall"],
+        "OldBoundaryLabelList": ["inlet", "outlet", "wall"],
+        "OldBoundaryLabelTypeList": ["velocity-inlet", "pressure outlet", "wall"],
+    }),
+    ("Update Boundaries", "Execute"),
+    ("Update Regions", "Execute"),
+    ("Add Boundary Layers", "AddChildToTask"),
+    ("Add Boundary Layers", "InsertCompoundChildTask"),
+    ("smooth-transition_1", "Arguments", {
+        "BLControlName": "smooth-transition_1",
+    }),
+    ("Add Boundary Layers", "Arguments", {}),
+    ("smooth-transition_1", "Execute"),
+    ("Generate the Volume Mesh", "Arguments", {
+        "VolumeFill": "poly-hexcore",
+        "VolumeFillControls": {
+            "HexMaxCellLength": 0.025,
+        },
+    }),
+    ("Generate the Volume Mesh", "Execute"),
+]
+
+def setupFluid(pipe_fluid_session):
+    # turn on energy model
+    pipe_fluid_session.setup.models.energy.enabled = True
+
+    # add water material
+    pipe_fluid_session.setup.materials.database.copy_by_name(type="fluid", name="water-liquid")
+
+    # set up cell zone conditions
+    pipe_fluid_session.setup.cell_zone_conditions.fluid["fluid"].material = "water-liquid"
+
+    # set up boundary conditions
+    pipe_fluid_session.setup.boundary_conditions.velocity_inlet["inlet"].momentum.velocity = 0.1
+    pipe_fluid_session.setup.boundary_conditions.wall["wall"].thermal.thermal_bc = "via System Coupling"
+
+    # set up solver settings - 1 fluent iteration per 1 coupling iteration
+    pipe_fluid_session.solution.run_calculation.iter_count = 1
 
 #===
 
-# turn on energy model
-pipe_solid_session.setup.models.energy.enabled = True
-
-# add copper material
-pipe_solid_session.setup.materials.database.copy_by_name(type="solid", name="copper")
-
-# set up cell zone conditions
-pipe_solid_session.setup.cell_zone_conditions.solid["solid"].material = "copper"
-
-# set up boundary conditions
-pipe_solid_session.setup.boundary_conditions.wall["outer_wall"].thermal.thermal_bc = "Temperature"
-pipe_solid_session.setup.boundary_conditions.wall["outer_wall"].thermal.t.value = 350
-
-pipe_solid_session.setup.boundary_conditions.wall["inner_wall"].thermal.thermal_bc = "via System Coupling"
-
-pipe_solid_session.setup.boundary_conditions.wall["insulated1"].thermal.thermal_bc = "Heat Flux"
-pipe_solid_session.setup.boundary_conditions.wall["insulated1"].thermal.q.value = 0
-
-pipe_solid_session.setup.boundary_conditions.wall["insulated2"].thermal.thermal_bc = "Heat Flux"
-pipe_solid_session.setup.boundary_conditions.wall["insulated2"].thermal.q.value = 0
-
-# set up solver settings - 1 fluent iteration per 1 coupling iteration
-pipe_solid_session.solution.run_calculation.iter_count = 1
+# Watertight Geometry workflow for the solid
+pipe_solid_meshing_steps = [
+    ("Import Geometry", "Arguments", {
+        "FileName": "pipe_solid.scdoc",
+        "LengthUnit": "m",
+    }),
+    ("Import Geometry", "Execute"),
+    ("Add Local Sizing", "AddChildToTask"),
+    ("Add Local Sizing", "Execute"),
+    ("Generate the Surface Mesh", "Arguments", {
+        "CFDSurfaceMeshControls": {"MaxSize": 0.01}
+    }),
+    ("Generate the Surface Mesh", "Execute"),
+    ("Describe Geometry", "UpdateChildTasks", {"SetupTypeChanged": False}),
+    ("Describe Geometry", "Arguments", {
+        "SetupType": "The geometry consists of only solid regions"
+    }),
+    ("Describe Geometry", "UpdateChildTasks", {"SetupTypeChanged": True}),
+    ("Describe Geometry", "Execute"),
+    ("Update Boundaries", "Execute"),
+    ("Update Regions", "Execute"),
+    ("Generate the Volume Mesh", "Arguments", {
+        "VolumeFill": "tetrahedral",
+    }),
+    ("Generate the Volume Mesh", "Execute"),
+]
+
+def setupSolid(pipe_solid_session):
+    # turn on energy model
+    pipe_solid_session.setup.models.energy.enabled = True
+
+    # add copper material
+    pipe_solid_session.setup.materials.database.copy_by_name(type="solid", name="copper")
+
+    # set up cell zone conditions
+    pipe_solid_session.setup.cell_zone_conditions.solid["solid"].material = "copper"
+
+    # set up boundary conditions
+    pipe_solid_session.setup.boundary_conditions.wall["outer_wall"].thermal.thermal_bc = "Temperature"
+    pipe_solid_session.setup.boundary_conditions.wall["outer_wall"].thermal.t.value = 350
+
+    pipe_solid_session.setup.boundary_conditions.wall["inner_wall"].thermal.thermal_bc = "via System Coupling"
+
+    pipe_solid_session.setup.boundary_conditions.wall["insulated1"].thermal.thermal_bc = "Heat Flux"
+    pipe_solid_session.setup.boundary_conditions.wall["insulated1"].thermal.q.value = 0
+
+    pipe_solid_session.setup.boundary_conditions.wall["insulated2"].thermal.thermal_bc = "Heat Flux"
+    pipe_solid_session.setup.boundary_conditions.wall["insulated2"].thermal.q.value = 0
+
+    # set up solver settings - 1 fluent iteration per 1 coupling iteration
+    pipe_solid_session.solution.run_calculation.iter_count = 1
 
 #===
 
-# launch System Coupling session
-syc = pysyc.launch(version = "24.1")
-syc.start_output()
+# fluid and solid are meshed (or read from the mesh cache) and set up concurrently,
+# while System Coupling starts; meshes are reused while the .scdoc and the steps are unchanged
+mesh_cache = MeshCache(".mesh-cache")
+
+startup = SessionStartup()
+startup.add("fluid", lambda: mesh_cache.solver_session(
+    "pipe_fluid.scdoc", pipe_fluid_meshing_steps, launchMeshing, launchSolver, fluent_version), setupFluid)
+startup.add("solid", lambda: mesh_cache.solver_session(
+    "pipe_solid.scdoc", pipe_solid_meshing_steps, launchMeshing, launchSolver, fluent_version,
+    finish=lambda meshing: meshing.tui.mesh.check_mesh()), setupSolid)
+startup.add("syc", lambda: pysyc.launch(version = "24.1"), lambda syc: syc.start_output())
+sessions = startup.start()
+print(startup.timeline())
+print(mesh_cache.report())
+
+pipe_fluid_session = sessions["fluid"]
+pipe_solid_session = sessions["solid"]
+syc = sessions["syc"]
 
 # add two Fluent sessions above as participants
 fluid_name = syc.setup.add_participant(participant_session = pipe_fluid_session)
@@ -0,0 +1,108 @@
+import ansys.fluent.core as pyfluent
+import ansys.systemcoupling.core as pysyc
+
+import argparse
+import os
+import sys
+
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.coupling_session import ReusedCoupling
+from syctools.session_pool import SessionPool, read_file
+from syctools.settings import apply_settings
+
+# runs the CHT case of run.py for several inlet velocities, reusing two warm
+# Fluent sessions and one System Coupling session for all of them
+parser = argparse.ArgumentParser()
+parser.add_argument("--velocities", type=float, nargs="+", default=[0.05, 0.1, 0.2])
+parser.add_argument("--max-iterations", type=int, default=100)
+parser.add_argument("--max-idle", type=float, default=600.0)
+args = parser.parse_args()
+
+#===
+
+def setupFluid(pipe_fluid_session, velocity):
+    # energy model, water material, cell zone and boundary conditions, and
+    # 1 fluent iteration per 1 coupling iteration, applied in one transaction
+    apply_settings(pipe_fluid_session, {
+        "setup": {
+            "models": {"energy": {"enabled": True}},
+            "cell_zone_conditions": {"fluid": {"fluid": {"material": "water-liquid"}}},
+            "boundary_conditions": {
+                "velocity_inlet": {"inlet": {"momentum": {"velocity": velocity}}},
+                "wall": {"wall": {"thermal": {"thermal_bc": "via System Coupling"}}},
+            },
+        },
+        "solution": {"run_calculation": {"iter_count": 1}},
+    }, materials={"fluid": ["water-liquid"]})
+
+def setupSolid(pipe_solid_session):
+    # energy model, copper material, cell zone and boundary conditions, and
+    # 1 fluent iteration per 1 coupling iteration, applied in one transaction
+    apply_settings(pipe_solid_session, {
+        "setup": {
+            "models": {"energy": {"enabled": True}},
+            "cell_zone_conditions": {"solid": {"solid": {"material": "copper"}}},
+            "boundary_conditions": {
+                "wall": {
+                    "outer_wall": {"thermal": {"thermal_bc": "Temperature", "t": {"value": 350}}},
+                    "inner_wall": {"thermal": {"thermal_bc": "via System Coupling"}},
+                    "insulated1": {"thermal": {"thermal_bc": "Heat Flux", "q": {"value": 0}}},
+                    "insulated2": {"thermal": {"thermal_bc": "Heat Flux", "q": {"value": 0}}},
+                },
+            },
+        },
+        "solution": {"run_calculation": {"iter_count": 1}},
+    }, materials={"solid": ["copper"]})
+
+#===
+
+# one pool per participant, so each case gets the fluid session back as the
+# fluid participant; a session that is evicted or fails its health check is
+# replaced by a new launch, and the coupling re-adds that participant
+pools = {
+    label: SessionPool(lambda: pyfluent.launch_fluent(start_transcript=False), size=1, max_idle=args.max_idle)
+    for label in ("fluid", "solid")
+}
+for pool in pools.values():
+    pool.warm()
+
+# launch System Coupling session, kept for all cases; participants, interface
+# and transfers are set up on the first case and only changed settings after that
+syc = pysyc.launch()
+syc.start_output()
+coupling = ReusedCoupling(syc)
+
+for velocity in args.velocities:
+    print(f"inlet velocity {velocity} m/s", flush=True)
+
+    # re-reading the mesh resets whatever case the session held before
+    with pools["fluid"].session(read_file("mesh", "pipe_fluid.msh.h5")) as pipe_fluid_session, \
+         pools["solid"].session(read_file("mesh", "pipe_solid.msh.h5")) as pipe_solid_session:
+        setupFluid(pipe_fluid_session, velocity)
+        setupSolid(pipe_solid_session)
+
+        # add two Fluent sessions above as participants
+        fluid_name = coupling.participant("fluid", pipe_fluid_session, display_name = "Fluid")
+        solid_name = coupling.participant("solid", pipe_solid_session, display_name = "Solid")
+
+        # add a coupling interface
+        interface = coupling.interface(fluid_name, ["wall"], solid_name, ["inner_wall"])
+
+        # set up 2-way coupling - add temperature and heat flow data transfers
+        coupling.thermal_data_transfers(interface)
+        coupling.solution_control(maximum_iterations = args.max_iterations)
+
+        # solve the coupled analysis
+        coupling.solve()
+
+#===
+
+# clean up at the end
+print(coupling.report())
+for label, pool in pools.items():
+    print(label, pool.report())
+syc.end_output()
+syc.exit()
+for pool in pools.values():
+    pool.close()
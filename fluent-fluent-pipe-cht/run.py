@@ -1,65 +1,74 @@
 import ansys.fluent.core as pyfluent
 import ansys.systemcoupling.core as pysyc
 
-#===
-
-# launch Fluent session and read in mesh file
-pipe_fluid_session = pyfluent.launch_fluent(start_transcript=False)
-pipe_fluid_mesh_file = "pipe_fluid.msh.h5"
-pipe_fluid_session.file.read(file_type="mesh", file_name=pipe_fluid_mesh_file)
-
-# turn on energy model
-pipe_fluid_session.setup.models.energy.enabled = True
-
-# add water material
-pipe_fluid_session.setup.materials.database.copy_by_name(type="fluid", name="water-liquid")
+import os
+import sys
 
-# set up cell zone conditions
-pipe_fluid_session.setup.cell_zone_conditions.fluid["fluid"].material = "water-liquid"
-
-# set up boundary conditions
-pipe_fluid_session.setup.boundary_conditions.velocity_inlet["inlet"].momentum.velocity = 0.1
-pipe_fluid_session.setup.boundary_conditions.wall["wall"].thermal.thermal_bc = "via System Coupling"
-
-# set up solver settings - 1 fluent iteration per 1 coupling iteration
-pipe_fluid_session.solution.run_calculation.iter_count = 1
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.settings import apply_settings
+from syctools.startup import SessionStartup
 
 #===
 
-# launch another Fluent session and read in mesh file
-pipe_solid_session = pyfluent.launch_fluent(start_transcript=False)
-pipe_solid_mesh_file = "pipe_solid.msh.h5"
-pipe_solid_session.file.read(file_type="mesh", file_name=pipe_solid_mesh_file)
-
-# turn on energy model
-pipe_solid_session.setup.models.energy.enabled = True
+def setupFluid(pipe_fluid_session):
+    # read in mesh file
+    pipe_fluid_mesh_file = "pipe_fluid.msh.h5"
+    pipe_fluid_session.file.read(file_type="mesh", file_name=pipe_fluid_mesh_file)
+
+    # energy model, water material, cell zone and boundary conditions, and
+    # 1 fluent iteration per 1 coupling iteration, applied in one transaction
+    apply_settings(pipe_fluid_session, {
+        "setup": {
+            "models": {"energy": {"enabled": True}},
+            "cell_zone_conditions": {"fluid": {"fluid": {"material": "water-liquid"}}},
+            "boundary_conditions": {
+                "velocity_inlet": {"inlet": {"momentum": {"velocity": 0.1}}},
+                "wall": {"wall": {"thermal": {"thermal_bc": "via System Coupling"}}},
+            },
+        },
+        "solution": {"run_calculation": {"iter_count": 1}},
+    }, materials={"fluid": ["water-liquid"]})
 
-# add copper material
-pipe_solid_session.setup.materials.database.copy_by_name(type="solid", name="copper")
-
-# set up cell zone conditions
-pipe_solid_session.setup.cell_zone_conditions.solid["solid"].material = "copper"
-
-# set up boundary conditions
-pipe_solid_session.setup.boundary_conditions.wall["outer_wall"].thermal.thermal_bc = "Temperature"
-pipe_solid_session.setup.boundary_conditions.wall["outer_wall"].thermal.t.value = 350
-
-pipe_solid_session.setup.boundary_conditions.wall["inner_wall"].thermal.thermal_bc = "via System Coupling"
-
-pipe_solid_session.setup.boundary_conditions.wall["insulated1"].thermal.thermal_bc = "Heat Flux"
-pipe_solid_session.setup.boundary_conditions.wall["insulated1"].thermal.q.value = 0
-
-pipe_solid_session.setup.boundary_conditions.wall["insulated2"].thermal.thermal_bc = "Heat Flux"
-pipe_solid_session.setup.boundary_conditions.wall["insulated2"].thermal.q.value = 0
+#===
 
-# set up solver settings - 1 fluent iteration per 1 coupling iteration
-pipe_solid_session.solution.run_calculation.iter_count = 1
+def setupSolid(pipe_solid_session):
+    # read in mesh file
+    pipe_solid_mesh_file = "pipe_solid.msh.h5"
+    pipe_solid_session.file.read(file_type="mesh", file_name=pipe_solid_mesh_file)
+
+    # energy model, copper material, cell zone and boundary conditions, and
+    # 1 fluent iteration per 1 coupling iteration, applied in one transaction
+    apply_settings(pipe_solid_session, {
+        "setup": {
+            "models": {"energy": {"enabled": True}},
+            "cell_zone_conditions": {"solid": {"solid": {"material": "copper"}}},
+            "boundary_conditions": {
+                "wall": {
+                    "outer_wall": {"thermal": {"thermal_bc": "Temperature", "t": {"value": 350}}},
+                    "inner_wall": {"thermal": {"thermal_bc": "via System Coupling"}},
+                    "insulated1": {"thermal": {"thermal_bc": "Heat Flux", "q": {"value": 0}}},
+                    "insulated2": {"thermal": {"thermal_bc": "Heat Flux", "q": {"value": 0}}},
+                },
+            },
+        },
+        "solution": {"run_calculation": {"iter_count": 1}},
+    }, materials={"solid": ["copper"]})
 
 #===
 
-# launch System Coupling session
-syc = pysyc.launch()
-syc.start_output()
+# launch both Fluent sessions and the System Coupling session at the same time,
+# each Fluent session is set up as soon as it is up
+startup = SessionStartup()
+startup.add("fluid", lambda: pyfluent.launch_fluent(start_transcript=False), setupFluid)
+startup.add("solid", lambda: pyfluent.launch_fluent(start_transcript=False), setupSolid)
+startup.add("syc", pysyc.launch, lambda syc: syc.start_output())
+sessions = startup.start()
+print(startup.timeline())
+
+pipe_fluid_session = sessions["fluid"]
+pipe_solid_session = sessions["solid"]
+syc = sessions["syc"]
 
 # add two Fluent sessions above as participants
 fluid_name = syc.setup.add_participant(participant_session = pipe_fluid_session)
@@ -1,34 +1,41 @@
 import os
 import sys
-import numpy as np
 
 import ansys.systemcoupling.partlib as scp
 
 import argparse
 
-nodeIds = np.array([1])
-nodeCoords = np.array([[0.0,0.0,0.0]])
-solutionData = {"point-cloud" : {"vin" : np.array([0.0]), "vout" : np.array([1.0])}}
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.buffers import BufferRegistry
+from syctools.instrument import instrument
+
+# all arrays and SCP wrappers are allocated once and reused on every iteration
+buffers = BufferRegistry(scp)
+nodeIds, nodeCoords = buffers.add_point_cloud("point-cloud", [1], [[0.0,0.0,0.0]])
+buffers.add_variable("point-cloud", "vin", [0.0])
+buffers.add_variable("point-cloud", "vout", [1.0])
+solutionData = buffers.data
 coordinatesStamp = 0
 
 def getPointCloud(regionName):
-    pc = scp.PointCloud(scp.OutputIntegerData(nodeIds), scp.OutputVectorData(nodeCoords))
-    pc.coordinatesStemp = coordinatesStamp
-    return pc
+    return buffers.point_cloud(regionName, coordinatesStamp)
 
 def getInputScalar(regionName, variableName):
-    return scp.InputScalarData(solutionData[regionName][variableName])
+    return buffers.input_scalar(regionName, variableName)
 
 def getOutputScalar(regionName, variableName):
-    return scp.OutputScalarData(solutionData[regionName][variableName])
+    return buffers.output_scalar(regionName, variableName)
 
 parser = argparse.ArgumentParser()
 parser.add_argument("--schost", type=str, default="")
 parser.add_argument("--scport", type=int, default=0)
 parser.add_argument("--scname", type=str, default="")
+parser.add_argument("--instrument", type=str, default="")
 args, unknown = parser.parse_known_args()
 
-sc = scp.SystemCoupling(args.schost, args.scport, args.scname, "test")
+# --instrument <prefix> writes call timings to <prefix>.json/.csv on disconnect
+sc = instrument(scp.SystemCoupling(args.schost, args.scport, args.scname, "test"), args.instrument, buffers)
 
 sc.registerPointCloudAccess(getPointCloud)
 sc.registerInputScalarDataAccess(getInputScalar)
@@ -41,3 +48,5 @@ while sc.doIteration():
     sc.updateOutputs(scp.Complete)
 
 sc.disconnect()
+if args.instrument:
+    print(sc.timing_report())
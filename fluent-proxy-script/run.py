@@ -1,106 +1,21 @@
 import ansys.fluent.core as pyfluent
 import ansys.systemcoupling.core as pysyc
 
-from dataclasses import dataclass
-from typing import List
-
-import subprocess
 import os
+import sys
 
-#===
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.adapter import Region, ScriptParticipant
+from syctools.settings import apply_settings
 
-class Solver():
-
-    class SystemCoupling():
-    
-        @dataclass
-        class Variable:
-            name: str
-            display_name: str
-            tensor_type: str
-            is_extensive: bool
-            location: str
-            quantity_type: str    
-
-        @dataclass
-        class Region:
-            name: str
-            display_name: str
-            topology: str
-            input_variables: List[str]
-            output_variables: List[str]
-    
-        def __init__(self, solver):
-            self.solver = solver
-
-        @property
-        def participant_type(self) -> str:
-            return "DEFAULT"
-
-        def get_analysis_type(self) -> str:
-            return "Steady"
-
-        def get_variables(self):
-            variables = list()
-            vin = Solver.SystemCoupling.Variable(
-                name="vin",
-                display_name="vin",
-                tensor_type="Scalar",
-                is_extensive=False,
-                location="Node",
-                quantity_type="Unspecified",
-            )
-            vout = Solver.SystemCoupling.Variable(
-                name="vout",
-                display_name="vout",
-                tensor_type="Scalar",
-                is_extensive=False,
-                location="Node",
-                quantity_type="Unspecified",
-            )
-            variables.append(vin)
-            variables.append(vout)
-            return variables
-
-        def get_regions(self):
-            regions = list()
-            region = Solver.SystemCoupling.Region(
-                name="point-cloud",
-                display_name="point-cloud",
-                topology="Surface",
-                input_variables=["vin"],
-                output_variables=["vout"],
-            )
-            regions.append(region)
-            return regions
-
-        def connect(self, host, port, name):
-            print(f"Connecting! Host: {host}, port: {port}, name: {name}", flush=True)
-            self.standardOutput = open(f"{name}.stdout", "w")        
-            pythonScript = os.path.abspath("participant.py")
-            fullPathExeWithArguments = f'python "{pythonScript}" --schost {host} --scport {port} --scname {name}'
-            print(f"Full executable: {fullPathExeWithArguments}")
-            self.participant_process = subprocess.Popen(            
-                fullPathExeWithArguments,
-                stdin=subprocess.PIPE,
-                stdout=self.standardOutput,
-                stderr=self.standardOutput,
-                shell=True,
-            )
-            if not (self.participant_process and self.participant_process.poll() == None):
-                raise RuntimeError("Something went wrong. Check participant log output.")
-            print("Connected!", flush=True)
-
-        def solve(self):
-            print("Solving!", flush=True)
-            self.participant_process.communicate()
-            print("Finished solving!", flush=True)
-
-    def __init__(self):
-        self.system_coupling = Solver.SystemCoupling(self)
 #===
 
-my_solver = Solver()
+my_solver = ScriptParticipant(
+    "participant.py",
+    variables={"vin": "Scalar", "vout": "Scalar"},
+    regions=[Region("point-cloud", topology="Surface", input_variables=["vin"], output_variables=["vout"])],
+)
 
 #===
 
@@ -109,21 +24,19 @@ pipe_fluid_session = pyfluent.launch_fluent(start_transcript=False, product_vers
 pipe_fluid_mesh_file = "pipe_fluid.msh.h5"
 pipe_fluid_session.file.read(file_type="mesh", file_name=pipe_fluid_mesh_file)
 
-# turn on energy model
-pipe_fluid_session.setup.models.energy.enabled = True
-
-# add water material
-pipe_fluid_session.setup.materials.database.copy_by_name(type="fluid", name="water-liquid")
-
-# set up cell zone conditions
-pipe_fluid_session.setup.cell_zone_conditions.fluid["fluid"].material = "water-liquid"
-
-# set up boundary conditions
-pipe_fluid_session.setup.boundary_conditions.velocity_inlet["inlet"].momentum.velocity = 0.1
-pipe_fluid_session.setup.boundary_conditions.wall['wall'].thermal.thermal_condition = "via System Coupling"
-
-# set up solver settings - 1 fluent iteration per 1 coupling iteration
-pipe_fluid_session.solution.run_calculation.iter_count = 1
+# energy model, water material, cell zone and boundary conditions, and
+# 1 fluent iteration per 1 coupling iteration, applied in one transaction
+apply_settings(pipe_fluid_session, {
+    "setup": {
+        "models": {"energy": {"enabled": True}},
+        "cell_zone_conditions": {"fluid": {"fluid": {"material": "water-liquid"}}},
+        "boundary_conditions": {
+            "velocity_inlet": {"inlet": {"momentum": {"velocity": 0.1}}},
+            "wall": {"wall": {"thermal": {"thermal_condition": "via System Coupling"}}},
+        },
+    },
+    "solution": {"run_calculation": {"iter_count": 1}},
+}, materials={"fluid": ["water-liquid"]})
 
 #===
 
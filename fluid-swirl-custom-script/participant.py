@@ -1,41 +1,64 @@
 import numpy as np
-import ansys.systemcoupling.partlib as scp
 import argparse
+import os
 import sys
-import math
+
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+if "--loopback" in sys.argv:
+    # in-process stand-in for System Coupling, same setup as run.py
+    import syctools.loopback as scp
+    scp.configure(regions={"source": {"outputs": ["force"]}}, tensor_types={"force": "Vector"})
+else:
+    import ansys.systemcoupling.partlib as scp
+from syctools.instrument import instrument
+from syctools.outofcore import MappedStore
+from syctools.reorder import CURVES, Reordering
+from syctools.sharding import ShardedRegions
+from syctools.shm import SharedArrays
+from syctools.swirl import fill_swirl_shard, swirl_source, swirl_source_into
 
 nodeIds = {"source" : np.array([], dtype=np.int64)}
 nodeCoords = {"source" : np.array([], dtype=np.float64)}
 solutionData = {"source" : {"force" : np.array([], dtype=np.float64) }}
+nodeOrder = {}
 
-# generate source data
-def generateSourceData():
-    forceMag = 5.0
-    naxial = 33
-    ncirc = 10
-    nrad = 20
-    radius = 0.025
-    nodeid_values = list()
-    coords_values = list()
-    forces_values = list()
-    for xi in range(naxial):
-        x = (1.0 - 0.0) * xi / (naxial - 1)
-        for ti in range(ncirc):
-            theta = 2.0 * math.pi * ti / ncirc
-            for ri in range(nrad):
-                r = radius * (ri + 1) / nrad
-                z = r * math.cos(theta)
-                y = r * math.sin(theta)
-                fx = 0.0
-                fy = forceMag * math.sin(theta + 0.5 * math.pi)
-                fz = forceMag * math.cos(theta + 0.5 * math.pi)
-                nodeid_values.append(len(nodeid_values))
-                coords_values.append([x, y, z])
-                forces_values.append([fx, fy, fz])
+# generate source data (or take ids, coordinates and forces given as source)
+def generateSourceData(naxial, ncirc, nrad, radius, forceMag, voxelSize=0.0, curve="", source=None):
+    if source is None:
+        source = swirl_source(naxial, ncirc, nrad, radius, forceMag)
+    ids, coords, forces = source
+    if voxelSize > 0.0:
+        # imported here, so SciPy is only needed when decimating
+        from syctools.decimate import VoxelDecimator
+        # force is not extensive (see run.py), so it is averaged per voxel
+        decimator = VoxelDecimator(coords, voxelSize)
+        print(decimator.report(forces))
+        forces = decimator.reduce(forces)
+        coords = decimator.coords
+        ids = np.arange(len(coords), dtype=np.int64)
+    if curve:
+        # ids travel with their points, so System Coupling sees the same cloud
+        nodeOrder["source"] = Reordering(coords, curve)
+        ids, coords, fields = nodeOrder["source"].apply_region(ids, coords, {"force": forces})
+        forces = fields["force"]
+    nodeIds["source"] = ids
+    nodeCoords["source"] = coords
+    solutionData["source"]["force"] = forces
 
-    nodeIds["source"] = np.array(nodeid_values)
-    nodeCoords["source"] = np.array(coords_values)
-    solutionData["source"]["force"] = np.array(forces_values)
+# generate source data straight into memory-mapped files in directory
+def generateMappedSourceData(directory, naxial, ncirc, nrad, radius, forceMag):
+    store = MappedStore(directory)
+    npoints = naxial * ncirc * nrad
+    ids = store.create("source.ids", npoints, np.int64)
+    coords = store.create("source.coords", (npoints, 3))
+    forces = store.create("source.force", (npoints, 3))
+    swirl_source_into(ids, coords, forces, naxial, ncirc, nrad, radius, forceMag)
+    store.flush()
+    nodeIds["source"] = ids
+    nodeCoords["source"] = coords
+    solutionData["source"]["force"] = forces
+    return store
 
 def getPointCloud(regionName):
     return scp.PointCloud(scp.OutputIntegerData(nodeIds[regionName]), scp.OutputVectorData(nodeCoords[regionName]))
@@ -47,15 +70,51 @@ parser = argparse.ArgumentParser()
 parser.add_argument("--schost", type=str, default="")
 parser.add_argument("--scport", type=int, default=0)
 parser.add_argument("--scname", type=str, default="")
+parser.add_argument("--instrument", type=str, default="")
+parser.add_argument("--naxial", type=int, default=33)
+parser.add_argument("--ncirc", type=int, default=10)
+parser.add_argument("--nrad", type=int, default=20)
+parser.add_argument("--radius", type=float, default=0.025)
+parser.add_argument("--forcemag", type=float, default=5.0)
+parser.add_argument("--voxelsize", type=float, default=0.0)
+parser.add_argument("--reorder", type=str, choices=("",) + CURVES, default="")
+parser.add_argument("--loopback", action="store_true")
+parser.add_argument("--shm", type=str, default="")
+parser.add_argument("--memmap", type=str, default="")
+parser.add_argument("--workers", type=int, default=0)
 args, unknown = parser.parse_known_args()
 
 try:
-    sc = scp.SystemCoupling(args.schost, args.scport, args.scname, "script")
+    # --instrument <prefix> writes call timings to <prefix>.json/.csv on disconnect
+    sc = instrument(scp.SystemCoupling(args.schost, args.scport, args.scname, "script"), args.instrument)
 
     sc.registerPointCloudAccess(getPointCloud)
     sc.registerOutputVectorDataAccess(getOutputVector)
 
-    generateSourceData()
+    store = None
+    shards = None
+    sharedSource = None
+    if args.memmap:
+        # out-of-core: the arrays live in files, the callbacks serve the mappings
+        store = generateMappedSourceData(args.memmap, args.naxial, args.ncirc, args.nrad, args.radius, args.forcemag)
+    else:
+        source = None
+        if args.shm:
+            # source data already held by run.py, mapped without copying; the
+            # cloud is whatever run.py generated (run.py takes the resolution
+            # options), --naxial/--ncirc/--nrad/--radius/--forcemag are ignored
+            # here (--voxelsize and --reorder still apply)
+            sharedSource = SharedArrays.attach(args.shm)
+            source = tuple(sharedSource.arrays[name] for name in ("ids", "coords", "force"))
+        elif args.workers:
+            # worker processes fill whole axial stations of the cloud in shared memory
+            shards = ShardedRegions({"source": {"points": args.naxial * args.ncirc * args.nrad, "variables": {"force": 3}}},
+                                    workers=args.workers, align={"source": args.ncirc * args.nrad})
+            shards.run(fill_swirl_shard, args.naxial, args.ncirc, args.nrad, args.radius, args.forcemag)
+            # the arrays are filled, so the workers are not needed during the run
+            shards.stop_workers()
+            source = (shards.ids["source"], shards.coords["source"], shards.data["source"]["force"])
+        generateSourceData(args.naxial, args.ncirc, args.nrad, args.radius, args.forcemag, args.voxelsize, args.reorder, source)
     print(nodeIds)
     print(nodeCoords)
     print(solutionData)
@@ -67,6 +126,24 @@ try:
         sc.updateOutputs(scp.Complete)
 
     sc.disconnect()
+    if store or shards or sharedSource:
+        # release the mappings before the store, the shards or the shared
+        # block free them
+        nodeIds.clear()
+        nodeCoords.clear()
+        solutionData.clear()
+        source = None
+        if store:
+            store.close()
+        if shards:
+            shards.close()
+        if sharedSource:
+            # unmaps the block here; run.py, which owns it, unlinks it
+            sharedSource.close()
+    if args.loopback:
+        print(sc.report())
+    if args.instrument:
+        print(sc.timing_report())
 except Exception as e:
     print(e)
     sys.exit(1)
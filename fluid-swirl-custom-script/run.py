@@ -1,11 +1,25 @@
 # import required modules
 import ansys.fluent.core as pyfluent
 import ansys.systemcoupling.core as pysyc
-import math
+import argparse
 import os
-import subprocess
-from dataclasses import dataclass
-from typing import List
+import sys
+
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.adapter import PointCloudRegion, ScriptParticipant
+from syctools.shm import SharedArrays
+from syctools.swirl import swirl_source
+
+# resolution and strength of the source cloud, generated here and shared
+# with participant.py
+parser = argparse.ArgumentParser()
+parser.add_argument("--naxial", type=int, default=33)
+parser.add_argument("--ncirc", type=int, default=10)
+parser.add_argument("--nrad", type=int, default=20)
+parser.add_argument("--radius", type=float, default=0.025)
+parser.add_argument("--forcemag", type=float, default=5.0)
+args = parser.parse_args()
 
 # launch products
 fluent = pyfluent.launch_fluent(start_transcript=True, product_version = "24.2.0")
@@ -14,91 +28,18 @@ syc = pysyc.launch(version = "24.2")
 # setup fluid analysis
 fluent.file.read(file_type="case", file_name="tube.cas.h5")
 
-# define source participant
-class Solver():
-
-    class SystemCoupling():
-    
-        @dataclass
-        class Variable:
-            name: str
-            display_name: str
-            tensor_type: str
-            is_extensive: bool
-            location: str
-            quantity_type: str    
-
-        @dataclass
-        class Region:
-            name: str
-            display_name: str
-            topology: str
-            input_variables: List[str]
-            output_variables: List[str]
-            region_discretization_type: str
-    
-        def __init__(self, solver):
-            self.solver = solver
-
-        @property
-        def participant_type(self) -> str:
-            return "DEFAULT"
-
-        def get_analysis_type(self) -> str:
-            return "Steady"
-
-        def get_variables(self):
-            variables = list()
-            fvar = Solver.SystemCoupling.Variable(
-                name="force",
-                display_name="force",
-                tensor_type="Vector",
-                is_extensive=False,
-                location="Node",
-                quantity_type="Unspecified",
-            )
-            variables.append(fvar)
-            return variables
+# source data are created once here and handed to participant.py through
+# shared memory, instead of being regenerated in the participant process
+sourceData = SharedArrays.from_arrays(dict(zip(("ids", "coords", "force"), swirl_source(
+    args.naxial, args.ncirc, args.nrad, args.radius, args.forcemag))))
 
-        def get_regions(self):
-            regions = list()
-            region = Solver.SystemCoupling.Region(
-                name="source",
-                display_name="source",
-                topology="Volume",
-                region_discretization_type="Point Cloud Region",
-                input_variables=[],
-                output_variables=["force"],
-            )
-            regions.append(region)
-            return regions
-
-        def connect(self, host, port, name):
-            print(f"Connecting! Host: {host}, port: {port}, name: {name}", flush=True)
-            self.standardOutput = open(f"{name}.stdout", "w")        
-            pythonScript = os.path.abspath("participant.py")
-            fullPathExeWithArguments = f'python "{pythonScript}" --schost {host} --scport {port} --scname {name}'
-            print(f"Full executable: {fullPathExeWithArguments}")
-            self.participant_process = subprocess.Popen(            
-                fullPathExeWithArguments,
-                stdin=subprocess.PIPE,
-                stdout=self.standardOutput,
-                stderr=self.standardOutput,
-                shell=True,
-            )
-            if not (self.participant_process and self.participant_process.poll() == None):
-                raise RuntimeError("Something went wrong. Check participant log output.")
-            print("Connected!", flush=True)
-
-        def solve(self):
-            print("Solving!", flush=True)
-            self.participant_process.communicate()
-            print("Finished solving!", flush=True)
-
-    def __init__(self):
-        self.system_coupling = Solver.SystemCoupling(self)
-
-source_participant = Solver()
+# define source participant
+source_participant = ScriptParticipant(
+    "participant.py",
+    variables={"force": "Vector"},
+    regions=[PointCloudRegion("source", output_variables=["force"])],
+    arguments=["--shm", sourceData.descriptor],
+)
 
 # setup coupled analysis
 
@@ -125,8 +66,11 @@ t = syc.setup.add_data_transfer(
     target_variable = "lorentz-force",
 )
 
-# solve
-syc.solution.solve()
+# solve; the shared source block is freed even if the solve fails
+try:
+    syc.solution.solve()
+finally:
+    sourceData.unlink()
 
 # post-process
 fluent.results.graphics.picture.use_window_resolution = False
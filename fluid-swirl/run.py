@@ -1,7 +1,18 @@
 # import required modules
 import ansys.fluent.core as pyfluent
 import ansys.systemcoupling.core as pysyc
-import math
+import argparse
+import os
+import sys
+
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.scdt import write_scdt, write_scdt_chunks
+from syctools.swirl import swirl_source, swirl_source_chunks
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--voxelsize", type=float, default=0.0, help="decimate the source cloud on a voxel grid of this size")
+args = parser.parse_args()
 
 # launch products
 fluent = pyfluent.launch_fluent(start_transcript=True, product_version = "24.2.0")
@@ -11,28 +22,22 @@ syc = pysyc.launch(version = "24.2")
 fluent.file.read(file_type="case", file_name="tube.cas.h5")
 
 # generate source
-def createSourceFile(fileName):
-    forceMag = 5.0
-    naxial = 33
-    ncirc = 10
-    nrad = 20
-    radius = 0.025    
-    with open(fileName, "w") as f:
-        for xi in range(naxial):
-            x = (1.0 - 0.0) * xi / (naxial - 1)
-            for ti in range(ncirc):
-                theta = 2.0 * math.pi * ti / ncirc
-                for ri in range(nrad):
-                    r = radius * (ri + 1) / nrad
-                    z = r * math.cos(theta)
-                    y = r * math.sin(theta)
-                    fx = 0.0
-                    fy = forceMag * math.sin(theta + 0.5 * math.pi)
-                    fz = forceMag * math.cos(theta + 0.5 * math.pi)
-                    f.write(f"{x}, {y}, {z}, {fx}, {fy}, {fz}\n")
+def createSourceFile(fileName, voxelSize=0.0):
+    if voxelSize > 0.0:
+        # imported here, so SciPy is only needed when decimating
+        from syctools.decimate import VoxelDecimator
+        # average the forces over voxels to send fewer points
+        ids, coords, forces = swirl_source(naxial=33, ncirc=10, nrad=20, radius=0.025, force_mag=5.0)
+        decimator = VoxelDecimator(coords, voxelSize)
+        print(decimator.report(forces))
+        write_scdt(fileName, decimator.coords, decimator.reduce(forces))
+        return
+    # stream the cloud to the file in chunks, so it is never held in memory at once
+    chunks = swirl_source_chunks(naxial=33, ncirc=10, nrad=20, radius=0.025, force_mag=5.0)
+    write_scdt_chunks(fileName, chunks)
 
 srcFileName = "source.scdt"
-createSourceFile(srcFileName)
+createSourceFile(srcFileName, args.voxelsize)
 
 # setup coupled analysis
 
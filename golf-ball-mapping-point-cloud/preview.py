@@ -0,0 +1,178 @@
+# Map variables from source.scdt onto target.scdt in-process, without
+# launching System Coupling, and write target-output.scdt. Useful to try
+# mapping settings in seconds before running the real case with run.py.
+#
+# Any number of value columns, and a whole directory of snapshot files that
+# share the source geometry, are mapped in one pass: the neighbour search
+# and weights are computed once and applied to all fields together. With
+# --moving the snapshots may move the source points, and the weights are
+# only recomputed for the targets near the points that moved.
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.decimate import VoxelDecimator
+from syctools.mapping import METHODS, PointCloudMapper, global_sum_error, map_stacked
+from syctools.moving import MovingCloud
+from syctools.reorder import CURVES, Reordering
+from syctools.scdt import write_scdt
+from syctools.scdt_binary import load_scdt
+from syctools.weight_cache import WeightCache
+
+def valueColumns(columns, ncols):
+    if columns is None:
+        return [f"Variable{i}" for i in range(1, ncols - 2)]
+    return columns[3:]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--source", type=str, default="source.scdt")
+parser.add_argument("--snapshots", type=str, default="", help="directory of source .scdt snapshots, used instead of --source")
+parser.add_argument("--moving", action="store_true", help="snapshots may move the source points (same points in the same order)")
+parser.add_argument("--target", type=str, default="target.scdt")
+parser.add_argument("--output", type=str, default="target-output.scdt", help=".scdt for one multi-column file, .npy for a stacked (snapshot, point, variable) array")
+parser.add_argument("--variable", type=str, action="append", help="variable to map, may be repeated (default: all)")
+parser.add_argument("--extensive", type=str, action="append", default=[], help="variable to map conservatively, may be repeated")
+parser.add_argument("--voxel-size", type=float, default=0.0, help="decimate the source on a voxel grid of this size first")
+parser.add_argument("--reorder", type=str, choices=("",) + CURVES, default="", help="sort both clouds along a space-filling curve before mapping")
+parser.add_argument("--method", type=str, choices=METHODS, default="idw")
+parser.add_argument("--neighbours", type=int, default=8)
+parser.add_argument("--power", type=float, default=2.0)
+parser.add_argument("--support", type=float, default=1.5)
+parser.add_argument("--chunk-size", type=int, default=16384)
+parser.add_argument("--workers", type=int, default=None)
+parser.add_argument("--cache-dir", type=str, default=".weight-cache", help="empty to disable the weight cache")
+parser.add_argument("--cache-size-mb", type=float, default=1024.0)
+args = parser.parse_args()
+if args.moving and args.voxel_size > 0.0:
+    sys.exit("--moving cannot be combined with --voxel-size")
+
+start = time.perf_counter()
+if args.snapshots:
+    sourceFiles = sorted(glob.glob(os.path.join(args.snapshots, "*.scdt")))
+    if not sourceFiles:
+        sys.exit(f"No .scdt files found in {args.snapshots}")
+else:
+    sourceFiles = [args.source]
+
+sourceColumns, source = load_scdt(sourceFiles[0])
+names = valueColumns(sourceColumns, source.shape[1])
+variables = args.variable or names
+columns = [3 + names.index(v) for v in variables]
+
+# fields are stacked as (source point, snapshot, variable)
+fields = np.empty((len(source), len(sourceFiles), len(variables)))
+snapshotCoords = np.empty((len(sourceFiles), len(source), 3)) if args.moving else None
+for i, fileName in enumerate(sourceFiles):
+    _, snapshot = load_scdt(fileName) if i else (sourceColumns, source)
+    if snapshot.shape[0] != len(source) or not (args.moving or np.array_equal(snapshot[:, :3], source[:, :3])):
+        sys.exit(f"{fileName} does not have the same points as {sourceFiles[0]}")
+    if args.moving:
+        snapshotCoords[i] = snapshot[:, :3]
+    fields[:, i, :] = snapshot[:, columns]
+
+targetColumns, target = load_scdt(args.target)
+loaded = time.perf_counter()
+
+# intensive variables keep their profile, extensive ones their global sum
+extensive = [v in args.extensive for v in variables]
+intensive = [not e for e in extensive]
+
+sourceCoords = source[:, :3]
+if args.voxel_size > 0.0:
+    decimator = VoxelDecimator(sourceCoords, args.voxel_size)
+    for j, v in enumerate(variables):
+        print(f"{v}: {decimator.report(fields[:, :, j], extensive[j])}")
+    decimated = np.empty((len(decimator.coords),) + fields.shape[1:])
+    decimated[:, :, intensive] = decimator.reduce(fields[:, :, intensive])
+    decimated[:, :, extensive] = decimator.reduce(fields[:, :, extensive], extensive=True)
+    sourceCoords, fields = decimator.coords, decimated
+
+targetCoords = target[:, :3]
+if args.reorder:
+    sourceOrder = Reordering(sourceCoords, args.reorder)
+    targetOrder = Reordering(targetCoords, args.reorder)
+    sourceCoords, fields = sourceOrder.apply(sourceCoords), sourceOrder.apply(fields)
+    if args.moving:
+        snapshotCoords = np.stack([sourceOrder.apply(c) for c in snapshotCoords])
+    targetCoords = targetOrder.apply(targetCoords)
+
+cache = WeightCache(args.cache_dir, max_bytes=int(args.cache_size_mb * 2**20)) if args.cache_dir else None
+
+def newMapper(conservative):
+    return PointCloudMapper(
+        sourceCoords,
+        method=args.method,
+        neighbours=args.neighbours,
+        power=args.power,
+        support=args.support,
+        conservative=conservative,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+
+def cachedWeights(mapper):
+    if cache:
+        return cache.weights(mapper, targetCoords)
+    return mapper.weights(targetCoords)
+
+values = np.empty((len(target),) + fields.shape[1:])
+profileValues = np.empty((len(target), len(sourceFiles), sum(extensive)))
+
+def mapSnapshots(snapshots, weights, conservativeWeights=None):
+    if any(intensive):
+        values[:, snapshots, intensive] = map_stacked(weights, fields[:, snapshots, intensive])
+    if any(extensive):
+        profileValues[:, snapshots] = map_stacked(weights, fields[:, snapshots, extensive])
+        values[:, snapshots, extensive] = map_stacked(conservativeWeights, fields[:, snapshots, extensive])
+
+mappers = [newMapper(conservative=False)] + ([newMapper(conservative=True)] if any(extensive) else [])
+weightSets = [cachedWeights(mapper) for mapper in mappers]
+movingCloud = None
+if args.moving:
+    # one snapshot at a time; only weights around the moved points are redone
+    movingCloud = MovingCloud(np.arange(len(sourceCoords)), mappers[0].source_coords)
+    for i in range(len(sourceFiles)):
+        for mapper in mappers:
+            mapper.source_coords[...] = snapshotCoords[i]
+        movingCloud.commit()
+        if len(movingCloud.moved):
+            weightSets = [mapper.update_weights(w, targetCoords, movingCloud.moved)
+                          for mapper, w in zip(mappers, weightSets)]
+        mapSnapshots(i, *weightSets)
+else:
+    mapSnapshots(slice(None), *weightSets)
+if any(extensive):
+    profileErrors = global_sum_error(fields[:, :, extensive], profileValues)
+    errors = global_sum_error(fields[:, :, extensive], values[:, :, extensive])
+if args.reorder:
+    # back to the order of the target file
+    values = targetOrder.restore(values)
+mapped = time.perf_counter()
+
+if args.output.endswith(".npy"):
+    np.save(args.output, values.transpose(1, 0, 2))
+else:
+    if len(sourceFiles) == 1:
+        header = variables
+    else:
+        stems = [os.path.splitext(os.path.basename(f))[0] for f in sourceFiles]
+        header = [f"{stem}:{v}" for stem in stems for v in variables]
+    targetHeader = targetColumns[:3] if targetColumns else ["X", "Y", "Z"]
+    write_scdt(args.output, target[:, :3], values.reshape(len(target), -1), header=targetHeader + header)
+written = time.perf_counter()
+
+print(f"Mapped {len(variables)} variable(s) x {len(sourceFiles)} snapshot(s) from {len(sourceCoords)} to {len(target)} points with {args.method}")
+print(f"  load {loaded - start:.3f} s, map {mapped - loaded:.3f} s, write {written - mapped:.3f} s")
+if any(extensive):
+    for j, v in enumerate(v for v, e in zip(variables, extensive) if e):
+        print(f"  global sum error of {v}: {errors[:, j].max():.3e} conservative, {profileErrors[:, j].max():.3e} profile-preserving")
+if movingCloud:
+    print(f"  {movingCloud.report()}")
+if cache:
+    print(f"  {cache.report()}")
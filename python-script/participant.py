@@ -1,39 +1,66 @@
+import glob
 import os
 import sys
-import numpy as np
 
-# include these few lines before importing SCP library
-if sys.platform.startswith("win"):
-    for p in os.environ["PYTHON_DLL_PATH"].split(os.pathsep):
-        if p: os.add_dll_directory(p)
+import argparse
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--schost", type=str, default="")
+parser.add_argument("--scport", type=int, default=0)
+parser.add_argument("--scname", type=str, default="")
+parser.add_argument("--instrument", type=str, default="")
+parser.add_argument("--deltathreshold", type=float, default=0.25)
+parser.add_argument("--loopback", action="store_true")
+parser.add_argument("--series", type=str, default="")
+args, unknown = parser.parse_known_args()
 
-from pyExt import SystemCouplingParticipant as scp
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
-import argparse
+if args.loopback:
+    # in-process stand-in for System Coupling, same setup as run.py
+    import syctools.loopback as scp
+    scp.configure(regions={"point-cloud": {"inputs": ["vin"], "outputs": ["vout"]}},
+                  transfers={"vin": "vout"}, time_steps=4, iterations=5)
+else:
+    # include these few lines before importing SCP library
+    if sys.platform.startswith("win"):
+        for p in os.environ["PYTHON_DLL_PATH"].split(os.pathsep):
+            if p: os.add_dll_directory(p)
 
-nodeIds = np.array([1])
-nodeCoords = np.array([[0.0,0.0,0.0]])
-solutionData = {"point-cloud" : {"vin" : np.array([0.0]), "vout" : np.array([1.0])}}
+    from pyExt import SystemCouplingParticipant as scp
+
+from syctools.buffers import BufferRegistry
+from syctools.instrument import instrument
+from syctools.moving import MovingCloud
+from syctools.timeseries import TimeSeriesReader
+
+# all arrays and SCP wrappers are allocated once and reused on every iteration
+buffers = BufferRegistry(scp)
+nodeIds, nodeCoords = buffers.add_point_cloud("point-cloud", [1], [[0.0,0.0,0.0]])
+buffers.add_variable("point-cloud", "vin", [0.0])
+buffers.add_variable("point-cloud", "vout", [1.0])
+solutionData = buffers.data
 coordinatesStamp = 0
 
 def getPointCloud(regionName):
-    pc = scp.PointCloud(scp.OutputIntegerData(nodeIds), scp.OutputVectorData(nodeCoords))
-    pc.coordinatesStemp = coordinatesStamp
-    return pc
+    return buffers.point_cloud(regionName, coordinatesStamp)
 
 def getInputScalar(regionName, variableName):
-    return scp.InputScalarData(solutionData[regionName][variableName])
+    return buffers.input_scalar(regionName, variableName)
 
 def getOutputScalar(regionName, variableName):
-    return scp.OutputScalarData(solutionData[regionName][variableName])
+    return buffers.output_scalar(regionName, variableName)
 
-parser = argparse.ArgumentParser()
-parser.add_argument("--schost", type=str, default="")
-parser.add_argument("--scport", type=int, default=0)
-parser.add_argument("--scname", type=str, default="")
-args, unknown = parser.parse_known_args()
+# tracks which points moved, so the stamp only changes when something did
+movingCloud = MovingCloud(nodeIds, nodeCoords, threshold=args.deltathreshold)
+
+# --series "vout-*.npz": one file per time step with the "vout" values,
+# the next step is read in the background while the current one iterates
+series = TimeSeriesReader(sorted(glob.glob(args.series)), {"vout": (1,)}) if args.series else None
 
-sc = scp.SystemCoupling(args.schost, args.scport, args.scname, "test")
+# --instrument <prefix> writes call timings to <prefix>.json/.csv on disconnect
+sc = instrument(scp.SystemCoupling(args.schost, args.scport, args.scname, "test"), args.instrument, buffers)
 
 sc.registerPointCloudAccess(getPointCloud)
 sc.registerInputScalarDataAccess(getInputScalar)
@@ -43,16 +70,27 @@ sc.initializeAnalysis()
 
 while sc.doTimeStep():
     nodeCoords[0][0] += 1.0 # move the point in x-direction by 1
-    coordinatesStamp += 1 # increment stamp
+    coordinatesStamp = movingCloud.commit() # increment stamp if any point moved
+    if series and series.advance() is not None:
+        buffers.bind_variable("point-cloud", "vout", series.current["vout"])
     while sc.doIteration():
         sc.updateInputs()
         sc.updateOutputs(scp.Complete)
+        buffers.verify()
 
 sc.disconnect()
+if series:
+    series.close()
+    print(series.report())
+if args.instrument:
+    print(sc.timing_report())
+print(movingCloud.report())
+if args.loopback:
+    print(sc.report())
 
 # do a simple test to make sure everything works
-# but only if real co-simulation took place
-if args.schost:
+# but only if real co-simulation took place (or its loopback stand-in)
+if args.schost or args.loopback:
     # "vin" data came from another solver, but since another solver
     # is just another instance of this same script, and since System Coupling just takes
     # the "vout" value from the other solver and puts it into "vin" of this one,
@@ -1,110 +1,34 @@
 import ansys.systemcoupling.core as pysyc
 
-from dataclasses import dataclass
-from typing import List
-
-import subprocess
 import os
-
-class Solver():
-
-    class SystemCoupling():
-    
-        @dataclass
-        class Variable:
-            name: str
-            display_name: str
-            tensor_type: str
-            is_extensive: bool
-            location: str
-            quantity_type: str    
-
-        @dataclass
-        class Region:
-            name: str
-            display_name: str
-            topology: str
-            input_variables: List[str]
-            output_variables: List[str]
-    
-        def __init__(self, solver):
-            self.solver = solver
-
-        @property
-        def participant_type(self) -> str:
-            return "DEFAULT"
-
-        def get_analysis_type(self) -> str:
-            return "Transient"
-
-        def get_variables(self):
-            variables = list()
-            vin = Solver.SystemCoupling.Variable(
-                name="vin",
-                display_name="vin",
-                tensor_type="Scalar",
-                is_extensive=False,
-                location="Node",
-                quantity_type="Unspecified",
-            )
-            vout = Solver.SystemCoupling.Variable(
-                name="vout",
-                display_name="vout",
-                tensor_type="Scalar",
-                is_extensive=False,
-                location="Node",
-                quantity_type="Unspecified",
-            )
-            variables.append(vin)
-            variables.append(vout)
-            return variables
-
-        def get_regions(self):
-            regions = list()
-            region = Solver.SystemCoupling.Region(
-                name="point-cloud",
-                display_name="point-cloud",
-                topology="Volume",
-                input_variables=["vin"],
-                output_variables=["vout"],
-            )
-            regions.append(region)
-            return regions
-
-        def connect(self, host, port, name):
-            print(f"Connecting! Host: {host}, port: {port}, name: {name}", flush=True)
-            self.standardOutput = open(f"{name}.stdout", "w")        
-            pythonScript = os.path.abspath("participant.py")
-            # temporary hack (TODO: fix): need to set SYSC_ROOT
-            os.environ["SYSC_ROOT"] = os.path.join(os.environ["AWP_ROOT242"], "SystemCoupling")
-            batchScript = os.path.join(os.environ["AWP_ROOT242"], "SystemCoupling", "Participants", "Scripts", "PythonScript.bat")
-            fullPathExeWithArguments = f'"{batchScript}" --pyscript "{pythonScript}" --schost {host} --scport {port} --scname {name}'
-            print(f"Full executable: {fullPathExeWithArguments}")
-            self.participant_process = subprocess.Popen(            
-                fullPathExeWithArguments,
-                stdin=subprocess.PIPE,
-                stdout=self.standardOutput,
-                stderr=self.standardOutput,
-                shell=True,
-            )
-            if not (self.participant_process and self.participant_process.poll() == None):
-                raise RuntimeError("Something went wrong. Check participant log output.")
-            print("Connected!", flush=True)
-
-        def solve(self):
-            print("Solving!", flush=True)
-            self.participant_process.communicate()
-            print("Finished solving!", flush=True)
-
-    def __init__(self):
-        self.system_coupling = Solver.SystemCoupling(self)
+import sys
+
+# make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from syctools.adapter import Region, ScriptParticipant
+
+def pythonScriptLauncher():
+    # temporary hack (TODO: fix): need to set SYSC_ROOT
+    os.environ["SYSC_ROOT"] = os.path.join(os.environ["AWP_ROOT242"], "SystemCoupling")
+    batchScript = os.path.join(os.environ["AWP_ROOT242"], "SystemCoupling", "Participants", "Scripts", "PythonScript.bat")
+    return [batchScript, "--pyscript"]
+
+# both participants run participant.py with the same regions and variables
+def pointCloudParticipant():
+    return ScriptParticipant(
+        "participant.py",
+        analysis_type="Transient",
+        variables={"vin": "Scalar", "vout": "Scalar"},
+        regions=[Region("point-cloud", input_variables=["vin"], output_variables=["vout"])],
+        launcher=pythonScriptLauncher,
+    )
 
 syc = pysyc.launch(version = "24.2")
 assert(syc.ping())
 syc.start_output()
 
-solver1 = Solver()
-solver2 = Solver()
+solver1 = pointCloudParticipant()
+solver2 = pointCloudParticipant()
 
 part1_name = syc.setup.add_participant(participant_session = solver1)
 part2_name = syc.setup.add_participant(participant_session = solver2)
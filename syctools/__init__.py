@@ -0,0 +1,5 @@
+"""Shared helpers for the pySystemCoupling examples.
+
+The examples are plain scripts that are run from their own directory, so
+they put the repository root on ``sys.path`` before importing from here.
+"""
@@ -0,0 +1,143 @@
+"""System Coupling participant adapter for scripted participants.
+
+PySystemCoupling accepts any object with a ``system_coupling`` attribute
+describing the participant (type, analysis type, variables, regions) and
+able to ``connect`` and ``solve``. `ScriptParticipant` provides that for a
+participant script run as a child process, from a declarative
+description::
+
+    source = ScriptParticipant(
+        "participant.py",
+        variables={"force": "Vector"},
+        regions=[PointCloudRegion("source", output_variables=["force"])],
+    )
+    syc.setup.add_participant(participant_session=source)
+
+Variables and regions are immutable, slotted descriptors validated and
+built once; `get_variables` and `get_regions` return the same cached
+lists on every call. Nothing is started before System Coupling calls
+``connect()``: the launch command is only then assembled and the child
+process started through a `ParticipantDriver`, created on first use and
+shared by all participants of the script.
+"""
+
+import os
+import subprocess
+from dataclasses import dataclass
+from typing import Tuple
+
+from .driver import ParticipantDriver
+
+_driver = None
+
+
+def default_driver():
+    """The `ParticipantDriver` shared by adapters without their own."""
+    global _driver
+    if _driver is None:
+        _driver = ParticipantDriver()
+    return _driver
+
+
+@dataclass(frozen=True, slots=True)
+class Variable:
+    name: str
+    display_name: str = ""
+    tensor_type: str = "Scalar"
+    is_extensive: bool = False
+    location: str = "Node"
+    quantity_type: str = "Unspecified"
+
+    def __post_init__(self):
+        if not self.display_name:
+            object.__setattr__(self, "display_name", self.name)
+
+
+@dataclass(frozen=True, slots=True)
+class Region:
+    name: str
+    display_name: str = ""
+    topology: str = "Volume"
+    input_variables: Tuple[str, ...] = ()
+    output_variables: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        if not self.display_name:
+            object.__setattr__(self, "display_name", self.name)
+        object.__setattr__(self, "input_variables", tuple(self.input_variables))
+        object.__setattr__(self, "output_variables", tuple(self.output_variables))
+
+
+@dataclass(frozen=True, slots=True)
+class PointCloudRegion(Region):
+    region_discretization_type: str = "Point Cloud Region"
+
+
+class ScriptParticipant:
+    """Participant session for a script connecting through the SCP library.
+
+    ``script`` is started as ``<launcher> <script> --schost <host> --scport
+    <port> --scname <name> <arguments>``. ``launcher`` is a list, or a
+    callable returning one when the participant connects (default
+    ``["python"]``). ``variables`` is a sequence of `Variable` or a mapping
+    of names to tensor types; ``regions`` a sequence of `Region`.
+    ``timeout`` bounds how long `solve` waits for the script, in seconds.
+    """
+
+    def __init__(self, script, variables, regions, analysis_type="Steady", participant_type="DEFAULT",
+                 arguments=(), launcher=("python",), driver=None, timeout=None):
+        if isinstance(variables, dict):
+            variables = [Variable(name, tensor_type=tensor) for name, tensor in variables.items()]
+        self._variables = list(variables)
+        self._regions = list(regions)
+        declared = {v.name for v in self._variables}
+        for region in self._regions:
+            missing = set(region.input_variables + region.output_variables) - declared
+            if missing:
+                raise ValueError(f"region {region.name} uses undeclared variables {sorted(missing)}")
+        self.script = script
+        self.analysis_type = analysis_type
+        self._participant_type = participant_type
+        self.arguments = list(arguments)
+        self.launcher = launcher
+        self.driver = driver
+        self.timeout = timeout
+        self.participant_process = None
+
+    @property
+    def system_coupling(self):
+        return self
+
+    @property
+    def participant_type(self) -> str:
+        return self._participant_type
+
+    def get_analysis_type(self) -> str:
+        return self.analysis_type
+
+    def get_variables(self):
+        return self._variables
+
+    def get_regions(self):
+        return self._regions
+
+    def command(self, host, port, name):
+        launcher = self.launcher() if callable(self.launcher) else self.launcher
+        return [*launcher, os.path.abspath(self.script), "--schost", host, "--scport", str(port),
+                "--scname", name, *self.arguments]
+
+    def connect(self, host, port, name):
+        print(f"Connecting! Host: {host}, port: {port}, name: {name}", flush=True)
+        arguments = self.command(host, port, name)
+        print(f"Full executable: {subprocess.list2cmdline(arguments)}")
+        if self.driver is None:
+            self.driver = default_driver()
+        # no shell; output goes to a ring buffer and the rotating {name}.stdout log
+        self.participant_process = self.driver.launch(name, arguments)
+        print("Connected!", flush=True)
+
+    def solve(self):
+        print("Solving!", flush=True)
+        # raises ParticipantCrashed with the last output lines as soon as it fails
+        self.driver.wait(self.participant_process.name, self.timeout)
+        print("Finished solving!", flush=True)
@@ -0,0 +1,158 @@
+"""Preallocated data buffers and cached SCP wrappers for participant scripts.
+
+The access callbacks of a participant (``getPointCloud``,
+``getInputScalar``, ...) are called on every ``updateInputs()`` and
+``updateOutputs()``. `BufferRegistry` allocates one contiguous array per
+region and variable up front and builds each SCP data wrapper once, so the
+callbacks only do a dictionary lookup. The point-cloud wrapper is rebuilt
+only when the coordinates stamp changes.
+
+Arrays handed out by the registry must be updated in place
+(``a[...] = ...``, ``a += ...``); `verify` checks that none of them was
+reallocated.
+
+With a `syctools.outofcore.MappedStore` the arrays are memory-mapped files
+instead of RAM, for clouds that do not fit in memory; `reserve_point_cloud`
+and `reserve_variable` then hand out the mapped arrays to be filled in
+place, e.g. chunk by chunk, without a full in-memory copy.
+"""
+
+import numpy as np
+
+_WRAPPERS = {
+    "input_scalar": "InputScalarData",
+    "output_scalar": "OutputScalarData",
+    "input_vector": "InputVectorData",
+    "output_vector": "OutputVectorData",
+}
+
+
+class BufferRegistry:
+    """Per-region arrays and SCP wrappers for one participant.
+
+    ``scp`` is the SCP module the participant imported, e.g.
+    ``ansys.systemcoupling.partlib``. ``store`` is an optional
+    `MappedStore` backing all arrays.
+    """
+
+    def __init__(self, scp, store=None):
+        self.scp = scp
+        self.store = store
+        self.ids = {}
+        self.coords = {}
+        self.data = {}
+        self._wrappers = {}
+        self._clouds = {}
+        self._addresses = {}
+
+    def _allocate(self, key, shape, dtype):
+        if self.store is None:
+            array = np.empty(shape, dtype=dtype)
+        else:
+            array = self.store.create(".".join(key[1:] + key[:1]), shape, dtype)
+        self._addresses[key] = (array, array.ctypes.data, array.shape)
+        return array
+
+    def _own(self, key, values, dtype):
+        values = np.asarray(values, dtype=dtype)
+        array = self._allocate(key, values.shape, dtype)
+        array[...] = values
+        return array
+
+    def _set_point_cloud(self, region, ids, coords):
+        self.ids[region] = ids
+        self.coords[region] = coords
+        self.data.setdefault(region, {})
+        self._clouds.pop(region, None)
+        return ids, coords
+
+    def add_point_cloud(self, region, ids, coords):
+        """Allocate the node ids and coordinates of ``region`` and return
+        the ``(ids, coords)`` arrays to update in place."""
+        return self._set_point_cloud(
+            region,
+            self._own(("ids", region), ids, np.int64),
+            self._own(("coords", region), np.reshape(coords, (-1, 3)), np.float64),
+        )
+
+    def reserve_point_cloud(self, region, npoints):
+        """Like `add_point_cloud` for ``npoints`` points, but the returned
+        arrays are uninitialized."""
+        return self._set_point_cloud(
+            region,
+            self._allocate(("ids", region), (npoints,), np.int64),
+            self._allocate(("coords", region), (npoints, 3), np.float64),
+        )
+
+    def _set_variable(self, region, variable, array):
+        self.data.setdefault(region, {})[variable] = array
+        for kind in _WRAPPERS:
+            self._wrappers.pop((kind, region, variable), None)
+        return array
+
+    def add_variable(self, region, variable, values):
+        """Allocate the data array of ``variable`` on ``region`` and
+        return it. ``values`` gives the initial values and shape (one
+        row per node, three columns for vectors)."""
+        return self._set_variable(region, variable, self._own(("data", region, variable), values, np.float64))
+
+    def reserve_variable(self, region, variable, shape):
+        """Like `add_variable` with an uninitialized array of ``shape``."""
+        return self._set_variable(region, variable, self._allocate(("data", region, variable), shape, np.float64))
+
+    def bind_variable(self, region, variable, array):
+        """Register an existing float64 array as ``variable`` on ``region``
+        without copying, e.g. the current buffer of a double-buffered
+        reader. Binding a different array later rebuilds the wrappers."""
+        if self.data.get(region, {}).get(variable) is array:
+            return array
+        if array.dtype != np.float64 or not array.flags.c_contiguous:
+            raise ValueError(f"{region}/{variable}: bound arrays must be C-contiguous float64")
+        self._addresses[("data", region, variable)] = (array, array.ctypes.data, array.shape)
+        return self._set_variable(region, variable, array)
+
+    def point_cloud(self, region, stamp=0):
+        """Return the ``scp.PointCloud`` of ``region``, rebuilt only when
+        ``stamp`` differs from the previous call."""
+        cached = self._clouds.get(region)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        pc = self.scp.PointCloud(
+            self.scp.OutputIntegerData(self.ids[region]),
+            self.scp.OutputVectorData(self.coords[region]),
+        )
+        # attribute name as used by the participant scripts
+        pc.coordinatesStemp = stamp
+        self._clouds[region] = (stamp, pc)
+        return pc
+
+    def _wrapper(self, kind, region, variable):
+        key = (kind, region, variable)
+        wrapper = self._wrappers.get(key)
+        if wrapper is None:
+            wrapper = getattr(self.scp, _WRAPPERS[kind])(self.data[region][variable])
+            self._wrappers[key] = wrapper
+        return wrapper
+
+    def input_scalar(self, region, variable):
+        return self._wrapper("input_scalar", region, variable)
+
+    def output_scalar(self, region, variable):
+        return self._wrapper("output_scalar", region, variable)
+
+    def input_vector(self, region, variable):
+        return self._wrapper("input_vector", region, variable)
+
+    def output_vector(self, region, variable):
+        return self._wrapper("output_vector", region, variable)
+
+    def verify(self):
+        """Raise RuntimeError if any registered array was replaced,
+        reallocated or reshaped since it was registered."""
+        current = {("ids", r): a for r, a in self.ids.items()}
+        current.update({("coords", r): a for r, a in self.coords.items()})
+        current.update({("data", r, v): a for r, d in self.data.items() for v, a in d.items()})
+        for key, (array, address, shape) in self._addresses.items():
+            now = current.get(key)
+            if now is not array or array.ctypes.data != address or array.shape != shape:
+                raise RuntimeError(f"buffer {'/'.join(key[1:])} ({key[0]}) was reallocated; update it in place")
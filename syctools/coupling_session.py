@@ -0,0 +1,178 @@
+"""One System Coupling session reused for consecutive solves.
+
+The examples launch System Coupling, add participants, interfaces and data
+transfers, solve and exit. In a design sweep where only solution controls
+or data-transfer settings change between solves, `ReusedCoupling` keeps one
+session and remembers what it has already set up: adding the same
+participant, interface or transfers again returns the existing name, and
+settings are only written when their value differs from what the session
+already has.
+
+System Coupling continues an analysis from where the last solve ended, so
+before every solve after the first the session is shut down and cleared
+(``solution.shutdown()``, ``case.clear_state()``) and the setup recorded
+here is replayed: each variant runs a fresh analysis with its own
+iterations, without launching System Coupling again. Names returned by
+earlier calls may change with the replay; call the setup methods again for
+each variant, as below, to get the current ones::
+
+    coupling = ReusedCoupling(pysyc.launch())
+    for iterations in (50, 100, 200):
+        fluid = coupling.participant("fluid", fluent, display_name="Fluid")
+        ...
+        coupling.solution_control(maximum_iterations=iterations)
+        coupling.solve()
+    print(coupling.report())
+"""
+
+import time
+
+
+class ReusedCoupling:
+    """Caching front end to the setup of a System Coupling session ``syc``.
+
+    ``applied`` and ``skipped`` count setup calls sent to the session and
+    calls answered from the cache; ``solve_times`` lists the wall time of
+    every solve.
+    """
+
+    def __init__(self, syc):
+        self.syc = syc
+        self._participants = {}
+        self._interfaces = {}
+        self._transfers = {}
+        self._transferSettings = {}
+        self._control = {}
+        self._solved = False
+        self.applied = 0
+        self.skipped = 0
+        self.solve_times = []
+
+    def _cached(self, cache, key, create):
+        if key in cache:
+            self.skipped += 1
+            return cache[key]
+        cache[key] = create()
+        self.applied += 1
+        return cache[key]
+
+    def participant(self, label, session, display_name=None, point_cloud_regions=()):
+        """Add ``session`` as participant ``label`` once and return its
+        System Coupling name. ``point_cloud_regions`` get their region
+        discretization type set to point cloud.
+
+        If a different session object comes in for a known label (e.g. a
+        pooled session was replaced), the old participant is deleted with
+        its interfaces and their transfers, and the new session is added.
+        """
+        cached = self._participants.get(label)
+        if cached is not None:
+            if cached[0] is session:
+                self.skipped += 1
+                return cached[1]
+            self._forget_participant(cached[1])
+        name = self.syc.setup.add_participant(participant_session=session)
+        if display_name:
+            self.syc.setup.coupling_participant[name].display_name = display_name
+        for region in point_cloud_regions:
+            self.syc.setup.coupling_participant[name].region[region].region_discretization_type = "Point Cloud Region"
+        self._participants[label] = (session, name, display_name, tuple(point_cloud_regions))
+        self.applied += 1
+        return name
+
+    def _forget_participant(self, name):
+        # deleting an interface deletes its transfers in the session too
+        for key, interface in list(self._interfaces.items()):
+            if name in (key[0], key[2]):
+                del self.syc.setup.coupling_interface[interface]
+                del self._interfaces[key]
+                self.applied += 1
+                for transferKey in [k for k in self._transfers if k[0] == interface]:
+                    del self._transfers[transferKey]
+                for settingsKey in [k for k in self._transferSettings if k[0] == interface]:
+                    del self._transferSettings[settingsKey]
+        del self.syc.setup.coupling_participant[name]
+        self.applied += 1
+
+    def interface(self, side_one_participant, side_one_regions, side_two_participant, side_two_regions):
+        """Add the interface once and return its name."""
+        key = (side_one_participant, tuple(side_one_regions), side_two_participant, tuple(side_two_regions))
+        return self._cached(self._interfaces, key, lambda: self.syc.setup.add_interface(
+            side_one_participant=side_one_participant, side_one_regions=list(side_one_regions),
+            side_two_participant=side_two_participant, side_two_regions=list(side_two_regions)))
+
+    def data_transfer(self, interface, target_side, source_variable, target_variable, **settings):
+        """Add the data transfer once and return its name; ``settings``
+        (data-transfer attributes) are written only when changed."""
+        key = (interface, target_side, source_variable, target_variable)
+        name = self._cached(self._transfers, key, lambda: self.syc.setup.add_data_transfer(
+            interface=interface, target_side=target_side,
+            source_variable=source_variable, target_variable=target_variable))
+        if settings:
+            transfer = self.syc.setup.coupling_interface[interface].data_transfer[name]
+            self._update(self._transferSettings.setdefault((interface, name), {}), transfer, settings)
+        return name
+
+    def thermal_data_transfers(self, interface):
+        """Add the thermal data transfers of ``interface`` once."""
+        return self._cached(self._transfers, (interface, "thermal"),
+                            lambda: self.syc.setup.add_thermal_data_transfers(interface=interface))
+
+    def fsi_data_transfers(self, interface, use_force_density=False):
+        """Add the FSI data transfers of ``interface`` once."""
+        return self._cached(self._transfers, (interface, "fsi", use_force_density),
+                            lambda: self.syc.setup.add_fsi_data_transfers(
+                                interface=interface, use_force_density=use_force_density))
+
+    def _update(self, current, target, values):
+        for attribute, value in values.items():
+            if attribute in current and current[attribute] == value:
+                self.skipped += 1
+                continue
+            setattr(target, attribute, value)
+            current[attribute] = value
+            self.applied += 1
+
+    def solution_control(self, **values):
+        """Set ``solution_control`` attributes that differ from the values
+        set before."""
+        self._update(self._control, self.syc.setup.solution_control, values)
+
+    def _restart(self):
+        # a fresh analysis with the same setup, replayed in the same order
+        self.syc.solution.shutdown()
+        self.syc.case.clear_state()
+        participants, self._participants = self._participants, {}
+        interfaces, self._interfaces = self._interfaces, {}
+        transfers, self._transfers = self._transfers, {}
+        transferSettings, self._transferSettings = self._transferSettings, {}
+        control, self._control = self._control, {}
+        names = {}
+        for label, (session, name, display_name, regions) in participants.items():
+            names[name] = self.participant(label, session, display_name, regions)
+        interfaceNames = {}
+        for (side_one, regions_one, side_two, regions_two), name in interfaces.items():
+            interfaceNames[name] = self.interface(names[side_one], regions_one, names[side_two], regions_two)
+        for key, name in transfers.items():
+            interface = interfaceNames[key[0]]
+            if key[1] == "thermal":
+                self.thermal_data_transfers(interface)
+            elif key[1] == "fsi":
+                self.fsi_data_transfers(interface, key[2])
+            else:
+                self.data_transfer(interface, *key[1:], **transferSettings.get((key[0], name), {}))
+        self.solution_control(**control)
+
+    def solve(self):
+        """Solve; every solve after the first starts a fresh analysis."""
+        if self._solved:
+            self._restart()
+        start = time.perf_counter()
+        self._solved = True
+        self.syc.solution.solve()
+        self.solve_times.append(time.perf_counter() - start)
+
+    def report(self):
+        solves = ", ".join(f"{t:.1f}" for t in self.solve_times)
+        return (f"System Coupling session reused for {len(self.solve_times)} solves ({solves} s), "
+                f"{self.applied} setup calls applied, {self.skipped} answered from the cache")
@@ -0,0 +1,90 @@
+"""Voxel-grid decimation of dense source point clouds.
+
+Points are binned into cubic voxels by hashing their integer voxel
+coordinates into one int64 key per point; each occupied voxel becomes one
+point at the centroid of its members. Intensive fields are averaged and
+extensive fields summed over the members, so global sums are kept.
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from .mapping import PointCloudMapper
+
+
+class VoxelDecimator:
+    """Bin ``coords`` into voxels of edge length ``voxel_size``.
+
+    ``coords`` are the decimated points (voxel centroids), ``inverse``
+    gives the voxel of every original point and ``counts`` the number of
+    points per voxel. Any number of fields can then be reduced with
+    `reduce`.
+    """
+
+    def __init__(self, coords, voxel_size):
+        if voxel_size <= 0.0:
+            raise ValueError("voxel_size must be positive")
+        self.full_coords = np.asarray(coords, dtype=np.float64)
+        self.voxel_size = voxel_size
+        ijk = np.floor((self.full_coords - self.full_coords.min(axis=0)) / voxel_size).astype(np.int64)
+        extent = ijk.max(axis=0) + 1
+        if np.prod(extent.astype(np.float64)) < 2.0**63:
+            keys = (ijk[:, 0] * extent[1] + ijk[:, 1]) * extent[2] + ijk[:, 2]
+            _, self.inverse = np.unique(keys, return_inverse=True)
+        else:
+            _, self.inverse = np.unique(ijk, axis=0, return_inverse=True)
+        self.inverse = self.inverse.ravel()
+        self.counts = np.bincount(self.inverse).astype(np.float64)
+        npoints = len(self.full_coords)
+        # (voxel, point) membership matrix, so reductions are one sparse product
+        self.membership = csr_matrix(
+            (np.ones(npoints), (self.inverse, np.arange(npoints))),
+            shape=(len(self.counts), npoints),
+        )
+        self.coords = self.reduce(self.full_coords)
+
+    def reduce(self, values, extensive=False):
+        """Sum (extensive) or average (intensive) ``values`` per voxel.
+
+        ``values`` has the original points along its first axis and any
+        trailing shape.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        reduced = np.asarray(self.membership @ values.reshape(len(values), -1))
+        if not extensive:
+            reduced /= self.counts[:, None]
+        return reduced.reshape((len(self.counts),) + values.shape[1:])
+
+    def error(self, values, extensive=False):
+        """Report the error introduced by decimating ``values``.
+
+        Intensive fields are interpolated from the voxel centroids back
+        onto the full cloud (inverse-distance weighting). Extensive fields
+        keep their global sum by construction; each voxel total is spread
+        evenly over its member points instead, which shows how much of the
+        field's distribution within a voxel is lost. Either is compared
+        with the original values; errors are relative to the value range.
+        Returns a dict.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        reduced = self.reduce(values, extensive)
+        flat = values.reshape(len(values), -1)
+        if extensive:
+            back = reduced.reshape(len(reduced), -1)[self.inverse] / self.counts[self.inverse, None]
+        else:
+            mapper = PointCloudMapper(self.coords, "idw", neighbours=min(8, len(self.coords)))
+            back = mapper.map(reduced.reshape(len(reduced), -1), self.full_coords)
+        diff = back - flat
+        span = np.ptp(flat, axis=0)
+        span = np.where(span > 0.0, span, 1.0)
+        return {
+            "max_error": float(np.max(np.abs(diff) / span)),
+            "rms_error": float(np.max(np.sqrt(np.mean(diff**2, axis=0)) / span)),
+        }
+
+    def report(self, values, extensive=False):
+        """One-line summary of the reduction and the error it introduces."""
+        error = self.error(values, extensive)
+        ratio = len(self.full_coords) / len(self.coords)
+        errors = ", ".join(f"{k.replace('_', ' ')} {v:.3e}" for k, v in error.items())
+        return f"decimated {len(self.full_coords)} to {len(self.coords)} points ({ratio:.1f}x): {errors}"
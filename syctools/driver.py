@@ -0,0 +1,221 @@
+"""Asyncio driver for participant processes.
+
+The ``Solver.SystemCoupling`` adapters in the ``run.py`` scripts start each
+participant through a shell with its output redirected to a file and then
+block in ``communicate()``. `ParticipantDriver` instead runs one asyncio
+event loop on a single background thread for all participants of a host:
+
+- processes are started without a shell (``create_subprocess_exec``),
+- stdout and stderr lines are read asynchronously into a bounded ring
+  buffer per participant (for error messages) and a rotating log file,
+- a participant exiting with a non-zero code is reported immediately,
+  and anyone waiting for it gets `ParticipantCrashed` with the last lines
+  of its output.
+
+The synchronous methods (`launch`, `wait`, ...) can be called from any
+thread, e.g. from the adapter's ``connect()`` and ``solve()``::
+
+    driver = ParticipantDriver()
+    driver.launch(name, [sys.executable, "participant.py", "--schost", host, ...])
+    driver.wait(name)
+"""
+
+import asyncio
+import collections
+import logging
+import logging.handlers
+import threading
+import time
+
+_CHUNK = 65536
+_MAX_LINE = 2**20
+
+
+class ParticipantCrashed(RuntimeError):
+    """A participant process exited with a non-zero return code."""
+
+    def __init__(self, name, returncode, tail):
+        self.name = name
+        self.returncode = returncode
+        self.tail = tail
+        super().__init__(f"participant {name} exited with code {returncode}; last output:\n" + "\n".join(tail))
+
+
+class ParticipantProcess:
+    """One participant child process and its captured output."""
+
+    def __init__(self, name, args, log_file, ring_lines, max_log_bytes, backups):
+        self.name = name
+        self.args = list(args)
+        self.ring = collections.deque(maxlen=ring_lines)
+        self.process = None
+        self.returncode = None
+        self.started = None
+        self.finished = None
+        self._logger = logging.getLogger(f"syctools.participant.{name}.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._handler = None
+        if log_file:
+            self._handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_log_bytes, backupCount=backups)
+            self._handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(self._handler)
+        self._done = None
+        self._watcher = None
+
+    def _line(self, data, label):
+        text = data.decode("utf-8", "replace").rstrip("\r")
+        self.ring.append(text if label == "stdout" else f"[{label}] {text}")
+        self._logger.info(text)
+
+    async def _pump(self, stream, label):
+        # read in chunks rather than readline(), which raises on lines over
+        # the stream limit (64 KiB); overlong lines are split at _MAX_LINE
+        pending = b""
+        try:
+            while True:
+                chunk = await stream.read(_CHUNK)
+                if not chunk:
+                    break
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    self._line(line, label)
+                while len(pending) >= _MAX_LINE:
+                    self._line(pending[:_MAX_LINE], label)
+                    pending = pending[_MAX_LINE:]
+            if pending:
+                self._line(pending, label)
+        except Exception as error:
+            # keep draining so the participant never blocks on a full pipe
+            self.ring.append(f"[driver] {label} capture failed: {error!r}")
+            while await stream.read(_CHUNK):
+                pass
+
+    async def _start(self, on_exit, **kwargs):
+        self.process = await asyncio.create_subprocess_exec(
+            *self.args,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **kwargs,
+        )
+        self.started = time.time()
+        self._done = asyncio.get_running_loop().create_future()
+        self._watcher = asyncio.ensure_future(self._watch(on_exit))
+
+    async def _watch(self, on_exit):
+        try:
+            await asyncio.gather(
+                self._pump(self.process.stdout, "stdout"),
+                self._pump(self.process.stderr, "stderr"),
+            )
+        finally:
+            # whatever happened to the output, _done gets the real exit code
+            self.returncode = await self.process.wait()
+            self.finished = time.time()
+            if self._handler is not None:
+                self._handler.close()
+                self._logger.removeHandler(self._handler)
+            try:
+                if on_exit is not None:
+                    on_exit(self)
+            finally:
+                if self.returncode != 0:
+                    self._done.set_exception(ParticipantCrashed(self.name, self.returncode, list(self.ring)))
+                else:
+                    self._done.set_result(0)
+
+    @property
+    def running(self):
+        return self.process is not None and self.returncode is None
+
+    def tail(self, lines=20):
+        """The last ``lines`` lines of output."""
+        return list(self.ring)[-lines:]
+
+
+class ParticipantDriver:
+    """Launches and supervises participant processes on one event loop.
+
+    ``log_dir`` receives ``<name>.stdout`` logs rotated at
+    ``max_log_bytes`` with ``backups`` old files kept; ``ring_lines`` is
+    the number of output lines kept in memory per participant.
+    ``on_exit(participant)`` is called on the loop thread as soon as a
+    participant exits, e.g. to abort the coupled run on a crash.
+    """
+
+    def __init__(self, log_dir=".", ring_lines=1000, max_log_bytes=10 * 2**20, backups=3, on_exit=None):
+        self.log_dir = log_dir
+        self.ring_lines = ring_lines
+        self.max_log_bytes = max_log_bytes
+        self.backups = backups
+        self.on_exit = on_exit
+        self.participants = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="participant-driver", daemon=True)
+        self._thread.start()
+
+    def _run(self, coroutine, timeout=None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def launch(self, name, args, log=True, **kwargs):
+        """Start ``args`` (program and arguments, no shell) as participant
+        ``name`` and return its `ParticipantProcess`. Extra keyword
+        arguments (``cwd``, ``env``) go to the subprocess."""
+        logFile = f"{self.log_dir}/{name}.stdout" if log else None
+        participant = ParticipantProcess(name, args, logFile, self.ring_lines, self.max_log_bytes, self.backups)
+        self._run(participant._start(self.on_exit, **kwargs))
+        self.participants[name] = participant
+        return participant
+
+    async def _wait(self, names):
+        return await asyncio.gather(*(self.participants[n]._done for n in names))
+
+    def wait(self, name, timeout=None):
+        """Block until participant ``name`` exits. Raises
+        `ParticipantCrashed` as soon as it fails and `TimeoutError` if it
+        is still running after ``timeout`` seconds."""
+        return self._run(self._wait([name]), timeout)[0]
+
+    def wait_all(self, timeout=None):
+        """Block until all participants exit; raises `ParticipantCrashed`
+        as soon as any of them fails and `TimeoutError` after ``timeout``
+        seconds."""
+        return self._run(self._wait(list(self.participants)), timeout)
+
+    def terminate(self, name):
+        participant = self.participants[name]
+        if participant.running:
+            self._loop.call_soon_threadsafe(participant.process.terminate)
+
+    async def _stop_watchers(self, timeout):
+        watchers = {p._watcher: p for p in self.participants.values() if p._watcher is not None}
+        if not watchers:
+            return
+        _, pending = await asyncio.wait(watchers, timeout=timeout)
+        for watcher in pending:
+            # ignored the terminate, so kill it and give the watcher a moment
+            if watchers[watcher].running:
+                watchers[watcher].process.kill()
+        if pending:
+            _, pending = await asyncio.wait(pending, timeout=timeout)
+        for watcher in pending:
+            watcher.cancel()
+        # collects on_exit errors and crashes nobody waited for, so none is
+        # reported as never retrieved
+        await asyncio.gather(*watchers, return_exceptions=True)
+        for participant in watchers.values():
+            if participant._done.done() and not participant._done.cancelled():
+                participant._done.exception()
+
+    def close(self):
+        """Terminate running participants, wait for their output to be
+        collected and stop the event loop."""
+        for name in self.participants:
+            self.terminate(name)
+        self._run(self._stop_watchers(timeout=10))
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,229 @@
+"""Opt-in timing and byte counting for participant coupling loops.
+
+`instrument` wraps a ``SystemCoupling`` object so that the loop calls
+(``initializeAnalysis``, ``doTimeStep``, ``doIteration``,
+``updateInputs``, ``updateOutputs``, ``disconnect``) and the registered
+access callbacks are timed with ``time.perf_counter_ns``::
+
+    sc = instrument(scp.SystemCoupling(...), "coupling-trace", buffers)
+
+Timings are aggregated per call type and, for callbacks, per region and
+variable into power-of-two latency histograms, so the cost per call is a
+few integer updates and nothing grows with the run length except one
+short row per iteration. On ``disconnect()`` the summary is written to
+``<prefix>.json`` and the per-iteration trace to ``<prefix>.csv``.
+"""
+
+import csv
+import json
+import time
+
+_BUCKETS = 64
+
+
+class _Counter:
+    __slots__ = ("count", "total", "min", "max", "bytes", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.bytes = 0
+        self.buckets = [0] * _BUCKETS
+
+    def add(self, ns, nbytes=0):
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.bytes += nbytes
+        # bucket b holds durations in [2**(b-1), 2**b) ns
+        self.buckets[min(ns.bit_length(), _BUCKETS - 1)] += 1
+
+    def percentile(self, q):
+        # upper bound of the bucket containing the q-th quantile
+        rank = q * self.count
+        seen = 0
+        for b, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(1 << b, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total / 1e6,
+            "mean_us": self.total / max(self.count, 1) / 1e3,
+            "min_us": (self.min or 0) / 1e3,
+            "p50_us": self.percentile(0.5) / 1e3,
+            "p99_us": self.percentile(0.99) / 1e3,
+            "max_us": self.max / 1e3,
+            "bytes": self.bytes,
+            "histogram_ns": {str(1 << b): n for b, n in enumerate(self.buckets) if n},
+        }
+
+
+def _nbytes(buffers, kind, region, variable, result):
+    if buffers is not None:
+        if kind == "pointCloud":
+            return buffers.ids[region].nbytes + buffers.coords[region].nbytes
+        return buffers.data[region][variable].nbytes
+    if kind == "pointCloud":
+        parts = (getattr(result, "ids", None), getattr(result, "coords", None))
+    else:
+        parts = (result,)
+    return sum(getattr(getattr(p, "data", None), "nbytes", 0) for p in parts)
+
+
+class InstrumentedCoupling:
+    """Timing proxy around a ``SystemCoupling`` object (see `instrument`).
+
+    Attributes not instrumented are forwarded to the wrapped object.
+    ``counters`` maps ``(call, region, variable)`` keys to the aggregated
+    timings, ``iterations`` holds one row per coupling iteration.
+    """
+
+    def __init__(self, sc, prefix, buffers=None):
+        self.sc = sc
+        self.prefix = prefix
+        self.buffers = buffers
+        self.counters = {}
+        self.iterations = []
+        self._step = 0
+        self._iteration = 0
+        self._row = None
+
+    def __getattr__(self, name):
+        return getattr(self.sc, name)
+
+    def _counter(self, key):
+        counter = self.counters.get(key)
+        if counter is None:
+            counter = self.counters[key] = _Counter()
+        return counter
+
+    def _timed(self, name, *args):
+        start = time.perf_counter_ns()
+        result = getattr(self.sc, name)(*args)
+        ns = time.perf_counter_ns() - start
+        self._counter((name, "", "")).add(ns)
+        if self._row is not None and name in self._row:
+            self._row[name] += ns
+        return result
+
+    def _wrap(self, kind, callback):
+        counters = self.counters
+        buffers = self.buffers
+        clock = time.perf_counter_ns
+
+        def pointCloud(regionName):
+            start = clock()
+            result = callback(regionName)
+            ns = clock() - start
+            key = (kind, regionName, "")
+            counter = counters.get(key) or self._counter(key)
+            counter.add(ns, _nbytes(buffers, kind, regionName, "", result))
+            return result
+
+        def data(regionName, variableName):
+            start = clock()
+            result = callback(regionName, variableName)
+            ns = clock() - start
+            key = (kind, regionName, variableName)
+            counter = counters.get(key) or self._counter(key)
+            counter.add(ns, _nbytes(buffers, kind, regionName, variableName, result))
+            return result
+
+        return pointCloud if kind == "pointCloud" else data
+
+    def registerPointCloudAccess(self, callback):
+        self.sc.registerPointCloudAccess(self._wrap("pointCloud", callback))
+
+    def registerInputScalarDataAccess(self, callback):
+        self.sc.registerInputScalarDataAccess(self._wrap("inputScalar", callback))
+
+    def registerOutputScalarDataAccess(self, callback):
+        self.sc.registerOutputScalarDataAccess(self._wrap("outputScalar", callback))
+
+    def registerInputVectorDataAccess(self, callback):
+        self.sc.registerInputVectorDataAccess(self._wrap("inputVector", callback))
+
+    def registerOutputVectorDataAccess(self, callback):
+        self.sc.registerOutputVectorDataAccess(self._wrap("outputVector", callback))
+
+    def initializeAnalysis(self):
+        return self._timed("initializeAnalysis")
+
+    def doTimeStep(self):
+        more = self._timed("doTimeStep")
+        if more:
+            self._step += 1
+            self._iteration = 0
+        return more
+
+    def doIteration(self):
+        self._row = None
+        more = self._timed("doIteration")
+        if more:
+            self._iteration += 1
+            self._row = {"step": self._step, "iteration": self._iteration,
+                         "updateInputs": 0, "updateOutputs": 0}
+            self.iterations.append(self._row)
+        return more
+
+    def updateInputs(self):
+        return self._timed("updateInputs")
+
+    def updateOutputs(self, status):
+        return self._timed("updateOutputs", status)
+
+    def disconnect(self):
+        self._row = None
+        result = self._timed("disconnect")
+        self.dump()
+        return result
+
+    def summary(self):
+        return [dict(call=call, region=region, variable=variable, **counter.summary())
+                for (call, region, variable), counter in self.counters.items()]
+
+    def dump(self):
+        """Write ``<prefix>.json`` (aggregated timings and histograms) and
+        ``<prefix>.csv`` (per-iteration ``updateInputs``/``updateOutputs``
+        times in microseconds)."""
+        with open(self.prefix + ".json", "w") as f:
+            json.dump({"calls": self.summary(), "iterations": len(self.iterations)}, f, indent=1)
+        with open(self.prefix + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["step", "iteration", "updateInputs_us", "updateOutputs_us"])
+            for row in self.iterations:
+                writer.writerow([row["step"], row["iteration"],
+                                 row["updateInputs"] / 1e3, row["updateOutputs"] / 1e3])
+
+    def timing_report(self):
+        """Table with one line per call type and region/variable."""
+        lines = [f"{'call':<20} {'region/variable':<24} {'count':>7} {'mean [us]':>10} "
+                 f"{'p99 [us]':>10} {'MB':>8}"]
+        for s in self.summary():
+            name = "/".join(filter(None, (s["region"], s["variable"])))
+            lines.append(f"{s['call']:<20} {name:<24} {s['count']:>7} {s['mean_us']:>10.1f} "
+                         f"{s['p99_us']:>10.1f} {s['bytes'] / 2**20:>8.2f}")
+        return "\n".join(lines)
+
+
+def instrument(sc, prefix, buffers=None):
+    """Wrap ``sc`` in an `InstrumentedCoupling` writing to ``prefix``, or
+    return ``sc`` unchanged if ``prefix`` is empty (instrumentation off).
+
+    ``buffers`` is the participant's `BufferRegistry`, used to count the
+    bytes behind each callback; without it the ``data`` attribute of the
+    returned wrapper is used when available. Callbacks must be registered
+    through the returned object.
+    """
+    if not prefix:
+        return sc
+    return InstrumentedCoupling(sc, prefix, buffers)
@@ -0,0 +1,306 @@
+"""Loopback stand-in for the System Coupling participant library (SCP).
+
+This module provides the part of the SCP API used by the participant
+scripts, so they can be run and profiled on a plain machine without a
+System Coupling server::
+
+    import syctools.loopback as scp
+
+    scp.configure(regions={"point-cloud": {"inputs": ["vin"], "outputs": ["vout"]}},
+                  tensor_types={"vin": "Scalar", "vout": "Scalar"},
+                  transfers={"vin": "vout"}, time_steps=4, iterations=5)
+    sc = scp.SystemCoupling("", 0, "", "test")
+    sc.registerPointCloudAccess(getPointCloud)
+    ...
+
+`SystemCoupling` starts a coupling server on a background thread and talks
+to it over a local TCP socket. Point clouds and field data are serialized
+into length-prefixed frames (a JSON header followed by the raw array
+bytes) exactly as they would be for a remote server, so the measured
+per-iteration overhead and throughput include real serialization and
+socket transfer. The server feeds every input variable with the last
+values of the output variable it is mapped from (``transfers``), or zeros.
+"""
+
+import json
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+Complete = "Complete"
+Iterating = "Iterating"
+
+_LENGTH = struct.Struct("<I")
+
+_config = {
+    "regions": {},
+    "tensor_types": {},
+    "transfers": {},
+    "time_steps": 0,
+    "iterations": 5,
+}
+
+
+def configure(regions, tensor_types=None, transfers=None, time_steps=0, iterations=5):
+    """Describe the coupled problem that the loopback server runs.
+
+    ``regions`` maps region names to ``{"inputs": [...], "outputs": [...]}``
+    variable lists and ``tensor_types`` variable names to ``"Scalar"`` or
+    ``"Vector"`` (default ``"Scalar"``). ``transfers`` maps input variables
+    to the output variables that feed them. ``time_steps`` is the number
+    of time steps for transient runs and ``iterations`` the number of
+    coupling iterations per step (or in total for steady runs).
+    """
+    _config.update(
+        regions=regions,
+        tensor_types=tensor_types or {},
+        transfers=transfers or {},
+        time_steps=time_steps,
+        iterations=iterations,
+    )
+
+
+class _Data:
+    def __init__(self, data):
+        self.data = np.asarray(data)
+
+
+class OutputIntegerData(_Data):
+    pass
+
+
+class OutputScalarData(_Data):
+    pass
+
+
+class OutputVectorData(_Data):
+    pass
+
+
+class InputScalarData(_Data):
+    pass
+
+
+class InputVectorData(_Data):
+    pass
+
+
+class PointCloud:
+    def __init__(self, ids, coords):
+        self.ids = ids
+        self.coords = coords
+        self.coordinatesStemp = 0
+
+
+def _recv_exact(sock, view):
+    while len(view):
+        n = sock.recv_into(view)
+        if n == 0:
+            raise ConnectionError("loopback connection closed")
+        view = view[n:]
+
+
+def _send(sock, kind, meta=None, arrays=()):
+    arrays = [np.ascontiguousarray(a) for a in arrays]
+    header = json.dumps({
+        "kind": kind,
+        "meta": meta or {},
+        "arrays": [[a.dtype.str, a.shape] for a in arrays],
+    }).encode("utf-8")
+    sock.sendall(_LENGTH.pack(len(header)) + header)
+    for a in arrays:
+        sock.sendall(memoryview(a).cast("B"))
+    return _LENGTH.size + len(header) + sum(a.nbytes for a in arrays)
+
+
+def _recv(sock):
+    raw = bytearray(_LENGTH.size)
+    _recv_exact(sock, memoryview(raw))
+    header = bytearray(_LENGTH.unpack(raw)[0])
+    _recv_exact(sock, memoryview(header))
+    message = json.loads(header)
+    arrays = []
+    nbytes = _LENGTH.size + len(header)
+    for dtype, shape in message["arrays"]:
+        a = np.empty(shape, dtype=np.dtype(dtype))
+        _recv_exact(sock, memoryview(a).cast("B"))
+        arrays.append(a)
+        nbytes += a.nbytes
+    return message["kind"], message["meta"], arrays, nbytes
+
+
+class _Server:
+    # runs the coupling side of the loopback on its own thread
+
+    def __init__(self, config):
+        self.config = config
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self.listener.getsockname()[1]
+        self.outputs = {}
+        self.clouds = {}
+        self.step = 0
+        self.iteration = 0
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _inputs(self, requested):
+        arrays = []
+        for region, variable, shape in requested:
+            source = self.outputs.get((region, self.config["transfers"].get(variable)))
+            if source is not None and list(source.shape) == shape:
+                arrays.append(source)
+            else:
+                arrays.append(np.zeros(shape))
+        return arrays
+
+    def _serve(self):
+        conn, _ = self.listener.accept()
+        self.listener.close()
+        with conn:
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            while True:
+                kind, meta, arrays, _ = _recv(conn)
+                if kind == "doTimeStep":
+                    more = self.step < self.config["time_steps"]
+                    if more:
+                        self.step += 1
+                        self.iteration = 0
+                    _send(conn, "reply", {"value": more})
+                elif kind == "doIteration":
+                    more = self.iteration < self.config["iterations"]
+                    if more:
+                        self.iteration += 1
+                    _send(conn, "reply", {"value": more})
+                elif kind == "inputs":
+                    _send(conn, "reply", {}, self._inputs(meta["requested"]))
+                elif kind == "outputs":
+                    for region in meta["clouds"]:
+                        self.clouds[region] = (arrays.pop(0), arrays.pop(0))
+                    for region, variable in meta["outputs"]:
+                        self.outputs[(region, variable)] = arrays.pop(0)
+                    _send(conn, "reply")
+                elif kind == "disconnect":
+                    _send(conn, "reply")
+                    return
+                else:
+                    _send(conn, "reply")
+
+
+class SystemCoupling:
+    """Participant-side loopback connection with the SCP call surface.
+
+    ``host``, ``port`` and ``name`` are accepted for compatibility and
+    ignored; the server always runs in-process. After `disconnect`,
+    ``stats`` holds the call counts, bytes sent/received and timings.
+    """
+
+    def __init__(self, host, port, name, buildInfo):
+        self.config = dict(_config)
+        self._callbacks = {}
+        self._server = _Server(self.config)
+        self._sock = socket.create_connection(("127.0.0.1", self._server.port))
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._stamps = {}
+        self.stats = {
+            "iterations": 0,
+            "time_steps": 0,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+            "update_inputs_time": 0.0,
+            "update_outputs_time": 0.0,
+        }
+        self._start = time.perf_counter()
+
+    def _call(self, kind, meta=None, arrays=()):
+        self.stats["bytes_sent"] += _send(self._sock, kind, meta, arrays)
+        _, reply, replyArrays, nbytes = _recv(self._sock)
+        self.stats["bytes_received"] += nbytes
+        return reply, replyArrays
+
+    def registerPointCloudAccess(self, callback):
+        self._callbacks["pointCloud"] = callback
+
+    def registerInputScalarDataAccess(self, callback):
+        self._callbacks["inputScalar"] = callback
+
+    def registerOutputScalarDataAccess(self, callback):
+        self._callbacks["outputScalar"] = callback
+
+    def registerInputVectorDataAccess(self, callback):
+        self._callbacks["inputVector"] = callback
+
+    def registerOutputVectorDataAccess(self, callback):
+        self._callbacks["outputVector"] = callback
+
+    def _access(self, direction, variable):
+        tensor = self.config["tensor_types"].get(variable, "Scalar")
+        return self._callbacks[direction + tensor]
+
+    def initializeAnalysis(self):
+        if not self.config["regions"]:
+            raise RuntimeError("call syctools.loopback.configure() before initializeAnalysis()")
+        self._call("initialize")
+        self.updateOutputs(Iterating)
+
+    def doTimeStep(self):
+        more = self._call("doTimeStep")[0]["value"]
+        self.stats["time_steps"] += more
+        return more
+
+    def doIteration(self):
+        more = self._call("doIteration")[0]["value"]
+        self.stats["iterations"] += more
+        return more
+
+    def updateInputs(self):
+        start = time.perf_counter()
+        requested = []
+        targets = []
+        for region, spec in self.config["regions"].items():
+            for variable in spec.get("inputs", []):
+                target = self._access("input", variable)(region, variable).data
+                requested.append([region, variable, list(target.shape)])
+                targets.append(target)
+        _, arrays = self._call("inputs", {"requested": requested})
+        for target, values in zip(targets, arrays):
+            target[...] = values
+        self.stats["update_inputs_time"] += time.perf_counter() - start
+
+    def updateOutputs(self, status):
+        start = time.perf_counter()
+        clouds = []
+        outputs = []
+        arrays = []
+        for region, spec in self.config["regions"].items():
+            if "pointCloud" in self._callbacks:
+                pc = self._callbacks["pointCloud"](region)
+                stamp = getattr(pc, "coordinatesStemp", 0)
+                # like System Coupling, only resend geometry when the stamp changed
+                if self._stamps.get(region) != stamp:
+                    self._stamps[region] = stamp
+                    clouds.append(region)
+                    arrays += [pc.ids.data, pc.coords.data]
+            for variable in spec.get("outputs", []):
+                outputs.append([region, variable])
+                arrays.append(self._access("output", variable)(region, variable).data)
+        self._call("outputs", {"status": status, "clouds": clouds, "outputs": outputs}, arrays)
+        self.stats["update_outputs_time"] += time.perf_counter() - start
+
+    def disconnect(self):
+        self._call("disconnect")
+        self._sock.close()
+        self._server.thread.join()
+        self.stats["wall_time"] = time.perf_counter() - self._start
+
+    def report(self):
+        """Summary of per-iteration overhead and throughput."""
+        s = self.stats
+        iterations = max(s["iterations"], 1)
+        moved = (s["bytes_sent"] + s["bytes_received"]) / 2**20
+        exchange = s["update_inputs_time"] + s["update_outputs_time"]
+        return (f"{s['iterations']} iterations in {s['time_steps']} time steps, "
+                f"{1e3 * exchange / iterations:.3f} ms data exchange per iteration, "
+                f"{moved:.1f} MB moved at {moved / max(exchange, 1e-12):.1f} MB/s")
@@ -0,0 +1,240 @@
+"""In-process point-cloud to point-cloud mapping.
+
+`PointCloudMapper` indexes a source cloud with a KD-tree and computes, for
+every target point, interpolation weights on its nearest source points.
+The weights form a sparse ``(ntarget, nsource)`` matrix, so mapping any
+source field is a single sparse matrix-vector product. Targets are
+processed in chunks on a thread pool; the KD-tree queries and the batched
+linear algebra release the GIL, so the chunks run concurrently.
+
+Methods:
+
+- ``"nearest"``: value of the closest source point
+- ``"idw"``: inverse-distance weighting, ``w ~ 1 / d**power``
+- ``"rbf"``: local radial-basis interpolation with a compactly supported
+  Wendland C2 kernel and a constant term, so constant fields are
+  reproduced exactly
+
+These weights preserve the profile of intensive fields (temperature,
+pressure). For extensive fields (forces, heat flow), a mapper created with
+``conservative=True`` scales each target's weights by its control volume
+and normalizes every source point's weights to sum to one, so the global
+sum is transferred exactly between clouds of any relative density. The
+control volumes are the sizes of the targets' Voronoi cells, estimated by
+assigning the points of both clouds to their nearest target.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+from scipy.spatial import cKDTree
+
+METHODS = ("nearest", "idw", "rbf")
+
+
+def _idw_weights(dist, power):
+    exact = dist[:, 0] == 0.0
+    with np.errstate(divide="ignore"):
+        w = dist ** -power
+    # targets that coincide with a source point take its value
+    w[exact] = 0.0
+    w[exact, 0] = 1.0
+    w /= w.sum(axis=1, keepdims=True)
+    return w
+
+
+def _wendland(r):
+    r = np.minimum(r, 1.0)
+    return (1.0 - r) ** 4 * (4.0 * r + 1.0)
+
+
+def _rbf_weights(source, idx, dist, support):
+    n, k = idx.shape
+    pts = source[idx]
+    # support radius per target, so every neighbour is inside the kernel
+    radius = support * np.maximum(dist[:, -1], np.finfo(np.float64).tiny)
+    pairwise = np.linalg.norm(pts[:, :, None, :] - pts[:, None, :, :], axis=-1)
+    system = np.zeros((n, k + 1, k + 1))
+    system[:, :k, :k] = _wendland(pairwise / radius[:, None, None])
+    system[:, :k, k] = 1.0
+    system[:, k, :k] = 1.0
+    rhs = np.empty((n, k + 1))
+    rhs[:, :k] = _wendland(dist / radius[:, None])
+    rhs[:, k] = 1.0
+    # the interpolation matrix is symmetric, so the weights on the source
+    # values are the solution of the system with the target's kernel row
+    w = np.linalg.solve(system, rhs[:, :, None])[:, :k, 0]
+    return w
+
+
+def control_volumes(coords, samples, workers=-1, tree=None):
+    """Estimate the relative control volume of each point in ``coords``.
+
+    Every sample point is assigned to its nearest point (a Voronoi
+    partition of the samples) and the volume of a point is the number of
+    samples in its cell. ``samples`` should include ``coords`` so that
+    every point owns at least itself. An existing KD-tree over ``coords``
+    may be passed as ``tree``.
+    """
+    tree = tree or cKDTree(coords)
+    _, nearest = tree.query(samples, workers=workers)
+    return np.bincount(nearest, minlength=len(coords)).astype(np.float64)
+
+
+def global_sum_error(source_values, target_values):
+    """Relative difference of the column sums of mapped extensive values."""
+    source = np.sum(np.asarray(source_values, dtype=np.float64), axis=0)
+    target = np.sum(np.asarray(target_values, dtype=np.float64), axis=0)
+    return np.abs(target - source) / np.maximum(np.abs(source), np.finfo(np.float64).tiny)
+
+
+class PointCloudMapper:
+    """Interpolate fields from a source point cloud onto target points.
+
+    ``neighbours`` is the number of source points each target value is
+    built from (always 1 for ``"nearest"``), ``power`` the IDW exponent
+    and ``support`` the RBF support radius relative to the distance of
+    the farthest neighbour. With ``conservative=True`` the weights conserve
+    the global sum of extensive fields instead of their profile. Targets
+    are processed ``chunk_size`` points at a time on ``workers`` threads
+    (default: all CPUs).
+    """
+
+    def __init__(self, source_coords, method="idw", neighbours=8, power=2.0, support=1.5,
+                 conservative=False, chunk_size=16384, workers=None):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, not {method!r}")
+        self.source_coords = np.ascontiguousarray(source_coords, dtype=np.float64)
+        self.method = method
+        self.neighbours = 1 if method == "nearest" else min(neighbours, len(self.source_coords))
+        self.power = power
+        self.support = support
+        self.conservative = conservative
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self._tree = None
+
+    @property
+    def tree(self):
+        """KD-tree over the source cloud, built on first use."""
+        if self._tree is None:
+            self._tree = cKDTree(self.source_coords)
+        return self._tree
+
+    @property
+    def settings(self):
+        """The settings that determine the interpolation weights."""
+        return {
+            "method": self.method,
+            "neighbours": self.neighbours,
+            "power": self.power if self.method == "idw" else None,
+            "support": self.support if self.method == "rbf" else None,
+            "conservative": self.conservative,
+        }
+
+    def _chunk_weights(self, target, idx, w, start, stop):
+        dist, nbr = self.tree.query(target[start:stop], k=self.neighbours)
+        if self.neighbours == 1:
+            dist, nbr = dist[:, None], nbr[:, None]
+        idx[start:stop] = nbr
+        if self.method == "nearest":
+            w[start:stop] = 1.0
+        elif self.method == "idw":
+            w[start:stop] = _idw_weights(dist, self.power)
+        else:
+            w[start:stop] = _rbf_weights(self.source_coords, nbr, dist, self.support)
+
+    def weights(self, target_coords):
+        """Return the sparse ``(ntarget, nsource)`` interpolation matrix."""
+        if self.conservative:
+            return self._conservative_weights(target_coords)
+        return self._profile_weights(target_coords)
+
+    def _conservative_weights(self, target_coords):
+        target = np.ascontiguousarray(target_coords, dtype=np.float64)
+        weights = self._profile_weights(target)
+        tree = cKDTree(target)
+        volumes = control_volumes(target, np.concatenate((self.source_coords, target)), self.workers, tree)
+        weights = (diags(volumes) @ weights).tocsc()
+        colsum = np.asarray(weights.sum(axis=0)).ravel()
+        unused = colsum == 0.0
+        weights = weights @ diags(1.0 / np.where(unused, 1.0, colsum))
+        if unused.any():
+            # source points outside every target stencil go to their nearest target
+            orphans = np.flatnonzero(unused)
+            _, nearest = tree.query(self.source_coords[orphans], workers=self.workers)
+            weights = weights + csr_matrix(
+                (np.ones(len(orphans)), (nearest, orphans)), shape=weights.shape)
+        return weights.tocsr()
+
+    def _profile_weights(self, target_coords):
+        target = np.ascontiguousarray(target_coords, dtype=np.float64)
+        n, k = len(target), self.neighbours
+        idx = np.empty((n, k), dtype=np.int64)
+        w = np.empty((n, k), dtype=np.float64)
+        starts = range(0, n, self.chunk_size)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [
+                pool.submit(self._chunk_weights, target, idx, w, start, min(start + self.chunk_size, n))
+                for start in starts
+            ]
+            for future in futures:
+                future.result()
+        indptr = np.arange(0, n * k + 1, k, dtype=np.int64)
+        return csr_matrix((w.ravel(), idx.ravel(), indptr), shape=(n, len(self.source_coords)))
+
+    def update_weights(self, weights, target_coords, moved):
+        """Update ``weights`` in place after the source points ``moved``
+        were displaced; ``source_coords`` must hold the new positions.
+
+        Only targets whose stencil contains a moved point, or that a moved
+        point has come closer to than their farthest neighbour, are
+        recomputed. Conservative weights are always recomputed in full.
+        Returns the updated matrix.
+        """
+        target = np.ascontiguousarray(target_coords, dtype=np.float64)
+        moved = np.asarray(moved, dtype=np.int64)
+        self._tree = None
+        n, k = len(target), self.neighbours
+        if self.conservative or weights.nnz != n * k:
+            return self.weights(target)
+        if len(moved) == 0:
+            return weights
+        idx = weights.indices.reshape(n, k)
+        w = weights.data.reshape(n, k)
+        affected = np.isin(idx, moved).any(axis=1)
+        reach = np.linalg.norm(target[:, None, :] - self.source_coords[idx], axis=2).max(axis=1)
+        distance, _ = cKDTree(self.source_coords[moved]).query(target, workers=self.workers)
+        affected |= distance <= reach
+        rows = np.flatnonzero(affected)
+        if len(rows):
+            subset = target[rows]
+            newIdx = np.empty((len(rows), k), dtype=np.int64)
+            newW = np.empty((len(rows), k), dtype=np.float64)
+            for start in range(0, len(rows), self.chunk_size):
+                self._chunk_weights(subset, newIdx, newW, start, min(start + self.chunk_size, len(rows)))
+            idx[rows] = newIdx
+            w[rows] = newW
+        # neighbours are not sorted by index within rows
+        weights.has_sorted_indices = False
+        return weights
+
+    def map(self, source_values, target_coords):
+        """Interpolate ``source_values`` (one row per source point, any
+        number of columns) onto ``target_coords``."""
+        return self.weights(target_coords) @ np.asarray(source_values, dtype=np.float64)
+
+
+def map_stacked(weights, fields):
+    """Apply a weight matrix to many fields at once.
+
+    ``fields`` has the source points along its first axis and any number
+    of trailing axes (variables, snapshots, vector components). All of
+    them are mapped by one sparse matrix-matrix product; the result has
+    the target points along its first axis and the same trailing shape.
+    """
+    fields = np.asarray(fields, dtype=np.float64)
+    flat = fields.reshape(len(fields), -1)
+    return np.asarray(weights @ flat).reshape((weights.shape[0],) + fields.shape[1:])
@@ -0,0 +1,118 @@
+"""Content-addressed cache of Fluent meshing results.
+
+A meshing workflow is described as a list of task steps::
+
+    steps = [
+        ("Import Geometry", "Arguments", {"FileName": "pipe_fluid.scdoc", "LengthUnit": "m"}),
+        ("Import Geometry", "Execute"),
+        ("Add Local Sizing", "AddChildToTask"),
+        ...
+    ]
+
+where ``"Arguments"`` assigns the task arguments and any other action calls
+that method of the task with the given keyword arguments. `mesh_key`
+hashes the geometry file contents, the steps (with all their arguments)
+and the product version, so a change to either the ``.scdoc`` or the
+sizing gives a new key. `MeshCache.solver_session` returns a solver
+session with the mesh loaded: on a hit it only launches a solver and reads
+the cached ``.msh.h5``; on a miss it runs the workflow, writes the mesh to
+the cache and switches the meshing session to solver mode.
+"""
+
+import hashlib
+import json
+import os
+
+
+def mesh_key(geometry_file, steps, version=""):
+    """Return a hex digest identifying a geometry and meshing workflow."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(geometry_file, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    h.update(json.dumps([list(step) for step in steps], sort_keys=True).encode("utf-8"))
+    h.update(version.encode("utf-8"))
+    return h.hexdigest()
+
+
+def run_workflow(meshing, steps, workflow_type="Watertight Geometry"):
+    """Initialize the workflow in ``meshing`` and run ``steps`` in order."""
+    meshing.workflow.InitializeWorkflow(WorkflowType=workflow_type)
+    for task, action, *arguments in steps:
+        taskObject = meshing.workflow.TaskObject[task]
+        kwargs = arguments[0] if arguments else {}
+        if action == "Arguments":
+            taskObject.Arguments = kwargs
+        else:
+            getattr(taskObject, action)(**kwargs)
+
+
+def _exit(session):
+    try:
+        session.exit()
+    except Exception:
+        pass
+
+
+class MeshCache:
+    """Directory of ``<key>.msh.h5`` meshes.
+
+    ``hits`` and ``misses`` count the lookups made through this instance.
+    """
+
+    def __init__(self, directory=".mesh-cache"):
+        self.directory = os.path.abspath(directory)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".msh.h5")
+
+    def get(self, key):
+        """Return the cached mesh file for ``key``, or None."""
+        path = self.path(key)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def solver_session(self, geometry_file, steps, launch_meshing, launch_solver, version="", finish=None):
+        """Return a solver session with the mesh of ``geometry_file`` and
+        ``steps`` loaded, meshing only on a cache miss.
+
+        ``launch_meshing()`` and ``launch_solver()`` start Fluent in
+        meshing and solution mode. ``finish(meshing)`` runs after the
+        workflow on a miss, e.g. a mesh check; it does not affect the key.
+        """
+        key = mesh_key(geometry_file, steps, version)
+        cached = self.get(key)
+        if cached is not None:
+            solver = launch_solver()
+            try:
+                solver.file.read(file_type="mesh", file_name=cached)
+            except BaseException:
+                _exit(solver)
+                raise
+            return solver
+        meshing = launch_meshing()
+        # write under a temporary name so a failed run never leaves a partial mesh
+        path = self.path(key)
+        tmp = f"{path[:-len('.msh.h5')]}.{os.getpid()}.tmp.msh.h5"
+        try:
+            run_workflow(meshing, steps)
+            if finish is not None:
+                finish(meshing)
+            meshing.tui.file.write_mesh(tmp)
+            os.replace(tmp, path)
+            return meshing.switch_to_solver()
+        except BaseException:
+            # don't leave the Fluent process (and its license) behind
+            _exit(meshing)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def report(self):
+        return f"mesh cache {self.directory}: {self.hits} hits, {self.misses} misses"
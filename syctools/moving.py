@@ -0,0 +1,81 @@
+"""Change tracking for moving point clouds in transient runs.
+
+A participant that moves its cloud bumps the coordinates stamp, which
+makes System Coupling treat the whole geometry as new. `MovingCloud`
+compares the live coordinates with those at the previous stamp and only
+bumps the stamp if points actually moved. If no more than ``threshold``
+(a fraction of the cloud) moved, it exposes just the displaced subset as
+``delta_ids``/``delta_coords`` (and ``moved``), which consumers such as
+`syctools.mapping.PointCloudMapper.update_weights` use to redo only the
+affected work. Past the threshold it falls back to a full update.
+"""
+
+import numpy as np
+
+
+class MovingCloud:
+    """Track the displacement of ``coords`` between coordinate stamps.
+
+    ``ids`` and ``coords`` are the participant's live arrays, which it
+    updates in place. Points that moved by more than ``tolerance`` in any
+    direction count as displaced.
+    """
+
+    def __init__(self, ids, coords, threshold=0.25, tolerance=0.0):
+        self.ids = ids
+        self.coords = coords
+        self.threshold = threshold
+        self.tolerance = tolerance
+        self.stamp = 0
+        self.full = True
+        self.moved = np.arange(len(coords))
+        self.delta_ids = ids
+        self.delta_coords = coords
+        self.full_updates = 0
+        self.delta_updates = 0
+        self.skipped_updates = 0
+        self._reference = np.array(coords, dtype=np.float64, copy=True)
+
+    def commit(self, moved=None):
+        """Record the current coordinates and return the coordinates stamp.
+
+        Call this after moving points, e.g. at the start of a time step.
+        ``moved`` optionally lists the indices that may have moved, which
+        avoids scanning the whole cloud.
+        """
+        if moved is None:
+            displaced = np.abs(self.coords - self._reference) > self.tolerance
+            moved = np.flatnonzero(displaced.any(axis=1))
+        else:
+            moved = np.asarray(moved, dtype=np.int64)
+            displaced = np.abs(self.coords[moved] - self._reference[moved]) > self.tolerance
+            moved = moved[displaced.any(axis=1)]
+
+        if len(moved) == 0:
+            self.skipped_updates += 1
+            self.moved = moved
+            self.delta_ids = self.ids[moved]
+            self.delta_coords = self.coords[moved]
+            return self.stamp
+
+        self.stamp += 1
+        if len(moved) > self.threshold * len(self.coords):
+            self.full = True
+            self.full_updates += 1
+            self._reference[...] = self.coords
+            self.moved = np.arange(len(self.coords))
+            self.delta_ids = self.ids
+            self.delta_coords = self.coords
+        else:
+            self.full = False
+            self.delta_updates += 1
+            self._reference[moved] = self.coords[moved]
+            self.moved = moved
+            self.delta_ids = self.ids[moved]
+            self.delta_coords = self.coords[moved]
+        return self.stamp
+
+    def report(self):
+        """One-line summary of the coordinate updates so far."""
+        return (f"coordinate updates: {self.full_updates} full, {self.delta_updates} delta, "
+                f"{self.skipped_updates} skipped (nothing moved)")
@@ -0,0 +1,90 @@
+"""File-backed arrays for point clouds larger than the available memory.
+
+`MappedStore` creates one ``np.memmap`` file per array in a directory.
+Arrays are C-contiguous (one row per point), so a pass over an array in
+point order, as done when System Coupling reads a region's ids,
+coordinates or data in ``updateOutputs()``, touches the file pages
+strictly sequentially. Where the platform supports it the mappings are
+advised ``MADV_SEQUENTIAL``, so the kernel reads ahead and reclaims pages
+behind the pass instead of keeping the whole cloud resident.
+"""
+
+import mmap
+import os
+import re
+import weakref
+
+import numpy as np
+
+
+class MappedStore:
+    """Directory of memory-mapped arrays.
+
+    Files are removed by `close` unless ``keep`` is set, so a store in a
+    scratch directory cleans up after the run.
+    """
+
+    def __init__(self, directory, keep=False):
+        self.directory = directory
+        self.keep = keep
+        self.arrays = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", name) + ".bin")
+
+    def _advise(self, array):
+        advise = getattr(mmap, "MADV_SEQUENTIAL", None)
+        mapping = getattr(array, "_mmap", None)
+        if advise is not None and mapping is not None:
+            mapping.madvise(advise)
+        return array
+
+    def create(self, name, shape, dtype=np.float64):
+        """Create (or truncate) the file for ``name`` and return it mapped
+        as an uninitialized array of ``shape``."""
+        shape = tuple(np.atleast_1d(shape))
+        if np.prod(shape) == 0:
+            array = np.empty(shape, dtype=dtype)
+        else:
+            array = self._advise(np.memmap(self.path(name), dtype=dtype, mode="w+", shape=shape))
+        self.arrays[name] = array
+        return array
+
+    def open(self, name, shape, dtype=np.float64, mode="r+"):
+        """Map an existing file for ``name``."""
+        array = self._advise(np.memmap(self.path(name), dtype=dtype, mode=mode, shape=tuple(np.atleast_1d(shape))))
+        self.arrays[name] = array
+        return array
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.arrays.values())
+
+    def flush(self):
+        for array in self.arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def close(self):
+        """Flush and unmap all arrays, deleting the files unless ``keep``.
+
+        No views of the arrays may be left: the mappings are closed
+        explicitly (Windows cannot delete a mapped file), and a view that
+        is still alive raises BufferError instead of pointing at freed
+        memory.
+        """
+        self.flush()
+        names = list(self.arrays)
+        mappings = {name: (weakref.ref(a), a._mmap) for name, a in self.arrays.items()
+                    if isinstance(a, np.memmap) and a._mmap is not None}
+        self.arrays = {}
+        alive = [name for name, (ref, _) in mappings.items() if ref() is not None]
+        if alive:
+            raise BufferError(f"arrays {alive} of the store are still referenced; release them before close()")
+        for _, mapping in mappings.values():
+            mapping.close()
+        if not self.keep:
+            for name in names:
+                if os.path.exists(self.path(name)):
+                    os.remove(self.path(name))
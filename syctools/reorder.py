@@ -0,0 +1,102 @@
+"""Space-filling-curve reordering of point clouds.
+
+Points are quantized onto a ``2**bits`` grid over their bounding box and
+sorted along a Morton (Z-order) or Hilbert curve, so points that are close
+in space are close in memory. That improves cache locality of neighbour
+searches, sparse weight products and data packing for large clouds.
+`Reordering` keeps the inverse permutation, so results can be written
+back in the original order.
+"""
+
+import numpy as np
+
+CURVES = ("morton", "hilbert")
+
+_BITS = 21  # 3 x 21 bits fit one uint64 key
+
+
+def _quantize(coords, bits):
+    coords = np.asarray(coords, dtype=np.float64)
+    lo = coords.min(axis=0)
+    span = np.max(coords.max(axis=0) - lo)
+    scale = ((1 << bits) - 1) / span if span > 0.0 else 0.0
+    return ((coords - lo) * scale).astype(np.uint64)
+
+
+def _spread(v):
+    # insert two zero bits between each of the lower 21 bits of v
+    v = v & np.uint64(0x1FFFFF)
+    v = (v | (v << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return v
+
+
+def _interleave(x, y, z):
+    return (_spread(x) << np.uint64(2)) | (_spread(y) << np.uint64(1)) | _spread(z)
+
+
+def morton_keys(coords, bits=_BITS):
+    """Return the Morton (Z-order) key of every point."""
+    q = _quantize(coords, bits)
+    return _interleave(q[:, 0], q[:, 1], q[:, 2])
+
+
+def hilbert_keys(coords, bits=_BITS):
+    """Return the Hilbert-curve key of every point.
+
+    Vectorized form of Skilling's transpose algorithm ("Programming the
+    Hilbert curve", AIP Conf. Proc. 707, 2004), one pass per bit.
+    """
+    x = [c.copy() for c in _quantize(coords, bits).T]
+    q = np.uint64(1 << (bits - 1))
+    while q > 1:
+        p = q - np.uint64(1)
+        for i in range(3):
+            high = (x[i] & q) != 0
+            x[0] = np.where(high, x[0] ^ p, x[0])
+            t = np.where(high, np.uint64(0), (x[0] ^ x[i]) & p)
+            x[0] ^= t
+            x[i] ^= t
+        q >>= np.uint64(1)
+    # Gray encode
+    x[1] ^= x[0]
+    x[2] ^= x[1]
+    t = np.zeros_like(x[0])
+    q = np.uint64(1 << (bits - 1))
+    while q > 1:
+        t = np.where((x[2] & q) != 0, t ^ (q - np.uint64(1)), t)
+        q >>= np.uint64(1)
+    return _interleave(x[0] ^ t, x[1] ^ t, x[2] ^ t)
+
+
+class Reordering:
+    """Permutation of a point cloud along a space-filling curve.
+
+    ``perm[i]`` is the original index of the i-th reordered point and
+    ``inverse[j]`` the reordered position of original point ``j``.
+    """
+
+    def __init__(self, coords, curve="hilbert", bits=_BITS):
+        if curve not in CURVES:
+            raise ValueError(f"curve must be one of {CURVES}, not {curve!r}")
+        keys = hilbert_keys(coords, bits) if curve == "hilbert" else morton_keys(coords, bits)
+        self.curve = curve
+        self.perm = np.argsort(keys, kind="stable")
+        self.inverse = np.empty_like(self.perm)
+        self.inverse[self.perm] = np.arange(len(self.perm))
+
+    def apply(self, array):
+        """Return ``array`` (points along the first axis) in curve order."""
+        return np.asarray(array)[self.perm]
+
+    def restore(self, array):
+        """Return reordered ``array`` in the original point order."""
+        return np.asarray(array)[self.inverse]
+
+    def apply_region(self, ids, coords, fields):
+        """Reorder a region's node ids, coordinates and a dict of solution
+        arrays together; returns the new ``(ids, coords, fields)``."""
+        return self.apply(ids), self.apply(coords), {name: self.apply(a) for name, a in fields.items()}
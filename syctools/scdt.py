@@ -0,0 +1,222 @@
+"""Reading and writing of System Coupling ``.scdt`` point-cloud files.
+
+An ``.scdt`` file is comma-separated text with one point per row: the
+coordinates followed by the variable values. Files may start with a
+``[Data]`` line and a header line naming the columns, e.g.
+``X, Y, Z, variable``; without a header System Coupling names the value
+columns ``Variable1``, ``Variable2``, ...
+"""
+
+import io
+
+import numpy as np
+
+_SEPARATOR = b", "
+
+
+def _format_fallback(block, precision):
+    fmt = ", ".join([f"%.{precision - 1}E"] * block.shape[1]) + "\n"
+    return ((fmt * len(block)) % tuple(block.ravel().tolist())).encode("ascii")
+
+
+def format_block(block, precision=10):
+    """Format a 2-D float array as ``.scdt`` rows and return the bytes.
+
+    Values are written in fixed-width scientific notation with
+    ``precision`` significant digits (``-1.234567890E-02``), positive values
+    padded with a leading space. Digits are extracted with integer
+    arithmetic on the whole block, so there is no per-value Python work.
+    Blocks with non-finite or subnormal values fall back to ``%`` formatting.
+    """
+    if not 2 <= precision <= 15:
+        raise ValueError("precision must be between 2 and 15 significant digits")
+    block = np.asarray(block, dtype=np.float64)
+    if block.ndim == 1:
+        block = block[:, None]
+    nrows, ncols = block.shape
+    if nrows == 0:
+        return b""
+
+    a = np.abs(block)
+    if not np.isfinite(a).all() or ((a != 0.0) & (a < 1e-300)).any():
+        return _format_fallback(block, precision)
+
+    nonzero = a != 0.0
+    exponent = np.zeros(block.shape, dtype=np.int64)
+    exponent[nonzero] = np.floor(np.log10(a[nonzero]))
+    scale = 10 ** (precision - 1)
+    mantissa = np.rint(a / np.power(10.0, exponent) * scale).astype(np.int64)
+    # log10 and rounding may be off by one digit near powers of ten
+    over = mantissa >= 10 * scale
+    exponent[over] += 1
+    mantissa[over] = np.rint(a[over] / np.power(10.0, exponent[over]) * scale).astype(np.int64)
+    under = nonzero & (mantissa < scale)
+    exponent[under] -= 1
+    mantissa[under] = np.rint(a[under] / np.power(10.0, exponent[under]) * scale).astype(np.int64)
+
+    edigits = 3 if (np.abs(exponent) >= 100).any() else 2
+    # sign, leading digit, '.', fraction, 'E', exponent sign, exponent digits
+    width = 1 + 1 + 1 + (precision - 1) + 1 + 1 + edigits
+    stride = width + len(_SEPARATOR)
+    rows = np.empty((nrows, ncols, stride), dtype=np.uint8)
+    rows[..., 0] = np.where(np.signbit(block), ord("-"), ord(" "))
+    rows[..., 2] = ord(".")
+    pos = width - edigits - 2
+    rows[..., pos] = ord("E")
+    rows[..., pos + 1] = np.where(exponent < 0, ord("-"), ord("+"))
+
+    # peel digits off from the least significant end, writing right to left
+    digit = np.empty(block.shape, dtype=np.int64)
+    e = np.abs(exponent)
+    for k in range(width - 1, width - 1 - edigits, -1):
+        np.divmod(e, 10, out=(e, digit))
+        digit += ord("0")
+        rows[..., k] = digit
+    for k in range(pos - 1, 0, -1):
+        if k == 2:
+            continue
+        np.divmod(mantissa, 10, out=(mantissa, digit))
+        digit += ord("0")
+        rows[..., k] = digit
+
+    rows[..., width:] = np.frombuffer(_SEPARATOR, dtype=np.uint8)
+    rows[:, -1, width] = ord("\n")
+    # drop the unused last byte of each row
+    return rows.reshape(nrows, -1)[:, :-1].tobytes()
+
+
+def _header_bytes(header):
+    if header is None:
+        return b""
+    return ("[Data]\n" + ", ".join(header) + "\n").encode("ascii")
+
+
+def write_scdt_chunks(fileName, chunks, header=None, precision=10):
+    """Stream ``(coords, values)`` chunks into an ``.scdt`` file.
+
+    ``chunks`` is any iterable, typically a generator, so the full cloud
+    never has to be held in memory. ``values`` may be ``None``, a 1-D array
+    or a 2-D array with one column per variable. ``header`` is an optional
+    list of column names; when given, a ``[Data]`` section header is
+    written first. Returns the number of points written.
+    """
+    npoints = 0
+    with open(fileName, "wb") as f:
+        f.write(_header_bytes(header))
+        for coords, values in chunks:
+            coords = np.asarray(coords, dtype=np.float64)
+            if values is None:
+                block = coords
+            else:
+                values = np.asarray(values, dtype=np.float64)
+                block = np.concatenate((coords, values.reshape(len(coords), -1)), axis=1)
+            f.write(format_block(block, precision))
+            npoints += len(block)
+    return npoints
+
+
+def write_scdt(fileName, coords, values=None, header=None, precision=10, chunk_size=65536):
+    """Write coordinate and value arrays to an ``.scdt`` file.
+
+    Rows are formatted and written ``chunk_size`` points at a time. See
+    `write_scdt_chunks` for the meaning of the other arguments.
+    """
+    coords = np.asarray(coords)
+    if values is not None:
+        values = np.asarray(values)
+
+    def chunks():
+        for start in range(0, len(coords), chunk_size):
+            stop = start + chunk_size
+            yield coords[start:stop], None if values is None else values[start:stop]
+
+    return write_scdt_chunks(fileName, chunks(), header, precision)
+
+
+def _read_header(f):
+    # leaves f at the first data row and returns (column names or None, column count)
+    start = f.tell()
+    line = f.readline()
+    if isinstance(line, bytes):
+        line = line.decode("ascii")
+    if line.strip() == "[Data]":
+        start = f.tell()
+        line = f.readline()
+        if isinstance(line, bytes):
+            line = line.decode("ascii")
+    fields = [v.strip() for v in line.split(",")]
+    try:
+        [float(v) for v in fields]
+    except ValueError:
+        return fields, len(fields)
+    f.seek(start)
+    return None, len(fields)
+
+
+def _parse_rows(f, ncols, dtype, fileName):
+    # np.loadtxt parses in C, so there is no per-line work in Python
+    rows = np.loadtxt(f, delimiter=",", dtype=dtype, ndmin=2)
+    if rows.shape[1] != ncols:
+        raise ValueError(f"{fileName}: expected {ncols} columns, found {rows.shape[1]}")
+    return rows
+
+
+def read_scdt_columns(fileName):
+    """Return the column names from the header of an ``.scdt`` file, or
+    ``None`` if the file has no header line."""
+    with open(fileName) as f:
+        return _read_header(f)[0]
+
+
+def iter_scdt(fileName, chunk_rows=65536, dtype=np.float64):
+    """Lazily read an ``.scdt`` file as 2-D arrays of ``chunk_rows`` rows.
+
+    Every chunk except possibly the last has exactly ``chunk_rows`` rows and
+    one column per entry of the header. The file is read in large blocks
+    of whole lines that are parsed by NumPy in one call each, so only
+    about two chunks are in memory at any time.
+    """
+    with open(fileName, "rb") as f:
+        ncols = _read_header(f)[1]
+        chunk = np.empty((chunk_rows, ncols), dtype=dtype)
+        filled = 0
+        blockBytes = max(chunk_rows * ncols * 20, 1 << 16)
+        tail = b""
+        while True:
+            block = f.read(blockBytes)
+            if block:
+                block = tail + block
+                cut = block.rfind(b"\n") + 1
+                tail = block[cut:]
+                block = block[:cut]
+            else:
+                block, tail = tail, b""
+            if not block.strip():
+                if not tail:
+                    break
+                continue
+            rows = _parse_rows(io.BytesIO(block), ncols, dtype, fileName)
+            while len(rows):
+                take = min(chunk_rows - filled, len(rows))
+                chunk[filled:filled + take] = rows[:take]
+                filled += take
+                rows = rows[take:]
+                if filled == chunk_rows:
+                    yield chunk
+                    chunk = np.empty((chunk_rows, ncols), dtype=dtype)
+                    filled = 0
+        if filled:
+            yield chunk[:filled]
+
+
+def read_scdt(fileName, dtype=np.float64):
+    """Read a whole ``.scdt`` file and return ``(columns, data)``.
+
+    ``columns`` are the header names (``None`` without a header) and
+    ``data`` is a 2-D array with one row per point: the coordinates
+    followed by the variable values.
+    """
+    with open(fileName) as f:
+        columns, ncols = _read_header(f)
+        data = _parse_rows(f, ncols, dtype, fileName)
+    return columns, data
@@ -0,0 +1,162 @@
+"""Binary, memory-mappable sidecar files for ``.scdt`` point clouds.
+
+A sidecar holds the same table as its ``.scdt`` file in raw form: a small
+header followed by one contiguous block per column, so it can be opened
+with ``np.memmap`` without any parsing. Layout (little-endian)::
+
+    magic      8 bytes   b"SCDTBIN1"
+    dtype      4 bytes   "<f8" or "<f4", space padded
+    ncols      uint32
+    nrows      uint64
+    srcSize    uint64    size of the .scdt file it was converted from
+    srcMtime   int64     modification time (ns) of that .scdt file
+    namesLen   uint32    length of the column names, 0 without a header
+    names      namesLen  utf-8, separated by newlines
+    padding    up to the next multiple of 64 bytes
+    data       ncols blocks of nrows values each
+
+The source size and modification time are used to detect sidecars that
+are stale with respect to their ``.scdt`` file.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+from .scdt import read_scdt, write_scdt_chunks
+
+_MAGIC = b"SCDTBIN1"
+_HEADER = struct.Struct("<8s4sIQQqI")
+_ALIGN = 64
+
+
+def sidecar_path(scdtFile):
+    """Return the sidecar file name used for ``scdtFile``."""
+    return scdtFile + ".bin"
+
+
+def _read_header(f):
+    raw = f.read(_HEADER.size)
+    if len(raw) != _HEADER.size:
+        raise ValueError(f"{f.name}: not a binary .scdt sidecar")
+    magic, dtype, ncols, nrows, srcSize, srcMtime, namesLen = _HEADER.unpack(raw)
+    if magic != _MAGIC:
+        raise ValueError(f"{f.name}: not a binary .scdt sidecar")
+    names = f.read(namesLen).decode("utf-8")
+    columns = names.split("\n") if namesLen else None
+    offset = -(-(_HEADER.size + namesLen) // _ALIGN) * _ALIGN
+    return {
+        "dtype": np.dtype(dtype.decode("ascii").strip()),
+        "ncols": ncols,
+        "nrows": nrows,
+        "srcSize": srcSize,
+        "srcMtime": srcMtime,
+        "columns": columns,
+        "offset": offset,
+    }
+
+
+def write_binary(binFile, data, columns=None, dtype=np.float64, srcStat=None):
+    """Write a 2-D ``(nrows, ncols)`` array to a binary sidecar file.
+
+    ``dtype`` may be float64 or float32; float32 halves the file size.
+    ``srcStat`` is the ``os.stat`` result of the ``.scdt`` file the data
+    came from and is recorded for the staleness check.
+    """
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if dtype.kind != "f" or dtype.itemsize not in (4, 8):
+        raise ValueError("dtype must be float64 or float32")
+    data = np.asarray(data)
+    nrows, ncols = data.shape
+    names = "\n".join(columns).encode("utf-8") if columns else b""
+    header = _HEADER.pack(
+        _MAGIC,
+        dtype.str.ljust(4).encode("ascii"),
+        ncols,
+        nrows,
+        srcStat.st_size if srcStat else 0,
+        srcStat.st_mtime_ns if srcStat else 0,
+        len(names),
+    ) + names
+    offset = -(-len(header) // _ALIGN) * _ALIGN
+    # write under a temporary name and swap it in, so a reader that still
+    # has the old sidecar mapped keeps its (unlinked) file instead of
+    # seeing it truncated
+    tmp = f"{binFile}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header.ljust(offset, b"\0"))
+            for j in range(ncols):
+                f.write(np.ascontiguousarray(data[:, j], dtype=dtype).tobytes())
+        os.replace(tmp, binFile)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def open_binary(binFile, mode="r"):
+    """Memory-map a binary sidecar file and return ``(columns, data)``.
+
+    ``data`` is an ``(nrows, ncols)`` view of the mapping, like the array
+    returned by `syctools.scdt.read_scdt`; each column ``data[:, j]`` is
+    contiguous on disk.
+    """
+    with open(binFile, "rb") as f:
+        header = _read_header(f)
+    blocks = np.memmap(
+        binFile,
+        dtype=header["dtype"],
+        mode=mode,
+        offset=header["offset"],
+        shape=(header["ncols"], header["nrows"]),
+    )
+    return header["columns"], blocks.T
+
+
+def scdt_to_binary(scdtFile, binFile=None, dtype=np.float64):
+    """Convert an ``.scdt`` file to a binary sidecar and return its name."""
+    binFile = binFile or sidecar_path(scdtFile)
+    srcStat = os.stat(scdtFile)
+    columns, data = read_scdt(scdtFile)
+    write_binary(binFile, data, columns, dtype, srcStat)
+    return binFile
+
+
+def binary_to_scdt(binFile, scdtFile, precision=10, chunk_size=65536):
+    """Convert a binary sidecar back to an ``.scdt`` text file."""
+    columns, data = open_binary(binFile)
+
+    def chunks():
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size], None
+
+    return write_scdt_chunks(scdtFile, chunks(), columns, precision)
+
+
+def is_stale(scdtFile, binFile=None, dtype=None):
+    """Return True if the sidecar is missing, unreadable, was made from a
+    different version of ``scdtFile`` or (if given) has another dtype."""
+    binFile = binFile or sidecar_path(scdtFile)
+    try:
+        with open(binFile, "rb") as f:
+            header = _read_header(f)
+    except (OSError, ValueError):
+        return True
+    srcStat = os.stat(scdtFile)
+    if (header["srcSize"], header["srcMtime"]) != (srcStat.st_size, srcStat.st_mtime_ns):
+        return True
+    return dtype is not None and header["dtype"] != np.dtype(dtype).newbyteorder("<")
+
+
+def load_scdt(scdtFile, dtype=np.float64):
+    """Return ``(columns, data)`` for ``scdtFile`` through its sidecar.
+
+    The sidecar is (re)generated when it is missing or stale and then
+    memory-mapped read-only, so repeated loads cost no parsing.
+    """
+    binFile = sidecar_path(scdtFile)
+    if is_stale(scdtFile, binFile, dtype):
+        scdt_to_binary(scdtFile, binFile, dtype)
+    return open_binary(binFile)
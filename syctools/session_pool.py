@@ -0,0 +1,176 @@
+"""Pool of warm Fluent solver sessions reused across coupled cases.
+
+Launching Fluent (process start plus license checkout) costs far more
+than reading a mesh or case file into a session that is already running.
+`SessionPool` keeps up to ``size`` idle sessions. A case takes one with
+`acquire`, which resets it by re-reading its mesh or case file, and hands
+it back with `release` when done::
+
+    pool = SessionPool(lambda: pyfluent.launch_fluent(start_transcript=False), size=2)
+    pool.warm()
+    with pool.session(read_file("mesh", "pipe_fluid.msh.h5")) as fluid:
+        ...
+    print(pool.report())
+    pool.close()
+
+Idle sessions are health-checked before reuse and exited once they have
+been idle for longer than ``max_idle`` seconds; eviction happens on
+`acquire` and `release`, so the pool needs no thread of its own.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+def read_file(file_type, file_name):
+    """Reset function reading ``file_name`` (``"mesh"`` or ``"case"``)
+    into a session, replacing whatever case it held."""
+    def reset(session):
+        session.file.read(file_type=file_type, file_name=file_name)
+    return reset
+
+
+def is_serving(session):
+    """Default health check: the session's server answers and is serving."""
+    try:
+        return session.health_check.check_health() == "SERVING"
+    except Exception:
+        return False
+
+
+class SessionPool:
+    """Warm sessions created by ``launch()``.
+
+    ``health_check(session)`` returns whether a session can be reused.
+    ``launches``, ``acquisitions``, ``reuses``, ``evictions`` and
+    ``launch_time`` (total seconds spent in ``launch()``) count what
+    happened through the pool.
+    """
+
+    def __init__(self, launch, size=2, max_idle=600.0, health_check=is_serving):
+        self.launch = launch
+        self.size = size
+        self.max_idle = max_idle
+        self.health_check = health_check
+        self._idle = []
+        self._lock = threading.Lock()
+        self.launches = 0
+        self.acquisitions = 0
+        self.reuses = 0
+        self.evictions = 0
+        self.launch_time = 0.0
+
+    def _launch(self):
+        start = time.perf_counter()
+        session = self.launch()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.launches += 1
+            self.launch_time += elapsed
+        return session
+
+    def _exit(self, session):
+        try:
+            session.exit()
+        except Exception:
+            pass
+
+    def warm(self, count=None):
+        """Launch sessions concurrently until ``count`` (default ``size``)
+        are idle."""
+        with self._lock:
+            missing = max((self.size if count is None else count) - len(self._idle), 0)
+        if missing:
+            with ThreadPoolExecutor(max_workers=missing) as pool:
+                futures = [pool.submit(self._launch) for _ in range(missing)]
+            # keep the sessions that did start before reporting a failed launch
+            sessions = [f.result() for f in futures if f.exception() is None]
+            with self._lock:
+                self._idle.extend((session, time.monotonic()) for session in sessions)
+            for future in futures:
+                if future.exception() is not None:
+                    raise future.exception()
+
+    def evict_idle(self):
+        """Exit sessions idle for longer than ``max_idle``."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [s for s, since in self._idle if now - since > self.max_idle]
+            self._idle = [(s, since) for s, since in self._idle if now - since <= self.max_idle]
+            self.evictions += len(expired)
+        for session in expired:
+            self._exit(session)
+
+    def acquire(self, reset=None):
+        """Return a healthy session, reused if possible and launched
+        otherwise, after calling ``reset(session)`` on it. The most
+        recently released session is reused first."""
+        self.evict_idle()
+        with self._lock:
+            self.acquisitions += 1
+        session = None
+        while session is None:
+            with self._lock:
+                if not self._idle:
+                    break
+                candidate, _ = self._idle.pop()
+            if self.health_check(candidate):
+                session = candidate
+                with self._lock:
+                    self.reuses += 1
+            else:
+                with self._lock:
+                    self.evictions += 1
+                self._exit(candidate)
+        if session is None:
+            session = self._launch()
+        if reset is not None:
+            try:
+                reset(session)
+            except BaseException:
+                # the case in it is unknown now; don't leak the process
+                with self._lock:
+                    self.evictions += 1
+                self._exit(session)
+                raise
+        return session
+
+    def release(self, session):
+        """Return ``session`` to the pool, or exit it if the pool is full
+        or the session is unhealthy."""
+        self.evict_idle()
+        keep = self.health_check(session)
+        with self._lock:
+            keep = keep and len(self._idle) < self.size
+            if keep:
+                self._idle.append((session, time.monotonic()))
+            else:
+                self.evictions += 1
+        if not keep:
+            self._exit(session)
+
+    @contextmanager
+    def session(self, reset=None):
+        """Context manager around `acquire` and `release`."""
+        session = self.acquire(reset)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def close(self):
+        """Exit all idle sessions."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session, _ in idle:
+            self._exit(session)
+
+    def report(self):
+        # sessions launched by warm() are reused once without saving anything
+        mean = self.launch_time / max(self.launches, 1)
+        avoided = max(self.acquisitions - self.launches, 0)
+        return (f"session pool: {self.launches} launches ({mean:.1f} s each), {self.acquisitions} acquisitions, "
+                f"{self.reuses} reuses, {self.evictions} evictions, "
+                f"~{avoided * mean:.1f} s of launch time saved ({avoided} launches avoided)")
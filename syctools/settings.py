@@ -0,0 +1,145 @@
+"""Batched application of PyFluent settings.
+
+Setting PyFluent options one property at a time costs one remote call per
+assignment. `SettingsTransaction` collects the wanted settings as one
+nested dict that mirrors the settings tree, for example::
+
+    settings = {
+        "setup": {
+            "models": {"energy": {"enabled": True}},
+            "boundary_conditions": {
+                "wall": {"insulated1": {"thermal": {"thermal_bc": "Heat Flux", "q": {"value": 0}}}},
+            },
+        },
+        "solution": {"run_calculation": {"iter_count": 1}},
+    }
+
+On `commit`, each top-level object (``setup``, ``solution``, ...) is
+written with one ``set_state()``. ``setup.models`` is written on its own
+first, because models decide which other settings exist (thermal boundary
+conditions need the energy model), then materials requested with
+`copy_materials` are copied from the database, then the rest follows.
+
+Reading a state costs a call just like writing it, so by default nothing
+is read. With ``diff=True``, for sessions that may already hold some of
+the settings, each top-level object is read once with ``get_state()``
+and only the differing values are written (and only missing materials
+copied); a session that already has everything costs one read per
+top-level object and no writes.
+"""
+
+_MISSING = object()
+
+
+def settings_diff(wanted, current):
+    """Return the part of the nested dict ``wanted`` that differs from
+    ``current`` (keys missing from ``wanted`` are left alone)."""
+    if not isinstance(wanted, dict):
+        return None if wanted == current else wanted
+    current = current if isinstance(current, dict) else {}
+    diff = {}
+    for key, value in wanted.items():
+        changed = settings_diff(value, current.get(key, _MISSING))
+        if changed is not None:
+            diff[key] = changed
+    return diff or None
+
+
+def _merge(target, source):
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+class SettingsTransaction:
+    """Settings to apply to the solver ``session`` in as few calls as
+    possible.
+
+    ``round_trips`` counts the remote calls made by `commit` (state reads,
+    state writes and material copies).
+    """
+
+    def __init__(self, session, diff=False):
+        self.session = session
+        self.diff = diff
+        self.settings = {}
+        self.materials = {}
+        self.round_trips = 0
+
+    def update(self, settings):
+        """Merge the nested dict ``settings`` into the transaction."""
+        _merge(self.settings, settings)
+        return self
+
+    def copy_materials(self, type, *names):
+        """Copy materials ``names`` of ``type`` (``"fluid"``, ``"solid"``)
+        from the database (with ``diff``, unless the case has them)."""
+        self.materials.setdefault(type, []).extend(names)
+        return self
+
+    def _read(self, name, wanted):
+        obj = getattr(self.session, name)
+        self.round_trips += 1
+        return obj.get_state() if isinstance(wanted, dict) else obj()
+
+    def _write(self, path, wanted, current, applied):
+        diff = settings_diff(wanted, current) if self.diff else wanted
+        if diff is None:
+            return
+        if isinstance(diff, dict):
+            obj = self.session
+            for name in path:
+                obj = getattr(obj, name)
+            obj.set_state(diff)
+        else:
+            setattr(self.session, path[0], diff)
+        self.round_trips += 1
+        for name in reversed(path):
+            diff = {name: diff}
+        _merge(applied, diff)
+
+    def commit(self):
+        """Apply the settings and return what was written as a nested
+        dict."""
+        current = {}
+        if self.diff:
+            current = {name: self._read(name, wanted) for name, wanted in self.settings.items()}
+        setup = current.get("setup")
+        setup = setup if isinstance(setup, dict) else {}
+        applied = {}
+
+        wanted = self.settings.get("setup")
+        if isinstance(wanted, dict) and "models" in wanted:
+            self._write(("setup", "models"), wanted["models"], setup.get("models"), applied)
+
+        for type, names in self.materials.items():
+            existing = (setup.get("materials") or {}).get(type) or {}
+            for name in names:
+                if not self.diff or name not in existing:
+                    # materials must exist before cell zones refer to them
+                    self.session.setup.materials.database.copy_by_name(type=type, name=name)
+                    self.round_trips += 1
+                    applied.setdefault("materials", {}).setdefault(type, []).append(name)
+
+        for name, wanted in self.settings.items():
+            if name == "setup" and isinstance(wanted, dict):
+                wanted = {key: value for key, value in wanted.items() if key != "models"}
+                if not wanted:
+                    continue
+            self._write((name,), wanted, current.get(name, _MISSING), applied)
+        self.settings = {}
+        self.materials = {}
+        return applied
+
+
+def apply_settings(session, settings, materials=None, diff=False):
+    """Apply ``settings`` (and copy ``materials``, a dict of material type
+    to names) to ``session`` in one `SettingsTransaction`; returns it."""
+    transaction = SettingsTransaction(session, diff)
+    for type, names in (materials or {}).items():
+        transaction.copy_materials(type, *names)
+    transaction.update(settings)
+    transaction.commit()
+    return transaction
@@ -0,0 +1,193 @@
+"""Multi-process preparation of participant region data.
+
+`ShardedRegions` owns the ids, coordinates and variables of all regions
+in one `syctools.shm.SharedArrays` block. Each region is split into
+contiguous row ranges (shards); for a cloud in space-filling-curve or
+axial order those are spatial partitions. Persistent worker processes
+map the block once and fill their shards in place when the coordinator
+calls `run`, so the access callbacks can return the shared arrays
+directly::
+
+    regions = ShardedRegions({"source": {"points": n, "variables": {"force": 3}}}, workers=8)
+    regions.run(fill_source, forceMag)   # fill_source(arrays, region, start, stop, forceMag)
+    regions.stop_workers()               # once no more tasks will be run
+    nodeCoords = regions.coords
+
+Task functions must be importable from a module (not defined in the
+participant script itself), because workers receive them by reference.
+Workers are started as ``python -m syctools.sharding`` rather than with
+``multiprocessing``, so the participant script is never re-imported in
+them and needs no ``__main__`` guard.
+"""
+
+import os
+import secrets
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from .shm import SharedArrays
+
+
+def _region_arrays(arrays, region):
+    prefix = region + "/"
+    return {name[len(prefix):]: a for name, a in arrays.items() if name.startswith(prefix)}
+
+
+def _shards(npoints, parts, align):
+    bounds = np.linspace(0, npoints // align, parts + 1).round().astype(np.int64) * align
+    bounds[-1] = npoints
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+class ShardedRegions:
+    """Shared region arrays filled by a pool of worker processes.
+
+    ``layout`` maps region names to ``{"points": n, "variables": {name:
+    ncomponents}}`` (1 for scalars, 3 for vectors). ``workers`` defaults to
+    the number of CPUs. Regions are split so that every worker gets about
+    the same number of points; ``align`` maps region names to a row
+    multiple shard boundaries must respect (e.g. points per layer).
+    Workers that have not connected after ``timeout`` seconds raise
+    TimeoutError; a worker that exits before connecting raises
+    RuntimeError with its exit code.
+    """
+
+    def __init__(self, layout, workers=None, align=None, timeout=60.0):
+        align = align or {}
+        self.workers = workers or os.cpu_count() or 1
+        specs = {}
+        for region, spec in layout.items():
+            n = spec["points"]
+            specs[f"{region}/ids"] = ((n,), np.int64)
+            specs[f"{region}/coords"] = ((n, 3), np.float64)
+            for variable, ncomp in spec.get("variables", {}).items():
+                specs[f"{region}/{variable}"] = ((n,) if ncomp == 1 else (n, ncomp), np.float64)
+        self.shared = SharedArrays.allocate(specs)
+
+        self.ids = {}
+        self.coords = {}
+        self.data = {}
+        total = max(sum(spec["points"] for spec in layout.values()), 1)
+        self.shards = []
+        for region, spec in layout.items():
+            arrays = _region_arrays(self.shared.arrays, region)
+            self.ids[region] = arrays.pop("ids")
+            self.coords[region] = arrays.pop("coords")
+            self.data[region] = arrays
+            parts = max(1, round(self.workers * spec["points"] / total))
+            for start, stop in _shards(spec["points"], parts, align.get(region, 1)):
+                self.shards.append((region, start, stop))
+
+        self._connections = []
+        self._processes = []
+        try:
+            self._start_workers(timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    def _start_workers(self, timeout):
+        authkey = secrets.token_bytes(16)
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (root, os.environ.get("PYTHONPATH")))))
+        with Listener(("127.0.0.1", 0), authkey=authkey) as listener:
+            host, port = listener.address
+            for _ in range(min(self.workers, len(self.shards))):
+                process = subprocess.Popen(
+                    [sys.executable, "-m", "syctools.sharding", f"{host}:{port}",
+                     authkey.hex(), self.shared.descriptor],
+                    env=env,
+                )
+                self._processes.append(process)
+            # accept() has no timeout, so it runs on a thread while the
+            # workers are polled; closing the listener ends the thread
+            connections = []
+
+            def accept():
+                try:
+                    for _ in self._processes:
+                        connections.append(listener.accept())
+                except OSError:
+                    pass
+
+            thread = threading.Thread(target=accept, name="sharding-accept", daemon=True)
+            thread.start()
+            deadline = time.monotonic() + timeout
+            while thread.is_alive():
+                thread.join(0.05)
+                for process in self._processes:
+                    if process.poll() is not None and thread.is_alive():
+                        raise RuntimeError(f"sharding worker exited with code {process.returncode} before connecting")
+                if thread.is_alive() and time.monotonic() > deadline:
+                    raise TimeoutError(f"sharding workers did not connect within {timeout} s")
+            self._connections = connections
+
+    def run(self, task, *args):
+        """Call ``task(arrays, region, start, stop, *args)`` for every
+        shard in the workers and wait for all of them. ``arrays`` holds
+        the region's ``ids``, ``coords`` and variables; the task writes
+        rows ``start:stop``. Raises RuntimeError if a task failed."""
+        if not self._connections:
+            raise RuntimeError("the sharding workers have been stopped")
+        assigned = [self.shards[i::len(self._connections)] for i in range(len(self._connections))]
+        for connection, shards in zip(self._connections, assigned):
+            connection.send((task, args, shards))
+        errors = [connection.recv() for connection in self._connections]
+        errors = [e for e in errors if e]
+        if errors:
+            raise RuntimeError("sharded task failed:\n" + errors[0])
+
+    def stop_workers(self):
+        """Stop the workers; the arrays stay valid until `close`."""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+            connection.close()
+        for process in self._processes:
+            if process.poll() is None and not self._connections:
+                process.terminate()  # never connected
+            process.wait()
+        self._connections = []
+        self._processes = []
+
+    def close(self):
+        """Stop the workers and free the shared block."""
+        self.stop_workers()
+        self.ids = self.coords = self.data = {}
+        self.shared.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _worker(address, authkey, descriptor):
+    host, port = address.rsplit(":", 1)
+    shared = SharedArrays.attach(descriptor)
+    with Client((host, int(port)), authkey=bytes.fromhex(authkey)) as connection:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            task, args, shards = message
+            try:
+                for region, start, stop in shards:
+                    task(_region_arrays(shared.arrays, region), region, start, stop, *args)
+                connection.send("")
+            except Exception:
+                connection.send(traceback.format_exc())
+    shared.close()
+
+
+if __name__ == "__main__":
+    _worker(*sys.argv[1:4])
@@ -0,0 +1,126 @@
+"""Hand NumPy arrays to a child process through shared memory.
+
+The host puts its arrays into one ``multiprocessing.shared_memory`` block
+and passes the block's descriptor on the child's command line; the child
+maps the same memory as NumPy arrays without copying::
+
+    # host
+    shared = SharedArrays.from_arrays({"ids": ids, "coords": coords})
+    subprocess.Popen(f"python participant.py --shm {shared.descriptor}")
+    ...
+    shared.unlink()
+
+    # child
+    shared = SharedArrays.attach(args.shm)
+    coords = shared.arrays["coords"]
+
+The descriptor is a single shell-safe token,
+``<block>,<name>:<dtype>:<shape>:<offset>,...`` with shapes written as
+``66000x3``. Arrays start on 64-byte boundaries in the block.
+"""
+
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+_ALIGN = 64
+
+
+def _layout(specs):
+    fields = []
+    offset = 0
+    for name, (shape, dtype) in specs.items():
+        dtype = np.dtype(dtype)
+        shape = tuple(int(s) for s in np.atleast_1d(shape))
+        fields.append((name, dtype, shape, offset))
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        offset += -(-nbytes // _ALIGN) * _ALIGN
+    return fields, max(offset, 1)
+
+
+def _format(block, fields):
+    parts = [block]
+    for name, dtype, shape, offset in fields:
+        parts.append(f"{name}:{dtype.name}:{'x'.join(map(str, shape))}:{offset}")
+    return ",".join(parts)
+
+
+def _parse(descriptor):
+    block, *parts = descriptor.split(",")
+    fields = []
+    for part in parts:
+        name, dtype, shape, offset = part.split(":")
+        shape = tuple(int(s) for s in shape.split("x")) if shape else ()
+        fields.append((name, np.dtype(dtype), shape, int(offset)))
+    return block, fields
+
+
+class SharedArrays:
+    """Named NumPy arrays living in one shared-memory block.
+
+    Use `allocate` or `from_arrays` in the process that owns the data and
+    `attach` in the processes that read it. ``arrays`` maps names to the
+    views into the block; keep this object alive while they are in use.
+    """
+
+    def __init__(self, shm, fields, owner):
+        self.shm = shm
+        self.owner = owner
+        self.descriptor = _format(shm.name, fields)
+        self.arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, dtype, shape, offset in fields
+        }
+
+    @classmethod
+    def allocate(cls, specs):
+        """Create a block for ``specs`` (name -> ``(shape, dtype)``) with
+        uninitialized arrays to be filled in place."""
+        fields, size = _layout(specs)
+        return cls(shared_memory.SharedMemory(create=True, size=size), fields, owner=True)
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Create a block holding a copy of ``arrays`` (name -> array)."""
+        shared = cls.allocate({name: (np.shape(a), np.asarray(a).dtype) for name, a in arrays.items()})
+        for name, a in arrays.items():
+            shared.arrays[name][...] = a
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Map the block described by ``descriptor`` without copying."""
+        block, fields = _parse(descriptor)
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=block, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=block)
+            if os.name == "posix":
+                # the owner unlinks the block; stop the tracker of this process
+                # from removing it when this process exits (Windows has no
+                # tracker, the block lives as long as a handle is open)
+                resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, fields, owner=False)
+
+    @property
+    def nbytes(self):
+        return self.shm.size
+
+    def close(self):
+        """Drop the views and unmap the block in this process."""
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self):
+        """Close and, in the owning process, free the block."""
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
@@ -0,0 +1,95 @@
+"""Concurrent launch and setup of product sessions.
+
+Launching Fluent, MAPDL and System Coupling sessions takes tens of seconds
+each and the ``run.py`` scripts do it one after the other, setting each
+session up completely before launching the next. `SessionStartup` launches
+all sessions at once on a thread pool and runs each session's setup
+(mesh read, materials, boundary conditions, ...) as soon as that session
+is up::
+
+    startup = SessionStartup()
+    startup.add("fluid", lambda: pyfluent.launch_fluent(), setupFluid)
+    startup.add("syc", pysyc.launch, lambda syc: syc.start_output())
+    sessions = startup.start()
+    print(startup.timeline())
+
+Launch and setup calls are blocking client calls waiting on separate
+server processes, so running them on threads overlaps the waiting.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def exit_session(session):
+    """Default cleanup: exit ``session``, ignoring errors of a session
+    that is already gone."""
+    try:
+        session.exit()
+    except Exception:
+        pass
+
+
+class SessionStartup:
+    """Launches named sessions concurrently and records their timeline."""
+
+    def __init__(self):
+        self._specs = {}
+        self.sessions = {}
+        self.events = {}
+        self._origin = None
+
+    def add(self, name, launch, setup=None):
+        """Register session ``name``: ``launch()`` returns the session,
+        ``setup(session)`` prepares it."""
+        self._specs[name] = (launch, setup)
+
+    def _now(self):
+        return time.perf_counter() - self._origin
+
+    def _run(self, name):
+        launch, setup = self._specs[name]
+        events = self.events[name] = {"launch_start": self._now()}
+        session = launch()
+        self.sessions[name] = session
+        events["launch_end"] = events["setup_start"] = self._now()
+        if setup is not None:
+            setup(session)
+        events["setup_end"] = self._now()
+        return session
+
+    def start(self, cleanup=exit_session):
+        """Launch and set up all sessions, returning a dict of sessions by
+        name. If any launch or setup fails, the other sessions still
+        finish, ``cleanup(session)`` is called on every session that was
+        launched (by default it exits it, so no product process or license
+        is left behind) and the first error is raised. With
+        ``cleanup=None`` the sessions are left running in ``sessions``."""
+        self._origin = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(len(self._specs), 1)) as pool:
+            futures = {name: pool.submit(self._run, name) for name in self._specs}
+        errors = [f.exception() for f in futures.values() if f.exception() is not None]
+        self.wall_time = self._now()
+        if errors:
+            if cleanup is not None:
+                for session in self.sessions.values():
+                    cleanup(session)
+            raise errors[0]
+        return dict(self.sessions)
+
+    def timeline(self, width=40):
+        """Per-session launch and setup times, with a bar per session
+        (``=`` launch, ``#`` setup) and the time saved over a sequential
+        startup."""
+        scale = width / max(self.wall_time, 1e-9)
+        lines = [f"{'session':<12} {'launch [s]':>10} {'setup [s]':>10} {'ready at [s]':>12}"]
+        sequential = 0.0
+        for name, e in self.events.items():
+            launch = e.get("launch_end", self.wall_time) - e["launch_start"]
+            setup = e.get("setup_end", self.wall_time) - e.get("setup_start", self.wall_time)
+            sequential += launch + setup
+            bar = " " * round(e["launch_start"] * scale) + "=" * round(launch * scale) + "#" * round(setup * scale)
+            lines.append(f"{name:<12} {launch:>10.1f} {setup:>10.1f} {e.get('setup_end', float('nan')):>12.1f}  |{bar:<{width}}|")
+        lines.append(f"all sessions ready after {self.wall_time:.1f} s "
+                     f"({sequential:.1f} s one after another, {sequential - self.wall_time:.1f} s saved)")
+        return "\n".join(lines)
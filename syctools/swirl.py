@@ -0,0 +1,89 @@
+"""Swirling force field on a cylindrical point cloud (fluid-swirl examples)."""
+
+import numpy as np
+
+
+def _fill_swirl(x, theta, r, force_mag, coords, forces):
+    grid = coords.reshape(len(x), len(theta), len(r), 3)
+    grid[..., 0] = x[:, None, None]
+    grid[..., 1] = np.sin(theta)[:, None] * r
+    grid[..., 2] = np.cos(theta)[:, None] * r
+
+    grid = forces.reshape(len(x), len(theta), len(r), 3)
+    grid[..., 0] = 0.0
+    grid[..., 1] = (force_mag * np.sin(theta + 0.5 * np.pi))[:, None]
+    grid[..., 2] = (force_mag * np.cos(theta + 0.5 * np.pi))[:, None]
+
+
+def _swirl_axes(naxial, ncirc, nrad, radius):
+    x = np.arange(naxial, dtype=np.float64) / (naxial - 1)
+    theta = 2.0 * np.pi * np.arange(ncirc, dtype=np.float64) / ncirc
+    r = radius * np.arange(1, nrad + 1, dtype=np.float64) / nrad
+    return x, theta, r
+
+
+def swirl_source(naxial=33, ncirc=10, nrad=20, radius=0.025, force_mag=5.0):
+    """Return ``(ids, coords, forces)`` for the swirl source cloud.
+
+    Points are laid out on an ``naxial x ncirc x nrad`` cylindrical grid along
+    x in [0, 1], in the same order as the original nested-loop generator
+    (axial outermost, radial innermost). Forces are tangential so that the
+    fluid swirls counter-clockwise when looking from inlet to outlet.
+
+    All outputs are written into preallocated arrays through broadcasting,
+    so peak memory is the size of the result plus a few small 1-D or
+    ``ncirc x nrad`` temporaries.
+    """
+    x, theta, r = _swirl_axes(naxial, ncirc, nrad, radius)
+    npoints = naxial * ncirc * nrad
+    ids = np.arange(npoints, dtype=np.int64)
+    coords = np.empty((npoints, 3), dtype=np.float64)
+    forces = np.empty((npoints, 3), dtype=np.float64)
+    _fill_swirl(x, theta, r, force_mag, coords, forces)
+    return ids, coords, forces
+
+
+def swirl_source_chunks(naxial=33, ncirc=10, nrad=20, radius=0.025, force_mag=5.0, chunk_size=65536):
+    """Yield ``(coords, forces)`` for the swirl source cloud in chunks.
+
+    Each chunk holds whole axial stations, about ``chunk_size`` points, so
+    the full cloud never has to be in memory. The two buffers are reused
+    between chunks; consume (e.g. write) each chunk before advancing.
+    """
+    x, theta, r = _swirl_axes(naxial, ncirc, nrad, radius)
+    stations = max(1, chunk_size // (ncirc * nrad))
+    coords = np.empty((stations * ncirc * nrad, 3), dtype=np.float64)
+    forces = np.empty_like(coords)
+    for start in range(0, naxial, stations):
+        xs = x[start:start + stations]
+        n = len(xs) * ncirc * nrad
+        _fill_swirl(xs, theta, r, force_mag, coords[:n], forces[:n])
+        yield coords[:n], forces[:n]
+
+
+def swirl_source_into(ids, coords, forces, naxial=33, ncirc=10, nrad=20, radius=0.025, force_mag=5.0,
+                      chunk_size=65536):
+    """Fill preallocated ``ids``, ``coords`` and ``forces`` (e.g.
+    memory-mapped arrays) with the swirl source cloud.
+
+    The arrays are written front to back in chunks, so only one chunk of
+    temporaries is in memory at a time.
+    """
+    start = 0
+    for c, f in swirl_source_chunks(naxial, ncirc, nrad, radius, force_mag, chunk_size):
+        stop = start + len(c)
+        ids[start:stop] = np.arange(start, stop, dtype=np.int64)
+        coords[start:stop] = c
+        forces[start:stop] = f
+        start = stop
+
+
+def fill_swirl_shard(arrays, region, start, stop, naxial=33, ncirc=10, nrad=20, radius=0.025, force_mag=5.0):
+    """`syctools.sharding` task filling rows ``start:stop`` of the swirl
+    source cloud (``ids``, ``coords`` and ``force``). Shards must be
+    aligned to whole axial stations (``ncirc * nrad`` rows)."""
+    x, theta, r = _swirl_axes(naxial, ncirc, nrad, radius)
+    per = ncirc * nrad
+    _fill_swirl(x[start // per:stop // per], theta, r, force_mag,
+                arrays["coords"][start:stop], arrays["force"][start:stop])
+    arrays["ids"][start:stop] = np.arange(start, stop, dtype=np.int64)
@@ -0,0 +1,115 @@
+"""Time-series source data with background prefetch of the next step.
+
+A transient participant that reads each step's data from disk at the
+start of the step stalls the coupling for the duration of the read.
+`TimeSeriesReader` keeps two sets of arrays: the front set holds the
+current step and is what the output callbacks hand to SCP, while a
+background thread loads the next step into the back set. `advance`, called
+at the start of each time step, waits for that load (usually already
+finished), swaps the sets and starts loading the following step::
+
+    reader = TimeSeriesReader(sorted(glob.glob("force-*.npz")), {"force": (n, 3)})
+    while sc.doTimeStep():
+        forces = reader.advance()["force"]
+        ...
+    print(reader.report())
+
+The arrays returned by `advance` are not written to before the next call,
+so SCP never reads a buffer that is being loaded. With a `BufferRegistry`,
+hand them to the callbacks with ``buffers.bind_variable(...)``.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .scdt_binary import load_scdt
+
+
+def load_step(path, out):
+    """Default step loader: fill the arrays in ``out`` from ``path``.
+
+    ``.npz`` files provide each field under its name, ``.npy`` files a
+    single field, and ``.scdt`` files (read through their binary sidecar)
+    one scalar column per field, matched by column name.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npz":
+        with np.load(path) as data:
+            for name, array in out.items():
+                array[...] = data[name]
+    elif ext == ".npy":
+        (array,) = out.values()
+        array[...] = np.load(path, mmap_mode="r")
+    elif ext == ".scdt":
+        columns, data = load_scdt(path)
+        for name, array in out.items():
+            array[...] = data[:, columns.index(name)]
+    else:
+        raise ValueError(f"{path}: unsupported time-series file type")
+
+
+class TimeSeriesReader:
+    """Double-buffered reader of one file per time step.
+
+    ``files`` lists the step files in order and ``fields`` maps field
+    names to array shapes (float64). ``load(path, out)`` fills the arrays
+    of ``out`` from ``path`` and defaults to `load_step`. The first step
+    starts loading immediately.
+    """
+
+    def __init__(self, files, fields, load=load_step):
+        self.files = list(files)
+        self.load = load
+        self._sets = [{name: np.empty(shape) for name, shape in fields.items()} for _ in range(2)]
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+        self.step = 0
+        self.current = None
+        self.load_time = 0.0
+        self.wait_time = 0.0
+        self._prefetch(0)
+
+    def _load(self, index, out):
+        start = time.perf_counter()
+        self.load(self.files[index], out)
+        return time.perf_counter() - start
+
+    def _prefetch(self, index):
+        self._pending = None
+        if index < len(self.files):
+            self._pending = self._executor.submit(self._load, index, self._sets[index % 2])
+
+    def advance(self):
+        """Return the field arrays of the next step, or None after the
+        last one. Blocks only if the prefetch has not finished yet."""
+        if self._pending is None:
+            self.current = None
+            return None
+        start = time.perf_counter()
+        self.load_time += self._pending.result()
+        self.wait_time += time.perf_counter() - start
+        self.current = self._sets[self.step % 2]
+        self.step += 1
+        self._prefetch(self.step)
+        return self.current
+
+    @property
+    def hidden_time(self):
+        """Load time that overlapped with the coupling instead of blocking it."""
+        return max(self.load_time - self.wait_time, 0.0)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def report(self):
+        return (f"time series: {self.step} steps loaded in {self.load_time:.3f} s, "
+                f"waited {self.wait_time:.3f} s, {self.hidden_time:.3f} s of I/O hidden")
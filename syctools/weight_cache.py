@@ -0,0 +1,122 @@
+"""Persistent on-disk cache of point-cloud mapping weights.
+
+Mapping onto the same target geometry again only needs the sparse weight
+matrix, not a new neighbour search. `WeightCache` stores the matrices from
+`syctools.mapping.PointCloudMapper` as compressed CSR ``.npz`` files, keyed
+by a hash of the source and target coordinates and the mapper settings.
+The total size of the cache directory is capped; least recently used
+entries are evicted first (file modification times record the use).
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+
+import numpy as np
+from scipy.sparse import load_npz, save_npz
+
+
+def geometry_key(source_coords, target_coords, settings=None):
+    """Return a hex digest identifying a source/target geometry pair and
+    the mapping settings."""
+    h = hashlib.blake2b(digest_size=20)
+    for coords in (source_coords, target_coords):
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        h.update(str(coords.shape).encode("ascii"))
+        h.update(coords.data)
+    h.update(json.dumps(settings or {}, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+class WeightCache:
+    """Directory of cached weight matrices with an LRU size cap.
+
+    ``hits``, ``misses`` and ``evictions`` count the lookups and removals
+    made through this instance.
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def get(self, key):
+        """Return the cached matrix for ``key``, or None."""
+        path = self._path(key)
+        try:
+            matrix = load_npz(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            # truncated or corrupt entry: drop it and map again
+            self.misses += 1
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted by another process meanwhile
+        self.hits += 1
+        return matrix
+
+    def _remove(self, path):
+        # another process may have removed (or still hold) the file
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        return True
+
+    def put(self, key, matrix):
+        """Store ``matrix`` under ``key`` and evict old entries if needed."""
+        path = self._path(key)
+        # write under a temporary name so readers never see a partial file
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        save_npz(tmp, matrix.tocsr(), compressed=True)
+        os.replace(tmp, path)
+        self.evict(keep=path)
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the cache fits."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz") and ".tmp" not in name:
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue  # removed by another process
+                entries.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            if self._remove(path):
+                self.evictions += 1
+            total -= size
+
+    def weights(self, mapper, target_coords):
+        """Return ``mapper.weights(target_coords)``, from the cache if the
+        same geometry and settings were mapped before."""
+        key = geometry_key(mapper.source_coords, target_coords, mapper.settings)
+        matrix = self.get(key)
+        if matrix is None:
+            matrix = mapper.weights(target_coords)
+            self.put(key, matrix)
+        return matrix
+
+    def report(self):
+        """One-line summary of the cache activity."""
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return f"weight cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), {self.evictions} evictions"